@@ -0,0 +1,112 @@
+"""
+Node/edge counts, DOT size and pass timings of `--condense` and
+`--lod function` on a synthetic atlas. Functions mix the diamonds of
+`bench_ir_backend` with straight-line statement runs, loop anchors and
+early-return joins, the shapes the passes target; calls are linked across
+files as in `bench_store`. With `--layout` (needs Graphviz `dot`) each DOT
+document is also laid out and timed.
+
+    python benchmarks/bench_condense.py [--nodes 100000] [--layout]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import bench_store  # noqa: E402
+from bench_ir_backend import DIAMONDS_PER_FUNCTION  # noqa: E402
+from ir_condense import condense, format_timings, function_level  # noqa: E402
+from ir_graph import EdgeType, NodeType, new_graph, set_backend  # noqa: E402
+from renderer_dot import DotRenderer  # noqa: E402
+
+
+def build_function(index):
+    g = new_graph("rust_cfg")
+    entry = g.add_node(NodeType.BLOCK, f"fn f{index}")
+    g.set_entry(entry)
+    exit_node = g.add_node(NodeType.EXIT, "Return")
+    curr = entry
+    for d in range(DIAMONDS_PER_FUNCTION):
+        fork = g.add_node(NodeType.FORK, f"if x > {d}")
+        then = g.add_node(NodeType.BLOCK, f"let y = x * {d};")
+        call = g.add_node(NodeType.CALL, "helper()")
+        other = g.add_node(NodeType.BLOCK, "y = 0;")
+        join = g.add_node(NodeType.JOIN, "")
+        g.add_edge(curr, fork, EdgeType.SEQ)
+        g.add_edge(fork, then, EdgeType.COND_TRUE, "True")
+        g.add_edge(then, call, EdgeType.SEQ)
+        g.add_edge(call, join, EdgeType.SEQ)
+        g.add_edge(fork, other, EdgeType.COND_FALSE, "False")
+        g.add_edge(other, join, EdgeType.SEQ)
+        curr = join
+        for s in range(3):  # statement run
+            stmt = g.add_node(NodeType.BLOCK, f"let s{s} = y + {s};")
+            g.add_edge(curr, stmt, EdgeType.SEQ)
+            curr = stmt
+        # Loop anchor, then an early return whose JOIN has one way in
+        head = g.add_node(NodeType.VIRTUAL, "Loop Head")
+        fork = g.add_node(NodeType.FORK, "if done")
+        early = g.add_node(NodeType.EXIT, "return y")
+        join = g.add_node(NodeType.JOIN, "")
+        g.add_edge(curr, head, EdgeType.SEQ)
+        g.add_edge(head, fork, EdgeType.SEQ)
+        g.add_edge(fork, early, EdgeType.COND_TRUE, "True")
+        g.add_edge(fork, join, EdgeType.COND_FALSE, "False")
+        curr = join
+    g.add_edge(curr, exit_node, EdgeType.SEQ)
+    return g
+
+
+def layout_secs(dot_text):
+    start = time.perf_counter()
+    subprocess.run(
+        ["dot", "-Tsvg", "-o", os.devnull],
+        input=dot_text.encode("utf-8"),
+        check=True,
+    )
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Condensation benchmark")
+    parser.add_argument("--nodes", type=int, default=100_000)
+    parser.add_argument("--layout", action="store_true")
+    args = parser.parse_args()
+
+    set_backend("compact")
+    bench_store.build_function = build_function
+    atlas, functions = bench_store.build_linked_atlas(args.nodes)
+
+    timings = []
+    start = time.perf_counter()
+    condensed = condense(atlas, timings=timings)
+    condense_secs = time.perf_counter() - start
+    print(format_timings(timings, atlas.number_of_nodes(), condensed.number_of_nodes()))
+    print(f"[*] condense total {condense_secs * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    functions_only = function_level(atlas, functions)
+    print(f"[*] function_level {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    for label, graph in [
+        ("full", atlas),
+        ("condensed", condensed),
+        ("function", functions_only),
+    ]:
+        text = DotRenderer(graph).render()
+        row = (
+            f"    {label:<10} {graph.number_of_nodes():9} nodes "
+            f"{sum(1 for _ in graph.edges()):9} edges "
+            f"{len(text) / 2**20:8.1f} MiB DOT"
+        )
+        if args.layout:
+            row += f"  layout {layout_secs(text):7.2f}s"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
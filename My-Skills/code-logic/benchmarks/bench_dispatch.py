@@ -0,0 +1,300 @@
+"""
+Per-node statement dispatch cost: the kind_id tables of `dispatch.py`
+against the previous `if t == "..."` / `t in [...]` string chains, on a
+synthetic file of ~50k statements (Python and Rust).
+
+"route" times only picking the handler for every statement node; "build"
+times a full CFG build of every function with each dispatcher.
+
+    python benchmarks/bench_dispatch.py [--statements 50000] [--repeat 5]
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from ast_engine import ASTEngine  # noqa: E402
+from discovery import iter_functions  # noqa: E402
+from file_pipeline import LANGUAGES  # noqa: E402
+
+STATEMENTS_PER_FUNCTION = 25
+
+# One line per statement kind, cycled through each function body
+PY_STATEMENTS = [
+    "x = a + {i}",
+    "call_{i}(x)",
+    "assert x > {i}",
+    "if x > {i}:\n        x = 0",
+    "for y in range({i}):\n        x += y",
+    "while x > {i}:\n        x -= 1",
+    "with open(p) as f:\n        f.read()",
+    "pass",
+    "del y",
+    "print(x, {i})",
+]
+RS_STATEMENTS = [
+    "let x = a + {i};",
+    "call_{i}(x);",
+    "if x > {i} {{ x = 0; }}",
+    "for y in 0..{i} {{ x += y; }}",
+    "while x > {i} {{ x -= 1; }}",
+    "loop {{ break; }}",
+    "match x {{ 0 => a(), _ => b() }}",
+    'println!("{{}}", x);',
+    "x += {i};",
+    "let z = w?;",
+]
+
+
+def make_files(scratch, statements):
+    functions = max(1, statements // STATEMENTS_PER_FUNCTION)
+    paths = []
+    for ext, lines, header, indent, footer in [
+        ("py", PY_STATEMENTS, "def f{k}(a, p, w):\n", "    ", ""),
+        ("rs", RS_STATEMENTS, "fn f{k}(a: i32, w: R) -> R {{\n", "    ", "}}\n"),
+    ]:
+        path = os.path.join(scratch, f"dispatch.{ext}")
+        with open(path, "w", encoding="utf-8") as f:
+            for k in range(functions):
+                f.write(header.format(k=k))
+                for i in range(STATEMENTS_PER_FUNCTION):
+                    line = lines[(k + i) % len(lines)].format(i=i)
+                    f.write(f"{indent}{line}\n")
+                f.write(footer.format())
+        paths.append((ext, path))
+    return paths
+
+
+def legacy_python(self, node, current_node):
+    """The string-compare chain `PythonStmtMixin` used before."""
+    t = node.type
+    if t == "expression_statement":
+        return self._dispatch_statement(node.children[0], current_node)
+    elif t == "assignment":
+        return self._handle_simple_stmt(node, current_node, label_prefix="")
+    elif t == "return_statement":
+        return self._handle_return(node, current_node)
+    elif t == "raise_statement":
+        return self._handle_raise(node, current_node)
+    elif t == "assert_statement":
+        return self._handle_simple_stmt(node, current_node, label_prefix="assert ")
+    elif t == "call":
+        return self._handle_call(node, current_node)
+    elif t == "try_statement":
+        return self._handle_try(node, current_node)
+    elif t == "with_statement":
+        return self._handle_with(node, current_node)
+    elif t == "function_definition":
+        return self._handle_simple_stmt(node, current_node, label_prefix="def ")
+    elif t == "class_definition":
+        return self._handle_simple_stmt(node, current_node, label_prefix="class ")
+    elif t in [
+        "if_statement",
+        "for_statement",
+        "while_statement",
+        "match_statement",
+    ]:
+        return legacy_python_flow(self, node, current_node)
+    elif t in ["break_statement", "continue_statement"]:
+        return legacy_python_flow(self, node, current_node)
+    else:
+        return self._handle_simple_stmt(node, current_node)
+
+
+def legacy_python_flow(self, node, current_node):
+    t = node.type
+    if t == "if_statement":
+        return self._handle_if(node, current_node)
+    if t in ["for_statement", "while_statement"]:
+        return self._handle_loop(node, current_node)
+    if t == "match_statement":
+        return self._handle_match(node, current_node)
+    if t == "break_statement":
+        return self._handle_break(node, current_node)
+    if t == "continue_statement":
+        return self._handle_continue(node, current_node)
+    return current_node
+
+
+def legacy_rust(self, node, current_node):
+    """The string-compare chain `RustStmtMixin` used before."""
+    current_node = self._scan_for_try_operator(node, current_node)
+    if current_node is None:
+        return None
+    t = node.type
+    if t == "let_declaration":
+        return self._handle_simple_stmt(node, current_node, label_prefix="let ")
+    elif t == "return_expression":
+        return self._handle_return(node, current_node)
+    elif t == "expression_statement":
+        return self._dispatch_statement(node.children[0], current_node)
+    elif t == "call_expression":
+        return self._handle_call(node, current_node)
+    elif t == "macro_invocation":
+        return self._handle_macro(node, current_node)
+    elif t in [
+        "if_expression",
+        "match_expression",
+        "loop_expression",
+        "while_expression",
+        "for_expression",
+        "break_expression",
+        "continue_expression",
+    ]:
+        return legacy_rust_flow(self, node, current_node)
+    else:
+        return self._handle_simple_stmt(node, current_node)
+
+
+def legacy_rust_flow(self, node, current_node):
+    t = node.type
+    if t == "if_expression":
+        return self._handle_if(node, current_node)
+    if t == "match_expression":
+        return self._handle_match(node, current_node)
+    if t == "loop_expression":
+        return self._handle_loop(node, current_node)
+    if t == "while_expression":
+        return self._handle_while(node, current_node)
+    if t == "for_expression":
+        return self._handle_for(node, current_node)
+    if t == "break_expression":
+        return self._handle_break(node, current_node)
+    if t == "continue_expression":
+        return self._handle_continue(node, current_node)
+    return current_node
+
+
+LEGACY = {"py": legacy_python, "rs": legacy_rust}
+# The chain order, for routing without running the handlers
+LEGACY_KINDS = {
+    "py": [
+        "expression_statement",
+        "assignment",
+        "return_statement",
+        "raise_statement",
+        "assert_statement",
+        "call",
+        "try_statement",
+        "with_statement",
+        "function_definition",
+        "class_definition",
+    ],
+    "rs": [
+        "let_declaration",
+        "return_expression",
+        "expression_statement",
+        "call_expression",
+        "macro_invocation",
+    ],
+}
+LEGACY_FLOW = {
+    "py": [
+        "if_statement",
+        "for_statement",
+        "while_statement",
+        "match_statement",
+        "break_statement",
+        "continue_statement",
+    ],
+    "rs": [
+        "if_expression",
+        "match_expression",
+        "loop_expression",
+        "while_expression",
+        "for_expression",
+        "break_expression",
+        "continue_expression",
+    ],
+}
+
+
+def legacy_route(t, kinds, flow):
+    for kind in kinds:
+        if t == kind:
+            return kind
+    if t in list(flow):
+        return t
+    return None
+
+
+def statement_nodes(fn_nodes):
+    nodes = []
+    for fn_node in fn_nodes:
+        body = fn_node.child_by_field_name("body")
+        nodes.extend(c for c in body.children if c.is_named)
+    return nodes
+
+
+def best_of(repeat, fn):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Statement dispatch benchmark")
+    parser.add_argument("--statements", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bench_dispatch_")
+    try:
+        for lang, path in make_files(scratch, args.statements):
+            tree, code = ASTEngine().parse_file(path)
+            fn_nodes = [fn.node for fn in iter_functions(tree.root_node, lang, code)]
+            nodes = statement_nodes(fn_nodes)
+            builder = LANGUAGES[lang](code)
+            table = builder._statements
+            kinds, flow = LEGACY_KINDS[lang], LEGACY_FLOW[lang]
+
+            def route_legacy():
+                for node in nodes:
+                    legacy_route(node.type, kinds, flow)
+
+            def route_table():
+                routes, default = table.routes, table.default
+                for node in nodes:
+                    routes.get(node.kind_id, default)
+
+            def build():
+                for fn_node in fn_nodes:
+                    builder.build_from_function(fn_node)
+
+            legacy = best_of(args.repeat, route_legacy)
+            compiled = best_of(args.repeat, route_table)
+            print(f"[*] {lang}: {len(nodes)} statements in {len(fn_nodes)} functions")
+            print(
+                f"    route  strings {legacy / len(nodes) * 1e9:7.0f} ns/node  "
+                f"kind_id {compiled / len(nodes) * 1e9:7.0f} ns/node  "
+                f"({legacy / compiled:.1f}x)"
+            )
+
+            build_table = best_of(args.repeat, build)
+            cls = type(builder)
+            table_dispatch = cls._dispatch_statement
+            cls._dispatch_statement = LEGACY[lang]
+            try:
+                build_legacy = best_of(args.repeat, build)
+            finally:
+                cls._dispatch_statement = table_dispatch
+            print(
+                f"    build  strings {build_legacy:6.2f}s  "
+                f"kind_id {build_table:6.2f}s  ({build_legacy / build_table:.2f}x)"
+            )
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
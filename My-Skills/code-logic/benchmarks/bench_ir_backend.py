@@ -0,0 +1,123 @@
+"""
+Memory / throughput benchmark for the IR backends (`--ir-backend`).
+
+Builds a synthetic atlas without tree-sitter: functions shaped like real
+CFGs (entry, if/else diamonds, calls, `?` checks, exit) are merged into
+files, files into one atlas, then the atlas is traversed and rendered. With
+`--fusion view` files and the atlas are `GraphView`s that attach children
+by reference instead of copying them.
+
+    python benchmarks/bench_ir_backend.py [--nodes 1000000] [--backend compact]
+        [--fusion view]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from ir_graph import BACKENDS, EdgeType, NodeType, new_graph, set_backend  # noqa
+from ir_view import GraphView  # noqa: E402
+from renderer_dot import DotRenderer  # noqa: E402
+
+FUNCTIONS_PER_FILE = 20
+DIAMONDS_PER_FUNCTION = 4  # 6 nodes each
+
+
+def build_function(index):
+    g = new_graph("rust_cfg")
+    entry = g.add_node(NodeType.BLOCK, f"fn f{index}")
+    g.set_entry(entry)
+    exit_node = g.add_node(NodeType.EXIT, "Return")
+    curr = entry
+    for d in range(DIAMONDS_PER_FUNCTION):
+        fork = g.add_node(NodeType.FORK, f"if x > {d}")
+        then = g.add_node(NodeType.BLOCK, f"let y = x * {d};")
+        call = g.add_node(NodeType.CALL, "helper()")
+        check = g.add_node(NodeType.VIRTUAL, "Check ?")
+        other = g.add_node(NodeType.BLOCK, "y = 0;")
+        join = g.add_node(NodeType.JOIN, "")
+        g.add_edge(curr, fork, EdgeType.SEQ)
+        g.add_edge(fork, then, EdgeType.COND_TRUE, "True")
+        g.add_edge(then, call, EdgeType.SEQ)
+        g.add_edge(call, check, EdgeType.SEQ)
+        g.add_edge(check, exit_node, EdgeType.ERR, "Err")
+        g.add_edge(check, join, EdgeType.SEQ, "Ok")
+        g.add_edge(fork, other, EdgeType.COND_FALSE, "False")
+        g.add_edge(other, join, EdgeType.SEQ)
+        curr = join
+    g.add_edge(curr, exit_node, EdgeType.SEQ)
+    return g
+
+
+def build_atlas(target_nodes, fusion):
+    compose = GraphView if fusion == "view" else new_graph
+    atlas = compose("ProjectAtlas")
+    per_function = 2 + 6 * DIAMONDS_PER_FUNCTION
+    n_files = max(1, target_nodes // (per_function * FUNCTIONS_PER_FILE))
+    for f in range(n_files):
+        file_graph = compose(f"file_{f}.rs")
+        for k in range(FUNCTIONS_PER_FILE):
+            file_graph.merge_graph(build_function(k), f"f{k}")
+        atlas.merge_graph(file_graph, f"src_mod{f}_rs")
+    return atlas
+
+
+def run(backend, target_nodes, render, fusion):
+    set_backend(backend)
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    atlas = build_atlas(target_nodes, fusion)
+    build_secs = time.perf_counter() - start
+    _, build_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    n_nodes = sum(1 for _ in atlas.nodes())
+    n_edges = sum(1 for _ in atlas.edges())
+    walk_secs = time.perf_counter() - start
+
+    render_stats = None
+    if render:
+        # Streamed to a real file handle, as main.py does for the atlas
+        tracemalloc.start()
+        start = time.perf_counter()
+        with open(os.devnull, "w", encoding="utf-8") as sink:
+            DotRenderer(atlas).write(sink)
+        render_stats = (time.perf_counter() - start, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return n_nodes, n_edges, build_secs, build_peak, walk_secs, render_stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="IR backend benchmark")
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--backend", choices=BACKENDS, action="append")
+    parser.add_argument("--fusion", choices=("copy", "view"), default="copy")
+    parser.add_argument(
+        "--render", action="store_true", help="Also time streaming DOT output"
+    )
+    args = parser.parse_args()
+
+    for backend in args.backend or BACKENDS:
+        n_nodes, n_edges, build, peak, walk, render = run(
+            backend, args.nodes, args.render, args.fusion
+        )
+        print(f"[*] {backend} ({args.fusion}): {n_nodes} nodes, {n_edges} edges")
+        print(f"    build+merge {build:8.2f}s  peak {peak / 2**20:9.1f} MiB")
+        print(
+            f"    traverse    {walk:8.2f}s  "
+            f"{(n_nodes + n_edges) / walk:11.0f} items/s"
+        )
+        if render is not None:
+            secs, render_peak = render
+            print(f"    render      {secs:8.2f}s  peak {render_peak / 2**20:9.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Save/load time and size of the binary ULG format (`ir_binary`) against
+pickled `to_compact()` tuples, the previous cache payload.
+
+    python benchmarks/bench_ir_binary.py [--nodes 1000000]
+"""
+
+import argparse
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import ir_binary  # noqa: E402
+from bench_ir_backend import build_atlas  # noqa: E402
+from ir_compact import CompactLogicGraph  # noqa: E402
+from ir_graph import set_backend  # noqa: E402
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary ULG benchmark")
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    set_backend("compact")
+    atlas = build_atlas(args.nodes, "copy")
+    print(
+        f"[*] Synthetic atlas: {atlas.number_of_nodes()} nodes, "
+        f"{sum(1 for _ in atlas.edges())} edges"
+    )
+
+    scratch = tempfile.mkdtemp(prefix="bench_ir_binary_")
+    try:
+        ulg_path = os.path.join(scratch, "atlas.ulg")
+        pkl_path = os.path.join(scratch, "atlas.pkl")
+
+        _, ulg_save = timed(lambda: ir_binary.save(ulg_path, atlas))
+        (graph, _), ulg_load = timed(lambda: ir_binary.load(ulg_path))
+        assert graph.number_of_nodes() == atlas.number_of_nodes()
+
+        def save_pickle():
+            with open(pkl_path, "wb") as f:
+                pickle.dump(atlas.to_compact(), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def load_pickle():
+            with open(pkl_path, "rb") as f:
+                return CompactLogicGraph.from_compact(pickle.load(f))
+
+        _, pkl_save = timed(save_pickle)
+        _, pkl_load = timed(load_pickle)
+
+        rows = [
+            ("ulg binary", ulg_save, ulg_load, os.path.getsize(ulg_path)),
+            ("pickle", pkl_save, pkl_load, os.path.getsize(pkl_path)),
+        ]
+        for label, save, load, size in rows:
+            print(
+                f"    {label:<11} save {save:6.2f}s  load {load:6.3f}s  "
+                f"{size / 2**20:7.1f} MiB"
+            )
+        print(f"[*] Load speedup: {pkl_load / ulg_load:.1f}x")
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+CFG build time and allocations with span-based lazy labels (`source_text`)
+against eager decoding, on large generated Python and Rust files (or the
+files given on the command line).
+
+"eager" decodes every label while building, as the builders did before
+(whole statements included);
+"lazy" keeps (start, end) spans into the shared source buffer. The
+"+ render" rows also render every function to DSL, which reads every
+label. All graphs are kept alive, as `analyze_file` does.
+
+    python benchmarks/bench_labels.py [--functions 2000] [files ...]
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import source_text  # noqa: E402
+from ast_engine import ASTEngine  # noqa: E402
+from config_loader import ConfigLoader  # noqa: E402
+from discovery import iter_functions  # noqa: E402
+from file_pipeline import LANGUAGES, lang_of  # noqa: E402
+from renderer_dsl import DSLRenderer  # noqa: E402
+
+# Long multi-line statements: the eager path decoded all of them
+PY_FUNCTION = """
+def handler_{k}(request, table):
+    settings = {{
+        "name": request.name, "retries": 3, "timeout": table.timeout * 2,
+        "tags": [tag.strip().lower() for tag in request.tags if tag],
+        "owner": request.owner or table.default_owner,
+    }}
+    if request.kind == "batch" and len(request.items) > table.limit_{k}:
+        raise ValueError("batch too large for table {k}")
+    for item in request.items:
+        table.insert(item, settings=settings, on_conflict="replace", audit=True)
+    while table.pending() > 0 and not request.cancelled:
+        table.flush(
+            force=True,
+            reason="drain",
+        )
+    return settings
+"""
+
+RS_FUNCTION = """
+fn handler_{k}(request: &Request, table: &mut Table) -> Result<Settings, Error> {{
+    let settings = Settings {{
+        name: request.name.clone(), retries: 3, timeout: table.timeout * 2,
+        tags: request.tags.iter().filter(|t| !t.is_empty()).cloned().collect(),
+    }};
+    if request.kind == Kind::Batch && request.items.len() > table.limit_{k} {{
+        return Err(Error::TooLarge({k}));
+    }}
+    for item in request.items.iter() {{
+        table.insert(item, &settings, Conflict::Replace, true)?;
+    }}
+    while table.pending() > 0 && !request.cancelled {{
+        table.flush(
+            true,
+            "drain",
+        )?;
+    }}
+    Ok(settings)
+}}
+"""
+
+
+def make_files(scratch, functions):
+    paths = []
+    for ext, template in [("py", PY_FUNCTION), ("rs", RS_FUNCTION)]:
+        path = os.path.join(scratch, f"large.{ext}")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("".join(template.format(k=k) for k in range(functions)))
+        paths.append(path)
+    return paths
+
+
+def eager_label(self, template, *nodes):
+    return template.format(*(self.text(node) for node in nodes))
+
+
+def eager_summary(self, node, prefix=""):
+    """The previous statement label: decode it whole, keep the first line."""
+    summary = self.text(node).split("\n")[0].strip()
+    if len(summary) > source_text.SUMMARY_CHARS:
+        summary = summary[: source_text.SUMMARY_CHARS - 3] + "..."
+    if prefix and not summary.startswith(prefix):
+        summary = prefix + summary
+    return summary
+
+
+def build_all(builder, fn_nodes, render):
+    graphs = []
+    for fn_node in fn_nodes:
+        graphs.append(builder.build_from_function(fn_node))
+        if render:
+            DSLRenderer(graphs[-1]).render()
+    return graphs
+
+
+def measure(path, config, mode, repeat):
+    lang = lang_of(path)
+    tree, code = ASTEngine().parse_file(path)
+    fn_nodes = [fn.node for fn in iter_functions(tree.root_node, lang, code)]
+
+    patched = {}
+    if mode.startswith("eager"):
+        for name, fn in (("label", eager_label), ("summary", eager_summary)):
+            patched[name] = getattr(source_text.SourceText, name)
+            setattr(source_text.SourceText, name, fn)
+    try:
+        # Best of `repeat`, timed without tracemalloc (its hooks distort
+        # allocation-heavy code) and with the cyclic GC paused, whose pauses
+        # otherwise depend on what earlier rows left on the heap
+        seconds = float("inf")
+        for _ in range(repeat):
+            builder = LANGUAGES[lang](code)
+            builder.set_config_loader(config)
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            graphs = build_all(builder, fn_nodes, render=mode.endswith("render"))
+            seconds = min(seconds, time.perf_counter() - start)
+            gc.enable()
+            del graphs
+
+        builder = LANGUAGES[lang](code)
+        builder.set_config_loader(config)
+        tracemalloc.start()
+        graphs = build_all(builder, fn_nodes, render=mode.endswith("render"))
+        snapshot = tracemalloc.take_snapshot()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del graphs
+    finally:
+        for name, fn in patched.items():
+            setattr(source_text.SourceText, name, fn)
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return len(fn_nodes), seconds, blocks, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lazy label benchmark")
+    parser.add_argument("files", nargs="*", help="Source files (default: generated)")
+    parser.add_argument("--functions", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    config = ConfigLoader("logic_config.yaml")
+    scratch = tempfile.mkdtemp(prefix="bench_labels_")
+    try:
+        paths = args.files or make_files(scratch, args.functions)
+        for path in paths:
+            print(f"[*] {os.path.basename(path)} ({os.path.getsize(path) >> 10} KiB)")
+            for mode in ("eager", "lazy", "eager + render", "lazy + render"):
+                n, seconds, blocks, peak = measure(path, config, mode, args.repeat)
+                print(
+                    f"    {mode:<14} {n} functions in {seconds:6.2f}s  "
+                    f"{blocks:9} live blocks  peak {peak / 2**20:6.1f} MiB"
+                )
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Files-per-second benchmark for per-file mode rendering (CFG + DOT + SVG).
+
+Compares one blocking `dot` process per file (the old `process_file`
+path) with `LayoutService`, which batches documents per `dot` process and
+overlaps layout with CFG building. The sources under `path` are copied
+round-robin into a scratch directory until `--files` files exist. A
+discarded warm-up pass loads the page cache and the `dot` binary, then the
+two modes alternate which runs first for `--rounds` rounds (best kept).
+
+    python benchmarks/bench_layout.py /path/to/project [--files 1000] [--jobs 0]
+        [--rounds 2]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from ast_engine import get_engine  # noqa: E402
+from config_loader import ConfigLoader  # noqa: E402
+from file_pipeline import analyze_file  # noqa: E402
+from layout_service import LayoutService, pygraphviz  # noqa: E402
+from output_writer import write_logic_outputs  # noqa: E402
+from bench_pipeline import collect_targets  # noqa: E402
+
+
+def make_corpus(sources, count, scratch):
+    targets = []
+    for i in range(count):
+        src = sources[i % len(sources)]
+        stem, ext = os.path.splitext(os.path.basename(src))
+        dst = os.path.join(scratch, f"d{i // 100:03d}", f"{stem}_{i}{ext}")
+        os.makedirs(os.path.dirname(dst), exist_ok=True)
+        shutil.copyfile(src, dst)
+        targets.append(dst)
+    return targets
+
+
+def render_all(targets, config, layout):
+    engine = get_engine()
+    for file_path in targets:
+        analysis = analyze_file(file_path, config, engine)
+        if not analysis or not analysis.functions:
+            continue
+        out_dir = os.path.join(os.path.dirname(file_path), "out")
+        stem = os.path.splitext(os.path.basename(file_path))[0]
+        write_logic_outputs(
+            analysis.functions[0].graph, "svg", out_dir, stem, layout=layout
+        )
+
+
+def quiet(_result):
+    pass
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-file rendering benchmark")
+    parser.add_argument("path", help="Directory with .rs/.py sources to replicate")
+    parser.add_argument("--files", type=int, default=1000)
+    parser.add_argument("--jobs", type=int, default=0, help="Layout workers")
+    parser.add_argument("--rounds", type=int, default=2)
+    args = parser.parse_args()
+
+    if shutil.which("dot") is None and pygraphviz is None:
+        print("[!] Graphviz not found (`dot` or pygraphviz); nothing to measure")
+        sys.exit(1)
+    sources = collect_targets(args.path)
+    if not sources:
+        print(f"[!] No .rs/.py files under {args.path}")
+        sys.exit(1)
+    config = ConfigLoader("logic_config.yaml")
+
+    scratch = tempfile.mkdtemp(prefix="bench_layout_")
+    try:
+        targets = make_corpus(sources, args.files, scratch)
+        print(f"[*] {len(targets)} files")
+
+        devnull = open(os.devnull, "w")
+        stdout, sys.stdout = sys.stdout, devnull  # silence per-file messages
+        # Only read for the summary line (mode, worker count)
+        layout = LayoutService(args.jobs, on_done=quiet)
+        layout.close()
+
+        def run_serial():
+            render_all(targets, config, None)
+
+        def run_pooled():
+            with LayoutService(args.jobs, on_done=quiet) as service:
+                render_all(targets, config, service)
+
+        try:
+            run_serial()  # warm-up, discarded
+            serial = pooled = float("inf")
+            for i in range(max(1, args.rounds)):
+                if i % 2:
+                    pooled = min(pooled, timed(run_pooled))
+                    serial = min(serial, timed(run_serial))
+                else:
+                    serial = min(serial, timed(run_serial))
+                    pooled = min(pooled, timed(run_pooled))
+        finally:
+            sys.stdout = stdout
+            devnull.close()
+
+        mode = "in-process" if layout.in_process else f"batched x{layout.batch_size}"
+        print(f"    per-file dot {serial:8.2f}s  {len(targets) / serial:8.1f} files/s")
+        print(
+            f"    service      {pooled:8.2f}s  {len(targets) / pooled:8.1f} files/s"
+            f"  ({mode}, {layout.workers} worker(s))"
+        )
+        print(f"[*] Speedup: {serial / pooled:.2f}x")
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Files-per-second benchmark for atlas Phase A (parse + CFG build).
+
+Compares the legacy loop (re-read the file and allocate a builder per
+function) with the parse-once pipeline in `file_pipeline.analyze_file`.
+
+    python benchmarks/bench_pipeline.py /path/to/project [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from ast_engine import ASTEngine  # noqa: E402
+from config_loader import ConfigLoader  # noqa: E402
+from file_pipeline import LANGUAGES, analyze_file, lang_of  # noqa: E402
+
+
+def collect_targets(root):
+    targets = []
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if name.endswith((".rs", ".py")):
+                targets.append(os.path.join(dirpath, name))
+    return sorted(targets)
+
+
+def find_functions(node, lang_type):
+    """The pre-cursor recursive discovery, kept as the baseline."""
+    funcs = []
+    if lang_type == "rs" and node.type == "function_item":
+        funcs.append(node)
+    elif lang_type == "py" and node.type == "function_definition":
+        funcs.append(node)
+
+    if hasattr(node, "children"):
+        for child in node.children:
+            funcs.extend(find_functions(child, lang_type))
+    return funcs
+
+
+def legacy_phase_a(targets, config):
+    """The pre-pipeline loop: one read + one builder per function."""
+    for file_path in targets:
+        lang = lang_of(file_path)
+        tree, _ = ASTEngine().parse_file(file_path)
+        for fn_node in find_functions(tree.root_node, lang):
+            with open(file_path, "rb") as f:
+                code = f.read()
+            builder = LANGUAGES[lang](code)
+            builder.set_config_loader(config)
+            builder.build_from_function(fn_node)
+
+
+def pipeline_phase_a(targets, config):
+    engine = ASTEngine()
+    for file_path in targets:
+        analyze_file(file_path, config, engine)
+
+
+def best_of(fn, targets, config, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(targets, config)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Phase A throughput benchmark")
+    parser.add_argument("path", help="Project directory to index")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    targets = collect_targets(args.path)
+    if not targets:
+        print(f"[!] No .rs/.py files under {args.path}")
+        sys.exit(1)
+    config = ConfigLoader("logic_config.yaml")
+
+    print(f"[*] {len(targets)} files, best of {args.repeat}")
+    results = [
+        ("legacy", best_of(legacy_phase_a, targets, config, args.repeat)),
+        ("pipeline", best_of(pipeline_phase_a, targets, config, args.repeat)),
+    ]
+    for label, secs in results:
+        print(f"    {label:<9} {secs:8.3f}s  {len(targets) / secs:9.1f} files/s")
+    print(f"[*] Speedup: {results[0][1] / results[1][1]:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Write time, size and query latency of the SQLite atlas store (`--store`).
+
+Builds the synthetic atlas of `bench_ir_backend` and links every call
+node to the entry of a function in another file, so the call graph spans
+the whole project. Then times `write_store` and each `main.py query`.
+
+    python benchmarks/bench_store.py [--nodes 1000000] [--backend compact]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from atlas_store import AtlasStore, write_store  # noqa: E402
+from bench_ir_backend import (  # noqa: E402
+    DIAMONDS_PER_FUNCTION,
+    FUNCTIONS_PER_FILE,
+    build_function,
+)
+from ir_graph import BACKENDS, EdgeType, NodeType, set_backend  # noqa: E402
+from ir_view import GraphView  # noqa: E402
+
+
+def build_linked_atlas(target_nodes):
+    atlas = GraphView("ProjectAtlas")
+    per_function = 2 + 6 * DIAMONDS_PER_FUNCTION
+    n_files = max(2, target_nodes // (per_function * FUNCTIONS_PER_FILE))
+    functions, calls = [], []
+    for f in range(n_files):
+        file_graph = GraphView(f"mod{f}.rs")
+        for k in range(FUNCTIONS_PER_FILE):
+            fn = build_function(k)
+            file_graph.merge_graph(fn, f"f{k}")
+            prefix = f"src_mod{f}_rs_f{k}"
+            functions.append(
+                (f"mod{f}::f{k}", f"f{k}", f"mod{f}.rs", f"{prefix}_{fn.entry_node}")
+            )
+            for node in fn.nodes():
+                if node.type == NodeType.CALL:
+                    calls.append(f"{prefix}_{node.id}")
+        atlas.merge_graph(file_graph, f"src_mod{f}_rs")
+
+    for i, call_id in enumerate(calls):
+        # Call i targets a function two files ahead: one connected call graph
+        target = functions[(i * 7 + 2 * FUNCTIONS_PER_FILE) % len(functions)][3]
+        atlas.add_edge(
+            atlas.get_node(call_id), atlas.get_node(target), EdgeType.LINK, "calls"
+        )
+    return atlas, functions
+
+
+def timed(label, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"    {label:<22} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Atlas store benchmark")
+    parser.add_argument("--nodes", type=int, default=1_000_000)
+    parser.add_argument("--backend", choices=BACKENDS, default="compact")
+    args = parser.parse_args()
+
+    set_backend(args.backend)
+    start = time.perf_counter()
+    atlas, functions = build_linked_atlas(args.nodes)
+    print(
+        f"[*] Synthetic atlas: {atlas.number_of_nodes()} nodes, "
+        f"{len(functions)} functions ({time.perf_counter() - start:.1f}s)"
+    )
+
+    scratch = tempfile.mkdtemp(prefix="bench_store_")
+    try:
+        path = os.path.join(scratch, "project_atlas.db")
+        start = time.perf_counter()
+        write_store(path, atlas, functions)
+        print(
+            f"[*] write_store {time.perf_counter() - start:.1f}s, "
+            f"{os.path.getsize(path) / 2**20:.1f} MiB"
+        )
+
+        store = AtlasStore(path)
+        first, last = functions[0][0], functions[-1][0]
+        print("[*] Query latency")
+        fids = timed("match", lambda: store.match(first))
+        ids = [fid for fid, _ in fids]
+        timed("callers", lambda: store.callers(ids))
+        timed("callees", lambda: store.callees(ids))
+        reach = timed("reach (upstream)", lambda: store.reach(ids))
+        timed("reachable", lambda: store.reach(ids, upstream=False))
+        target = [fid for fid, _ in store.match(last)]
+        chain = timed("path (cold cache)", lambda: store.path(ids, target))
+        timed("path (warm cache)", lambda: store.path(ids, target))
+        timed("find EXIT 'Return'", lambda: store.find("Return", "EXIT", 50))
+        print(f"[*] {len(reach)} functions reach {first}; path length {len(chain)}")
+        store.close()
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
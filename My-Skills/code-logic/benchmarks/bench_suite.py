@@ -0,0 +1,345 @@
+"""
+Scaling benchmark over generated projects of 10 to 10k files
+(`corpus_gen.py`). Each scale runs three workloads, each in a fresh
+interpreter so peak RSS is its own:
+
+    per_file  `process_file` (--all-functions) on every file
+    unified   `run_unified_atlas` on the whole project
+    render    every renderer (DSL, DOT, condensed DOT) over every file graph
+
+Throughput, peak RSS (of the workload process and of its largest child,
+e.g. an indexing worker with --jobs), output bytes and `--profile` phase
+totals go to a JSON results file. The unified workload fails if no call
+is cross-linked. Graphviz is hidden unless --layout, so only DOT
+generation is timed and `dot` need not be installed. With --baseline, the
+previous results are diffed and the exit code is 1 on a regression.
+
+    python benchmarks/bench_suite.py [--scales 10,100,1000,10000]
+        [--results bench_results.json] [--baseline old.json] [--layout]
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from argparse import Namespace
+from dataclasses import asdict
+
+SCRIPTS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts")
+sys.path.insert(0, SCRIPTS)
+
+from bench_pipeline import collect_targets  # noqa: E402
+from corpus_gen import Shape, generate  # noqa: E402
+
+# Bump when the results layout changes
+RESULTS_FORMAT = 1
+WORKLOADS = ("per_file", "unified", "render")
+# metric -> +1 if higher is better, -1 if lower is better
+METRICS = {
+    "files_per_s": 1,
+    "peak_rss_kib": -1,
+    "children_peak_rss_kib": -1,
+    "output_bytes": -1,
+}
+
+
+class ByteCount:
+    """Binary sink that only counts what renderers write."""
+
+    def __init__(self):
+        self.size = 0
+
+    def write(self, data):
+        self.size += len(data)
+
+
+class DotOnly:
+    """Stands in for LayoutService: DOT files are written, never laid out."""
+
+    def submit(self, dot_path, svg_path):
+        pass
+
+    def close(self):
+        return []
+
+
+def output_bytes(root, suffixes=(".lisp", ".dot", ".svg")) -> int:
+    total = 0
+    for dirpath, _, files in os.walk(root):
+        total += sum(
+            os.path.getsize(os.path.join(dirpath, name))
+            for name in files
+            if name.endswith(suffixes)
+        )
+    return total
+
+
+def run_per_file(corpus, out_dir, config, settings):
+    from file_batch import run_file
+    from layout_service import LayoutService
+
+    args = Namespace(
+        all_functions=True,
+        split_functions=False,
+        focus=None,
+        format="both",
+        svg_dir=os.path.join(out_dir, "svg"),
+        condense=False,
+        save_ir=False,
+    )
+    targets = collect_targets(corpus)
+    layout = LayoutService(on_done=None) if settings["layout"] else DotOnly()
+    start = time.perf_counter()
+    reports = [run_file(path, args, config, corpus, layout) for path in targets]
+    layout.close()
+    seconds = time.perf_counter() - start
+    size = output_bytes(corpus) + output_bytes(args.svg_dir)
+    for dirpath, dirnames, _ in os.walk(corpus):
+        for name in [d for d in dirnames if d.endswith("_logic")]:
+            shutil.rmtree(os.path.join(dirpath, name))
+            dirnames.remove(name)
+    return {
+        "files": len(targets),
+        "failed": sum(report.status == "failed" for report in reports),
+        "seconds": seconds,
+        "output_bytes": size,
+    }
+
+
+def run_unified(corpus, out_dir, config, settings):
+    from main import run_unified_atlas
+
+    args = Namespace(
+        svg_dir=os.path.join(out_dir, "atlas"),
+        no_cache=True,
+        jobs=settings["jobs"],
+        config="logic_config.yaml",
+        ir_backend=settings["ir_backend"],
+        store=False,
+        save_ir=False,
+        lod="full",
+        condense=False,
+        shard=None,
+        format="svg",
+        force=True,
+        render_jobs=0,
+        layout_timeout=600,
+    )
+    targets = collect_targets(corpus)
+    start = time.perf_counter()
+    atlas = run_unified_atlas(targets, args, config, corpus)
+    seconds = time.perf_counter() - start
+    # The generated calls must resolve, or linking is not being measured
+    if len(targets) > 1 and not atlas["cross_links"]:
+        raise RuntimeError(f"no cross-links among {len(targets)} files")
+    return {
+        "files": len(targets),
+        "seconds": seconds,
+        "output_bytes": output_bytes(args.svg_dir),
+        "cross_links": atlas["cross_links"],
+        "call_sites": atlas["call_sites"],
+    }
+
+
+def run_render(corpus, out_dir, config, settings):
+    from file_pipeline import analyze_file, build_file_graph
+    from ir_condense import condense
+    from renderer_dot import DotRenderer
+    from renderer_dsl import DSLRenderer
+
+    targets = collect_targets(corpus)
+    graphs = [build_file_graph(analyze_file(path, config)) for path in targets]
+    renderers = {
+        "dsl": lambda graph: DSLRenderer(graph),
+        "dot": lambda graph: DotRenderer(graph),
+        "dot_condensed": lambda graph: DotRenderer(condense(graph)),
+    }
+    result = {"files": len(targets), "seconds": 0.0, "output_bytes": 0}
+    for name, make in renderers.items():
+        sink = ByteCount()
+        start = time.perf_counter()
+        for graph in graphs:
+            make(graph).write(sink)
+        seconds = time.perf_counter() - start
+        result[name] = {
+            "seconds": seconds,
+            "files_per_s": len(graphs) / seconds if seconds else 0.0,
+            "output_bytes": sink.size,
+        }
+        result["seconds"] += seconds
+        result["output_bytes"] += sink.size
+    return result
+
+
+RUNNERS = {"per_file": run_per_file, "unified": run_unified, "render": run_render}
+
+
+def child(workload, corpus, out_dir, settings):
+    """One workload in this (fresh) interpreter; prints its result as JSON."""
+    if not settings["layout"]:
+        os.environ["PATH"] = ""  # `dot` not found: the DOT-only fallbacks
+        import layout_service
+
+        layout_service.pygraphviz = None
+    import profiler
+    from config_loader import ConfigLoader
+    from ir_graph import set_backend
+
+    set_backend(settings["ir_backend"])
+    profiler.enable()
+    config = ConfigLoader("logic_config.yaml")
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        result = RUNNERS[workload](corpus, out_dir, config, settings)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+    events, files, _ = profiler.take()
+    # Graph sizes from the per-file rows of the profiler
+    for key in ("functions", "nodes", "edges"):
+        if files:
+            result[key] = sum(row[key] for row in files)
+    result["files_per_s"] = result["files"] / result["seconds"]
+    result["peak_rss_kib"] = profiler.peak_rss_kib()
+    # Largest finished child: the --jobs indexing workers (or `dot`)
+    result["children_peak_rss_kib"] = profiler.peak_rss_kib(children=True)
+    result["phases"] = profiler.phase_totals(events)
+    print(json.dumps(result))
+
+
+def measure(workload, corpus, out_dir, settings) -> dict:
+    proc = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--child",
+            workload,
+            corpus,
+            out_dir,
+            json.dumps(settings),
+        ],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode:
+        raise RuntimeError(f"{workload} failed:\n{proc.stderr}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _entries(runs, old_runs):
+    """(label, result, baseline result) per workload and per renderer."""
+    for workload, result in runs.items():
+        old = old_runs.get(workload)
+        if not old:
+            continue
+        yield workload, result, old
+        for name, part in result.items():
+            if isinstance(part, dict) and isinstance(old.get(name), dict):
+                yield f"{workload}.{name}", part, old[name]
+
+
+def compare(results, baseline, tolerance) -> int:
+    """Print metric changes against `baseline`; returns the regression count."""
+    regressions = 0
+    for scale, runs in results["runs"].items():
+        for workload, result, old in _entries(
+            runs, baseline.get("runs", {}).get(scale, {})
+        ):
+            for metric, direction in METRICS.items():
+                before, after = old.get(metric), result.get(metric)
+                if not before or after is None:
+                    continue
+                change = (after - before) / before
+                worse = change * direction < -tolerance
+                regressions += worse
+                print(
+                    f"    {'[!]' if worse else '   '} {scale:>6} {workload:<22} "
+                    f"{metric:<21} {before:>12.1f} -> {after:>12.1f} ({change:+.1%})"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scaling benchmark suite")
+    parser.add_argument("--scales", default="10,100,1000,10000")
+    parser.add_argument("--workloads", default=",".join(WORKLOADS))
+    parser.add_argument("--lang", choices=["rs", "py", "both"], default="both")
+    parser.add_argument("--functions", type=int, default=Shape.functions)
+    parser.add_argument("--depth", type=int, default=Shape.depth)
+    parser.add_argument("--arms", type=int, default=Shape.arms)
+    parser.add_argument("--call-density", type=float, default=Shape.call_density)
+    parser.add_argument("--seed", type=int, default=Shape.seed)
+    parser.add_argument("--jobs", type=int, default=1, help="Unified indexing workers")
+    parser.add_argument("--ir-backend", default="networkx")
+    parser.add_argument("--layout", action="store_true", help="Include Graphviz")
+    parser.add_argument("--results", default="bench_results.json")
+    parser.add_argument("--baseline", help="Earlier results file to diff against")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.15, help="Allowed relative regression"
+    )
+    parser.add_argument("--child", nargs=4, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        workload, corpus, out_dir, settings = args.child
+        child(workload, corpus, out_dir, json.loads(settings))
+        return
+
+    shape = Shape(args.functions, args.depth, args.arms, args.call_density, args.seed)
+    settings = {"layout": args.layout, "jobs": args.jobs, "ir_backend": args.ir_backend}
+    workloads = [name for name in args.workloads.split(",") if name]
+    results = {
+        "format": RESULTS_FORMAT,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "lang": args.lang,
+        "shape": asdict(shape),
+        "settings": settings,
+        "runs": {},
+    }
+    scratch = tempfile.mkdtemp(prefix="bench_suite_")
+    try:
+        for scale in (int(n) for n in args.scales.split(",")):
+            corpus = os.path.join(scratch, f"corpus_{scale}")
+            paths = generate(corpus, scale, args.lang, shape)
+            size = sum(os.path.getsize(path) for path in paths)
+            print(f"[*] {scale} files ({size >> 10} KiB)")
+            runs = results["runs"][str(scale)] = {}
+            for workload in workloads:
+                out_dir = os.path.join(scratch, f"out_{scale}_{workload}")
+                result = runs[workload] = measure(workload, corpus, out_dir, settings)
+                shutil.rmtree(out_dir, ignore_errors=True)
+                print(
+                    f"    {workload:<9} {result['seconds']:8.2f}s  "
+                    f"{result['files_per_s']:8.1f} files/s  "
+                    f"peak {result['peak_rss_kib'] / 1024:7.1f} MiB  "
+                    f"child {(result['children_peak_rss_kib'] or 0) / 1024:7.1f} MiB  "
+                    f"out {result['output_bytes'] >> 10:8} KiB"
+                )
+            shutil.rmtree(corpus)
+    finally:
+        shutil.rmtree(scratch)
+
+    with open(args.results, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=1)
+    print(f"[+] Results saved to: {args.results}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+        print(f"[*] Against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print(f"[!] {regressions} regression(s)")
+            sys.exit(1)
+        print("[+] No regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Link recall and resolution throughput of atlas cross-linking (Phase C).
+
+Generates a synthetic project whose modules all define `new`, `run`,
+`step` and `helper`, and call each other through `use`/`import`
+bindings, aliases, `Self::`/`self.` and module paths. Every call site has
+a known target. The legacy bare-name resolver (`SymbolTable.resolve`) is
+compared with the scoped, import-aware `SymbolTable.resolve_call`.
+
+    python benchmarks/bench_symbols.py [--modules 2000] [--lang rs|py]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+from config_loader import ConfigLoader  # noqa: E402
+from parallel_index import index_files  # noqa: E402
+from symbol_table import SymbolTable  # noqa: E402
+
+RUST_MODULE = """\
+use crate::m{j}::{{T{j}, build_{j}}};
+use crate::m{i}::T{i} as Alias{i};
+
+pub struct T{k};
+
+impl T{k} {{
+    pub fn new() -> Self {{
+        T{k}
+    }}
+
+    pub fn run(&self) {{
+        self.step();
+        Self::new();
+        T{j}::new();
+        Alias{i}::new();
+        build_{j}();
+        crate::m{i}::run();
+        helper();
+    }}
+
+    fn step(&self) {{}}
+}}
+
+pub fn build_{k}() {{
+    T{k}::new();
+}}
+
+pub fn run() {{
+    helper();
+}}
+
+fn helper() {{}}
+"""
+
+PYTHON_MODULE = """\
+from .m{j} import T{j}, build_{j}
+from . import m{i}
+from .m{i} import helper as helper_{i}
+
+
+class T{k}:
+    def new(self):
+        self.run()
+
+    def run(self):
+        self.step()
+        build_{j}()
+        m{i}.run()
+        helper_{i}()
+        helper()
+
+    def step(self):
+        pass
+
+
+def build_{k}():
+    helper()
+
+
+def run():
+    helper()
+
+
+def helper():
+    pass
+"""
+
+
+def expected_calls(lang, k, j, i):
+    """(caller, callee) -> qualified target for module `k`."""
+    if lang == "rs":
+        m = lambda n: f"synth::m{n}"  # noqa: E731
+        own = f"{m(k)}::T{k}"
+        return {
+            (f"T{k}::run", "self.step"): f"{own}::step",
+            (f"T{k}::run", "Self::new"): f"{own}::new",
+            (f"T{k}::run", f"T{j}::new"): f"{m(j)}::T{j}::new",
+            (f"T{k}::run", f"Alias{i}::new"): f"{m(i)}::T{i}::new",
+            (f"T{k}::run", f"build_{j}"): f"{m(j)}::build_{j}",
+            (f"T{k}::run", f"crate::m{i}::run"): f"{m(i)}::run",
+            (f"T{k}::run", "helper"): f"{m(k)}::helper",
+            (f"build_{k}", f"T{k}::new"): f"{own}::new",
+            ("run", "helper"): f"{m(k)}::helper",
+        }
+    m = lambda n: f"pkg.m{n}"  # noqa: E731
+    return {
+        (f"T{k}.new", "self.run"): f"{m(k)}.T{k}.run",
+        (f"T{k}.run", "self.step"): f"{m(k)}.T{k}.step",
+        (f"T{k}.run", f"build_{j}"): f"{m(j)}.build_{j}",
+        (f"T{k}.run", f"m{i}.run"): f"{m(i)}.run",
+        (f"T{k}.run", f"helper_{i}"): f"{m(i)}.helper",
+        (f"T{k}.run", "helper"): f"{m(k)}.helper",
+        (f"build_{k}", "helper"): f"{m(k)}.helper",
+        ("run", "helper"): f"{m(k)}.helper",
+    }
+
+
+def make_project(root, lang, modules):
+    """Write the project; returns {(file_path, caller, callee): target}."""
+    truth = {}
+    if lang == "rs":
+        src = os.path.join(root, "synth", "src")
+        os.makedirs(src)
+        with open(os.path.join(src, "lib.rs"), "w") as f:
+            f.writelines(f"pub mod m{k};\n" for k in range(modules))
+        template, ext = RUST_MODULE, "rs"
+    else:
+        src = os.path.join(root, "pkg")
+        os.makedirs(src)
+        open(os.path.join(src, "__init__.py"), "w").close()
+        template, ext = PYTHON_MODULE, "py"
+
+    for k in range(modules):
+        j, i = (k + 1) % modules, (k + 2) % modules
+        path = os.path.join(src, f"m{k}.{ext}")
+        with open(path, "w") as f:
+            f.write(template.format(k=k, j=j, i=i))
+        for (caller, callee), target in expected_calls(lang, k, j, i).items():
+            truth[(path, caller, callee)] = target
+    return src, truth
+
+
+def build_tables(results):
+    legacy, scoped = SymbolTable(), SymbolTable()
+    sites = []
+    for result in results:
+        if result.graph is None:
+            continue
+        scoped.add_file(result.file_path, result.lang, result.imports)
+        for name, qualname, entry_id in result.symbols:
+            legacy.register(name, result.file_path, entry_id)
+            scoped.register(name, result.file_path, entry_id, qualname=qualname)
+        for callee, _, caller in result.calls:
+            sites.append((callee, result.file_path, caller))
+    return legacy, scoped, sites
+
+
+def score(found, truth_target, scoped):
+    if found is None:
+        return "missed"
+    expected = scoped.qualified.get(truth_target)
+    if expected is not None and (found.file_path, found.node_id) == (
+        expected.file_path,
+        expected.node_id,
+    ):
+        return "correct"
+    return "wrong"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-link resolution benchmark")
+    parser.add_argument("--modules", type=int, default=2000)
+    parser.add_argument("--lang", choices=["rs", "py"], default="rs")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix="bench_symbols_")
+    try:
+        src, truth = make_project(scratch, args.lang, max(3, args.modules))
+        targets = sorted(
+            os.path.join(src, name) for name in os.listdir(src) if name[0] == "m"
+        )
+        config = ConfigLoader("logic_config.yaml")
+
+        start = time.perf_counter()
+        results = list(index_files(targets, config))
+        indexed = time.perf_counter() - start
+        legacy, scoped, sites = build_tables(results)
+        print(
+            f"[*] {len(targets)} files, {len(scoped.qualified)} functions, "
+            f"{len(sites)} call sites (indexed in {indexed:.2f}s)"
+        )
+
+        resolvers = [
+            ("bare name", lambda c, p, f: legacy.resolve(c)),
+            ("scoped", scoped.resolve_call),
+        ]
+        for label, resolve in resolvers:
+            counts = {"correct": 0, "wrong": 0, "missed": 0}
+            for callee, path, caller in sites:
+                target = truth.get((path, caller, callee))
+                counts[score(resolve(callee, path, caller), target, scoped)] += 1
+
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                for callee, path, caller in sites:
+                    resolve(callee, path, caller)
+                best = min(best, time.perf_counter() - start)
+
+            print(
+                f"    {label:<10} recall {counts['correct'] / len(sites):6.1%}  "
+                f"wrong {counts['wrong']:6d}  "
+                f"{len(sites) / best / 1e6:6.2f} M resolutions/s"
+            )
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
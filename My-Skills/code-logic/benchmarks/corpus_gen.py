@@ -0,0 +1,215 @@
+"""
+Synthetic Rust/Python project generator for the benchmarks.
+
+Every module holds `--functions` functions whose bodies nest if/else,
+loops and match statements `--depth` levels deep, with `--arms` match arms
+each. A `--call-density` fraction of the call sites targets a function in
+another module (through `use` / `from ... import`); the rest call a
+function of the same module. Output is deterministic for a given seed.
+
+    python benchmarks/corpus_gen.py OUT [--files 100] [--lang both] [--depth 3]
+"""
+
+import argparse
+import os
+import random
+from dataclasses import dataclass
+from typing import List
+
+
+@dataclass
+class Shape:
+    functions: int = 8  # per file
+    depth: int = 3  # nesting levels of control flow
+    arms: int = 4  # match arms (plus a wildcard)
+    call_density: float = 0.2  # share of call sites into other modules
+    seed: int = 0
+
+
+class _Module:
+    """One generated module: bodies plus the cross-module names it uses."""
+
+    def __init__(self, lang: str, k: int, modules: int, shape: Shape):
+        self.lang = lang
+        self.k = k
+        self.modules = modules
+        self.shape = shape
+        self.rng = random.Random(shape.seed * 1_000_003 + k)
+        self.imports = set()  # (module index, function index)
+
+    def callee(self) -> str:
+        i = self.rng.randrange(self.shape.functions)
+        if self.modules > 1 and self.rng.random() < self.shape.call_density:
+            j = self.rng.randrange(self.modules - 1)
+            j += j >= self.k  # any module but this one
+            self.imports.add((j, i))
+            return f"f{j}_{i}"
+        return f"f{self.k}_{i}"
+
+    def body(self, level: int, indent: str) -> List[str]:
+        """
+        An assignment, a standalone call (what the CFG builders record as a
+        call site), a call inside an expression and one nested construct
+        per level.
+        """
+        rs = self.lang == "rs"
+        end = ";" if rs else ""
+        lines = [
+            f"{indent}acc += x * {level + 1}{end}",
+            f"{indent}{self.callee()}(x, items){end}",
+            f"{indent}acc += {self.callee()}(x, items){end}",
+        ]
+        if level >= self.shape.depth:
+            return lines
+        inner = indent + "    "
+        nested = self.body(level + 1, inner)
+        kind = self.rng.choice(("if", "for", "while", "match"))
+        if rs:
+            lines += self._rust_construct(kind, level, indent, inner, nested)
+        else:
+            lines += self._python_construct(kind, level, indent, inner, nested)
+        return lines
+
+    def _rust_construct(self, kind, level, indent, inner, nested):
+        if kind == "if":
+            return [
+                f"{indent}if acc > {level} {{",
+                *nested,
+                f"{indent}}} else {{",
+                f"{inner}acc -= 1;",
+                f"{indent}}}",
+            ]
+        if kind == "for":
+            return [
+                f"{indent}for x in items.iter().copied() {{",
+                *nested,
+                f"{indent}}}",
+            ]
+        if kind == "while":
+            return [
+                f"{indent}while acc < {level * 10 + 10} {{",
+                *nested,
+                f"{inner}if acc == 0 {{ break; }}",
+                f"{indent}}}",
+            ]
+        arms = [f"{inner}{n} => acc += {n}," for n in range(1, self.shape.arms)]
+        return [
+            f"{indent}match acc % {self.shape.arms + 1} {{",
+            f"{inner}0 => {{",
+            *["    " + line for line in nested],
+            f"{inner}}}",
+            *arms,
+            f"{inner}_ => return acc,",
+            f"{indent}}}",
+        ]
+
+    def _python_construct(self, kind, level, indent, inner, nested):
+        if kind == "if":
+            return [
+                f"{indent}if acc > {level}:",
+                *nested,
+                f"{indent}elif acc < 0:",
+                f"{inner}acc = 0",
+                f"{indent}else:",
+                f"{inner}acc -= 1",
+            ]
+        if kind == "for":
+            return [f"{indent}for x in items:", *nested]
+        if kind == "while":
+            return [
+                f"{indent}while acc < {level * 10 + 10}:",
+                *nested,
+                f"{inner}if acc == 0:",
+                f"{inner}    break",
+            ]
+        lines = [f"{indent}match acc % {self.shape.arms + 1}:", f"{inner}case 0:"]
+        lines += ["    " + line for line in nested]
+        for n in range(1, self.shape.arms):
+            lines += [f"{inner}case {n}:", f"{inner}    acc += {n}"]
+        lines += [f"{inner}case _:", f"{inner}    return acc"]
+        return lines
+
+    def render(self) -> str:
+        functions = []
+        for i in range(self.shape.functions):
+            if self.lang == "rs":
+                functions.append(
+                    "\n".join(
+                        [
+                            f"pub fn f{self.k}_{i}(x: i64, items: &[i64]) -> i64 {{",
+                            "    let mut acc = 0;",
+                            *self.body(0, "    "),
+                            "    acc",
+                            "}",
+                        ]
+                    )
+                )
+            else:
+                functions.append(
+                    "\n".join(
+                        [
+                            f"def f{self.k}_{i}(x, items):",
+                            "    acc = 0",
+                            *self.body(0, "    "),
+                            "    return acc",
+                        ]
+                    )
+                )
+        if self.lang == "rs":
+            header = [f"use crate::m{j}::f{j}_{i};" for j, i in sorted(self.imports)]
+        else:
+            header = [f"from pkg.m{j} import f{j}_{i}" for j, i in sorted(self.imports)]
+        return "\n".join(header + [""] + ["\n\n".join(functions), ""])
+
+
+def generate(
+    root: str, files: int, lang: str = "both", shape: Shape = None
+) -> List[str]:
+    """
+    Write `files` modules under `root` (`synth/src/m*.rs` for a crate,
+    `pkg/m*.py` for a package, split evenly for "both"). Returns the paths.
+    """
+    shape = shape or Shape()
+    langs = ["rs", "py"] if lang == "both" else [lang]
+    counts = [files // len(langs) + (n < files % len(langs)) for n in range(len(langs))]
+    paths = []
+    for lang, modules in zip(langs, counts):
+        if not modules:
+            continue
+        if lang == "rs":
+            src = os.path.join(root, "synth", "src")
+            os.makedirs(src, exist_ok=True)
+            with open(os.path.join(src, "lib.rs"), "w") as f:
+                f.writelines(f"pub mod m{k};\n" for k in range(modules))
+        else:
+            src = os.path.join(root, "pkg")
+            os.makedirs(src, exist_ok=True)
+            open(os.path.join(src, "__init__.py"), "w").close()
+        for k in range(modules):
+            path = os.path.join(src, f"m{k}.{lang}")
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(_Module(lang, k, modules, shape).render())
+            paths.append(path)
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic benchmark corpus")
+    parser.add_argument("out", help="Directory to create the project in")
+    parser.add_argument("--files", type=int, default=100)
+    parser.add_argument("--lang", choices=["rs", "py", "both"], default="both")
+    parser.add_argument("--functions", type=int, default=Shape.functions)
+    parser.add_argument("--depth", type=int, default=Shape.depth)
+    parser.add_argument("--arms", type=int, default=Shape.arms)
+    parser.add_argument("--call-density", type=float, default=Shape.call_density)
+    parser.add_argument("--seed", type=int, default=Shape.seed)
+    args = parser.parse_args()
+
+    shape = Shape(args.functions, args.depth, args.arms, args.call_density, args.seed)
+    paths = generate(args.out, args.files, args.lang, shape)
+    size = sum(os.path.getsize(path) for path in paths)
+    print(f"[+] {len(paths)} files ({size >> 10} KiB) in {args.out}")
+
+
+if __name__ == "__main__":
+    main()
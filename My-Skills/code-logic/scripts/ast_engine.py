@@ -1,51 +1,134 @@
 import os
-from tree_sitter import Language, Parser
-import tree_sitter_rust
-import tree_sitter_python
+from typing import List, Optional, Tuple
+from parser_registry import supports, timed_parse
+from syntax_errors import find_syntax_errors
+
+# (start_byte, end_byte) in the new source
+ByteRange = Tuple[int, int]
+
+
+def _point_at(code: bytes, byte: int) -> Tuple[int, int]:
+    """tree-sitter point (row, byte column) for a byte offset."""
+    row = code.count(b"\n", 0, byte)
+    return row, byte - (code.rfind(b"\n", 0, byte) + 1)
+
+
+def _common_prefix(a: bytes, b: bytes, limit: int) -> int:
+    # Binary search on slice equality: memcmp-speed even for large files
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
+
+
+def diff_edit(old: bytes, new: bytes) -> Tuple[int, int, int]:
+    """Smallest single byte-range replacement turning `old` into `new`."""
+    start = _common_prefix(old, new, min(len(old), len(new)))
+    limit = min(len(old), len(new)) - start
+    suffix = _common_prefix(old[::-1], new[::-1], limit) if limit else 0
+    return start, len(old) - suffix, len(new) - suffix
 
 
 class ASTEngine:
+    """
+    Parsing facade. Parsers live in the process-wide `parser_registry`
+    (grammars load lazily on first use), so engines are cheap to create;
+    an engine only owns its incremental-reparse sessions.
+    """
+
     def __init__(self):
-        self.parsers = {}
-        self._init_lang("rs", tree_sitter_rust)
-        self._init_lang("py", tree_sitter_python)
-
-    def _init_lang(self, ext, module):
-        try:
-            # New API for tree-sitter >= 0.22
-            lang = Language(module.language())
-            parser = Parser(lang)
-            self.parsers[ext] = parser
-        except Exception as e:
-            print(f"Error initializing {ext} parser: {e}")
-            raise e
-
-    def parse_file(self, file_path: str):
+        # Session state for incremental reparsing: path -> (tree, code)
+        self.sessions = {}
+
+    def parse_file(self, file_path: str, code: bytes = None):
+        """Parse `file_path`; pass `code` when the bytes are already in memory."""
         ext = file_path.split(".")[-1]
-        if ext not in self.parsers:
+        if not supports(ext):
             raise ValueError(f"Unsupported file extension: {ext}")
 
-        with open(file_path, "rb") as f:
-            code = f.read()
+        if code is None:
+            with open(file_path, "rb") as f:
+                code = f.read()
 
-        tree = self.parsers[ext].parse(code)
+        tree = timed_parse(ext, code)
 
-        # Check for syntax errors
-        if self._has_error(tree.root_node):
+        # Check for syntax errors (O(1) on clean trees)
+        if tree.root_node.has_error:
+            issues = find_syntax_errors(tree.root_node)
+            where = f" first at line {issues[0].line}" if issues else ""
             print(
                 f"Warning: Syntax errors detected in {file_path}. Analysis might be partial."
+                f" ({len(issues)} issue(s){where})"
             )
 
         return tree, code
 
-    def _has_error(self, node) -> bool:
-        """Recursively check for ERROR nodes."""
-        if node.type == "ERROR":
-            return True
-        for child in node.children:
-            if self._has_error(child):
-                return True
-        return False
+    def parse_incremental(
+        self, file_path: str, code: bytes = None
+    ) -> Tuple[object, bytes, Optional[List[ByteRange]]]:
+        """
+        Reparse `file_path` against the tree kept from its previous parse.
+        Returns (tree, code, changed). `changed` lists the byte ranges whose
+        syntax may differ, or None on the first parse (everything is new).
+        """
+        if code is None:
+            with open(file_path, "rb") as f:
+                code = f.read()
+
+        previous = self.sessions.get(file_path)
+        if previous is None:
+            tree, code = self.parse_file(file_path, code)
+            self.sessions[file_path] = (tree, code)
+            return tree, code, None
+
+        old_code = previous[1]
+        if code == old_code:
+            return previous[0], code, []
+        start, old_end, new_end = diff_edit(old_code, code)
+        return self._reparse(file_path, code, start, old_end, new_end)
+
+    def apply_edit(self, file_path: str, start: int, old_end: int, new_text: bytes):
+        """Apply an editor-supplied replacement of `old[start:old_end]` and reparse."""
+        old_code = self.sessions[file_path][1]
+        code = old_code[:start] + new_text + old_code[old_end:]
+        return self._reparse(file_path, code, start, old_end, start + len(new_text))
+
+    def forget(self, file_path: str):
+        self.sessions.pop(file_path, None)
+
+    def _reparse(self, file_path, code, start, old_end, new_end):
+        old_tree, old_code = self.sessions[file_path]
+        old_tree.edit(
+            start_byte=start,
+            old_end_byte=old_end,
+            new_end_byte=new_end,
+            start_point=_point_at(old_code, start),
+            old_end_point=_point_at(old_code, old_end),
+            new_end_point=_point_at(code, new_end),
+        )
+        ext = file_path.split(".")[-1]
+        tree = timed_parse(ext, code, old_tree)
+        self.sessions[file_path] = (tree, code)
+
+        # changed_ranges only reports structural changes; add the edit itself
+        changed = [(r.start_byte, r.end_byte) for r in old_tree.changed_ranges(tree)]
+        changed.append((start, new_end))
+        return tree, code, changed
+
+
+_shared_engine = None
+
+
+def get_engine() -> ASTEngine:
+    """Process-wide engine for callers that do not need their own sessions."""
+    global _shared_engine
+    if _shared_engine is None:
+        _shared_engine = ASTEngine()
+    return _shared_engine
 
 
 # Quick test if run directly
@@ -0,0 +1,101 @@
+import argparse
+import time
+
+from atlas_store import AtlasStore
+
+QUERIES = ("callers", "callees", "reach", "reachable", "path", "find")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py query",
+        description="Query an atlas database written by --unified --store",
+    )
+    parser.add_argument("db", help="Path to project_atlas.db")
+    parser.add_argument(
+        "query",
+        choices=QUERIES,
+        help="callers/callees: direct calls; reach: every function that can "
+        "reach the target; reachable: everything the target can reach; "
+        "path: shortest call chain A -> B; find: nodes by label",
+    )
+    parser.add_argument(
+        "target",
+        help="Function (qualified, `Type::fn`, bare) or node key; a LIKE pattern for find",
+    )
+    parser.add_argument("to", nargs="?", help="Destination function for `path`")
+    parser.add_argument("--type", help="Node type filter for find (e.g. EXIT)")
+    parser.add_argument("--limit", type=int, default=50, help="Rows shown for find")
+    return parser
+
+
+def _resolve(store, target):
+    fids = store.match(target)
+    if not fids:
+        print(f"[!] No function matches '{target}'")
+    elif len(fids) > 1:
+        print(f"[*] {len(fids)} functions match '{target}':")
+        for _, qualname in fids:
+            print(f"    {qualname}")
+    return [fid for fid, _ in fids]
+
+
+def run_query(store, args):
+    """Print and return the result rows; None if a function did not resolve."""
+    if args.query == "find":
+        rows = store.find(args.target, args.type, args.limit)
+        for key, node_type, label, qualname in rows:
+            print(f"  {key}  [{node_type}] {label!r}  in {qualname or '?'}")
+        return rows
+
+    fids = _resolve(store, args.target)
+    if not fids:
+        return None
+    if args.query in ("callers", "callees"):
+        lookup = store.callers if args.query == "callers" else store.callees
+        rows = lookup(fids)
+        for qualname, sites in rows:
+            print(f"  {qualname}  ({sites} call site{'s' if sites != 1 else ''})")
+        return rows
+    if args.query in ("reach", "reachable"):
+        rows = store.reach(fids, upstream=args.query == "reach")
+        for (qualname,) in rows:
+            print(f"  {qualname}")
+        return rows
+
+    if not args.to:
+        print("[!] path needs a destination: query DB path FROM TO")
+        return None
+    targets = _resolve(store, args.to)
+    if not targets:
+        return None
+    chain = store.path(fids, targets)
+    if chain:
+        print("  " + "\n  -> ".join(chain))
+    else:
+        print(f"[*] No call path from '{args.target}' to '{args.to}'")
+    return chain
+
+
+def query_main(argv) -> int:
+    """
+    `main.py query ...`. Returns the process exit status: 1 if the store
+    cannot be opened or a function argument matches nothing, else 0 (also
+    for an empty result).
+    """
+    args = build_parser().parse_args(argv)
+    try:
+        store = AtlasStore(args.db)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"[!] Cannot open atlas store: {e}")
+        return 1
+    try:
+        start = time.perf_counter()
+        rows = run_query(store, args)
+        elapsed = (time.perf_counter() - start) * 1000
+    finally:
+        store.close()
+    if rows is None:
+        return 1
+    print(f"[*] {len(rows)} result(s) in {elapsed:.1f} ms")
+    return 0
@@ -0,0 +1,287 @@
+import html
+import os
+import time
+from collections import ChainMap
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from ir_graph import EdgeType
+from layout_service import layout_file
+from parallel_index import resolve_jobs
+from profiler import phase
+from render_manifest import RenderManifest
+from renderer_dot import HREF_KEY, DotRenderer
+
+SHARD_MODES = ("cluster", "component")
+SHARD_DIRNAME = "shards"
+INDEX_NAME = "project_atlas_index"
+# Shard states with an up-to-date SVG
+LAID_OUT = ("ok", "unchanged")
+
+
+class ShardGraph:
+    """The nodes and edges of one shard, in the duck type DotRenderer reads."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.node_list = []
+        self.edge_list = []
+
+    def nodes(self):
+        return iter(self.node_list)
+
+    def edges(self):
+        return iter(self.edge_list)
+
+    def number_of_nodes(self) -> int:
+        return len(self.node_list)
+
+
+class GhostNode:
+    """A call target that lives in another shard; links to that shard's SVG."""
+
+    __slots__ = ("_node", "_href")
+
+    def __init__(self, node, href: str):
+        self._node = node
+        self._href = href
+
+    def __getattr__(self, name):
+        return getattr(self._node, name)
+
+    @property
+    def metadata(self):
+        return ChainMap({HREF_KEY: self._href}, self._node.metadata)
+
+
+@dataclass
+class Shard:
+    name: str
+    graph: ShardGraph
+    clusters: List[str] = field(default_factory=list)
+    cross_links: Dict[str, int] = field(default_factory=dict)  # shard -> count
+    status: str = "pending"
+    seconds: float = 0.0
+
+
+def _cluster(node) -> str:
+    return node.metadata.get("cluster", "")
+
+
+def partition(graph, mode: str) -> List[Shard]:
+    """
+    Split the atlas into shards: one per cluster (source file), or one per
+    connected component of files joined by LINK edges. Cross-shard LINKs
+    point at a ghost of the target that links to the target's shard.
+    A component is named after its smallest cluster, so adding or removing
+    a file does not rename the other shards.
+    """
+    members: Dict[str, list] = {}
+    for node in graph.nodes():
+        members.setdefault(_cluster(node), []).append(node)
+
+    out_edges: Dict[str, list] = {}
+    parent = {c: c for c in members}
+
+    def find(c):
+        while parent[c] != c:
+            parent[c] = parent[parent[c]]
+            c = parent[c]
+        return c
+
+    for edge in graph.edges():
+        u, v, type = edge[0], edge[1], edge[2]
+        cu = _cluster(u)
+        out_edges.setdefault(cu, []).append(edge)
+        if mode == "component" and type == EdgeType.LINK:
+            ru, rv = find(cu), find(_cluster(v))
+            if ru != rv:
+                parent[rv] = ru
+
+    groups: Dict[str, List[str]] = {}
+    for c in members:
+        groups.setdefault(find(c) if mode == "component" else c, []).append(c)
+
+    shards, shard_of = [], {}
+    for clusters in groups.values():
+        if mode == "cluster":
+            name = clusters[0] or "unclustered"
+        else:
+            name = f"component_{min(clusters) or 'unclustered'}"
+        shards.append(Shard(name, ShardGraph(name), clusters))
+        for c in clusters:
+            shard_of[c] = shards[-1]
+
+    for shard in shards:
+        ghosts = {}
+        for c in shard.clusters:
+            shard.graph.node_list.extend(members[c])
+        for c in shard.clusters:
+            for u, v, type, label in out_edges.get(c, ()):
+                target = shard_of[_cluster(v)]
+                if target is not shard:
+                    shard.cross_links[target.name] = (
+                        shard.cross_links.get(target.name, 0) + 1
+                    )
+                    if v.id not in ghosts:
+                        ghosts[v.id] = GhostNode(v, f"{target.name}.svg")
+                        shard.graph.node_list.append(ghosts[v.id])
+                    v = ghosts[v.id]
+                shard.graph.edge_list.append((u, v, type, label))
+    return shards
+
+
+def render_shards(
+    graph,
+    mode: str,
+    output_dir: str,
+    jobs: int = 0,
+    timeout: Optional[float] = None,
+    manifest: Optional[RenderManifest] = None,
+) -> List[Shard]:
+    """
+    Write one DOT per shard and lay them out concurrently on a bounded
+    pool, each under `timeout` seconds. Then write the index DOT/SVG/HTML.
+    Shards whose DOT is unchanged per `manifest` keep their SVG; files of
+    shards no longer produced are removed.
+    """
+    manifest = manifest or RenderManifest(None)
+    shard_dir = os.path.join(output_dir, SHARD_DIRNAME)
+    os.makedirs(shard_dir, exist_ok=True)
+
+    shards = partition(graph, mode)
+    remove_stale(shard_dir, {shard.name for shard in shards}, manifest)
+    changed = []
+    for shard in shards:
+        dot_path = os.path.join(shard_dir, f"{shard.name}.dot")
+        svg_path = os.path.join(shard_dir, f"{shard.name}.svg")
+        key = f"shard:{mode}:{shard.name}"
+        with phase("dot", file=dot_path):
+            written = manifest.write_artifact(
+                key, DotRenderer(shard.graph), dot_path, [svg_path]
+            )
+        if written:
+            changed.append(shard)
+        else:
+            shard.status = "unchanged"
+    print(
+        f"[*] Atlas split into {len(shards)} shard(s) by {mode}, "
+        f"{len(shards) - len(changed)} unchanged"
+    )
+
+    start = time.perf_counter()
+    workers = min(resolve_jobs(jobs), max(1, len(changed)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(
+                layout_file,
+                os.path.join(shard_dir, f"{shard.name}.dot"),
+                os.path.join(shard_dir, f"{shard.name}.svg"),
+                timeout,
+            ): shard
+            for shard in changed
+        }
+        for future in as_completed(futures):
+            shard = futures[future]
+            shard.status, shard.seconds = future.result()
+            print(
+                f"    [{shard.status}] {shard.name}: "
+                f"{shard.graph.number_of_nodes()} nodes in {shard.seconds:.2f}s"
+            )
+
+    print(
+        f"[*] Layout: {len(changed)} shard(s) on {workers} worker(s) "
+        f"in {time.perf_counter() - start:.2f}s"
+    )
+    failed = [s for s in shards if s.status not in LAID_OUT]
+    if failed:
+        print(f"[!] {len(failed)}/{len(shards)} shard layouts did not complete")
+    write_index(shards, output_dir, timeout, manifest)
+    return shards
+
+
+def remove_stale(shard_dir: str, names, manifest: RenderManifest):
+    """Delete shard DOT/SVG files (and manifest entries) not in `names`."""
+    stale = [
+        entry
+        for entry in os.listdir(shard_dir)
+        if entry.endswith((".dot", ".svg")) and entry[:-4] not in names
+    ]
+    for entry in stale:
+        os.remove(os.path.join(shard_dir, entry))
+    manifest.forget(
+        key
+        for key in manifest.entries
+        if key.startswith("shard:") and key.split(":", 2)[2] not in names
+    )
+    if stale:
+        print(f"[*] Removed {len(stale)} file(s) of shards no longer produced")
+
+
+class IndexDot:
+    """Overview graph: one node per shard, cross-shard LINK counts as edges."""
+
+    def __init__(self, shards: List[Shard]):
+        self.shards = shards
+
+    def write(self, sink):
+        sink.write("digraph AtlasIndex {\n  rankdir=LR;\n")
+        sink.write('  node [fontname="Courier New", shape=box, style=filled];\n')
+        for i, shard in enumerate(self.shards):
+            color = "white" if shard.status in LAID_OUT else "#F8D7DA"
+            sink.write(
+                f'  s{i} [label="{shard.name}\\n{shard.graph.number_of_nodes()} nodes", '
+                f'URL="{SHARD_DIRNAME}/{shard.name}.svg", fillcolor="{color}"];\n'
+            )
+        index_of = {shard.name: i for i, shard in enumerate(self.shards)}
+        for i, shard in enumerate(self.shards):
+            for target, count in shard.cross_links.items():
+                sink.write(f'  s{i} -> s{index_of[target]} [label="{count}"];\n')
+        sink.write("}\n")
+
+
+def write_index(
+    shards: List[Shard],
+    output_dir: str,
+    timeout: Optional[float],
+    manifest: Optional[RenderManifest] = None,
+):
+    """Index DOT/SVG (see `IndexDot`) plus an HTML table linking every shard."""
+    manifest = manifest or RenderManifest(None)
+    dot_path = os.path.join(output_dir, f"{INDEX_NAME}.dot")
+    svg_path = os.path.join(output_dir, f"{INDEX_NAME}.svg")
+    status = "unchanged"
+    if manifest.write_artifact("index", IndexDot(shards), dot_path, [svg_path]):
+        status, _ = layout_file(dot_path, svg_path, timeout)
+
+    rows = []
+    for shard in shards:
+        name = html.escape(shard.name)
+        artifact = "svg" if shard.status in LAID_OUT else "dot"
+        links = ", ".join(
+            f"{html.escape(t)} ({n})" for t, n in sorted(shard.cross_links.items())
+        )
+        rows.append(
+            f'<tr><td><a href="{SHARD_DIRNAME}/{name}.{artifact}">{name}</a></td>'
+            f"<td>{shard.graph.number_of_nodes()}</td><td>{len(shard.clusters)}</td>"
+            f"<td>{shard.status}</td><td>{shard.seconds:.2f}</td><td>{links}</td></tr>"
+        )
+    overview = (
+        f'<p><a href="{INDEX_NAME}.svg">Shard overview graph</a></p>'
+        if status in LAID_OUT
+        else ""
+    )
+    html_path = os.path.join(output_dir, f"{INDEX_NAME}.html")
+    with open(html_path, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+            "<title>Project Atlas</title></head><body>\n"
+            f"<h1>Project Atlas ({len(shards)} shards)</h1>\n{overview}\n"
+            "<table border='1' cellpadding='4'>\n"
+            "<tr><th>Shard</th><th>Nodes</th><th>Files</th><th>Layout</th>"
+            "<th>Seconds</th><th>Calls into</th></tr>\n"
+            + "\n".join(rows)
+            + "\n</table>\n</body></html>\n"
+        )
+    print(f"[+] Atlas index saved to: {html_path}")
@@ -0,0 +1,248 @@
+import os
+import sqlite3
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ir_graph import EdgeType
+
+STORE_NAME = "project_atlas.db"
+# Bump when the schema changes
+STORE_FORMAT = 1
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE clusters (id INTEGER PRIMARY KEY, name TEXT, file_path TEXT);
+CREATE TABLE functions (
+    id INTEGER PRIMARY KEY, qualname TEXT, name TEXT, file_path TEXT, entry INTEGER
+);
+CREATE TABLE nodes (
+    id INTEGER PRIMARY KEY, key TEXT, type TEXT, label TEXT, description TEXT,
+    cluster INTEGER, function INTEGER
+);
+CREATE TABLE edges (src INTEGER, dst INTEGER, type TEXT, label TEXT);
+CREATE TABLE calls (
+    caller INTEGER, callee INTEGER, sites INTEGER, PRIMARY KEY (caller, callee)
+) WITHOUT ROWID;
+"""
+
+# Built after the bulk insert, which is faster than maintaining them row by row
+INDEXES = """
+CREATE UNIQUE INDEX nodes_key ON nodes (key);
+CREATE INDEX nodes_function ON nodes (function);
+CREATE INDEX edges_src ON edges (src);
+CREATE INDEX edges_dst ON edges (dst);
+CREATE INDEX functions_name ON functions (name);
+CREATE INDEX functions_qualname ON functions (qualname);
+CREATE INDEX calls_callee ON calls (callee);
+"""
+
+
+def write_store(
+    path: str,
+    graph,
+    functions: Iterable[Tuple[str, str, str, str]],
+    clusters: Optional[Dict[str, str]] = None,
+):
+    """
+    Persist the atlas to SQLite. `functions` are (qualname, name, file_path,
+    entry node ID) rows; every node reachable from an entry without a LINK
+    belongs to that function, and LINK edges between functions are
+    aggregated into `calls`. `clusters` maps cluster name -> source file.
+    The database is built in a temp file and renamed into place.
+    """
+    ids, node_rows, cluster_ids = {}, [], {}
+    for i, node in enumerate(graph.nodes()):
+        ids[node.id] = i
+        cluster = node.metadata.get("cluster")
+        if cluster is not None and cluster not in cluster_ids:
+            cluster_ids[cluster] = len(cluster_ids)
+        node_rows.append(
+            [
+                i,
+                node.id,
+                node.type.name,
+                node.label,
+                node.description or "",
+                cluster_ids.get(cluster),
+                None,
+            ]
+        )
+
+    edge_rows, links, succ = [], [], {}
+    for u, v, type, label in graph.edges():
+        src, dst = ids[u.id], ids[v.id]
+        edge_rows.append((src, dst, type.name, label))
+        if type == EdgeType.LINK:
+            links.append((src, dst))
+        else:
+            succ.setdefault(src, []).append(dst)
+
+    function_rows = []
+    for qualname, name, file_path, entry_id in functions:
+        entry = ids.get(entry_id)
+        if entry is None:
+            continue
+        fid = len(function_rows)
+        function_rows.append((fid, qualname, name, file_path, entry))
+        stack = [entry]
+        while stack:
+            row = node_rows[stack.pop()]
+            if row[6] is None:
+                row[6] = fid
+                stack.extend(succ.get(row[0], ()))
+
+    calls = {}
+    for src, dst in links:
+        key = (node_rows[src][6], node_rows[dst][6])
+        if None not in key:
+            calls[key] = calls.get(key, 0) + 1
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    conn = sqlite3.connect(tmp_path)
+    try:
+        conn.executescript("PRAGMA journal_mode=OFF; PRAGMA synchronous=OFF;")
+        conn.executescript(SCHEMA)
+        conn.executemany(
+            "INSERT INTO meta VALUES (?, ?)",
+            [
+                ("format", str(STORE_FORMAT)),
+                ("name", getattr(graph, "name", "")),
+                ("nodes", str(len(node_rows))),
+                ("edges", str(len(edge_rows))),
+            ],
+        )
+        clusters = clusters or {}
+        conn.executemany(
+            "INSERT INTO clusters VALUES (?, ?, ?)",
+            [(cid, name, clusters.get(name)) for name, cid in cluster_ids.items()],
+        )
+        conn.executemany("INSERT INTO functions VALUES (?, ?, ?, ?, ?)", function_rows)
+        conn.executemany("INSERT INTO nodes VALUES (?, ?, ?, ?, ?, ?, ?)", node_rows)
+        conn.executemany("INSERT INTO edges VALUES (?, ?, ?, ?)", edge_rows)
+        conn.executemany(
+            "INSERT INTO calls VALUES (?, ?, ?)",
+            [(caller, callee, n) for (caller, callee), n in calls.items()],
+        )
+        conn.executescript(INDEXES)
+        conn.commit()
+    finally:
+        conn.close()
+    os.replace(tmp_path, path)
+    return len(node_rows), len(edge_rows), len(function_rows)
+
+
+class AtlasStore:
+    """Read-only queries over a database written by `write_store`."""
+
+    def __init__(self, path: str):
+        if not os.path.exists(path):
+            raise FileNotFoundError(path)
+        self.conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        row = self.conn.execute("SELECT value FROM meta WHERE key='format'").fetchone()
+        if row is None or int(row[0]) != STORE_FORMAT:
+            raise ValueError(f"{path}: unsupported atlas store format")
+        self._callees = None  # caller -> [callee], loaded on first path query
+
+    def close(self):
+        self.conn.close()
+
+    def match(self, target: str) -> List[Tuple[int, str]]:
+        """
+        Functions named by `target`: a qualified name, a suffix of one
+        (`Engine::run`, `Class.method`), a bare name or a node key (the
+        function that node belongs to).
+        """
+        rows = self.conn.execute(
+            "SELECT id, qualname FROM functions WHERE qualname = ?", (target,)
+        ).fetchall()
+        if rows:
+            return rows
+        name = target.replace("::", ".").rsplit(".", 1)[-1]
+        rows = self.conn.execute(
+            "SELECT id, qualname FROM functions WHERE name = ?", (name,)
+        ).fetchall()
+        if name != target:
+            rows = [
+                (fid, q) for fid, q in rows if q.endswith((f"::{target}", f".{target}"))
+            ]
+        if rows:
+            return rows
+        return self.conn.execute(
+            "SELECT f.id, f.qualname FROM nodes n JOIN functions f"
+            " ON f.id = n.function WHERE n.key = ?",
+            (target,),
+        ).fetchall()
+
+    def callers(self, fids: List[int]) -> List[Tuple[str, int]]:
+        return self._neighbours("caller", "callee", fids)
+
+    def callees(self, fids: List[int]) -> List[Tuple[str, int]]:
+        return self._neighbours("callee", "caller", fids)
+
+    def _neighbours(self, out: str, key: str, fids: List[int]):
+        marks = ",".join("?" * len(fids))
+        return self.conn.execute(
+            f"SELECT f.qualname, SUM(c.sites) FROM calls c JOIN functions f"
+            f" ON f.id = c.{out} WHERE c.{key} IN ({marks})"
+            f" GROUP BY f.id ORDER BY f.qualname",
+            fids,
+        ).fetchall()
+
+    def reach(self, fids: List[int], upstream: bool = True) -> List[Tuple[str]]:
+        """
+        Every function that can (transitively) call into `fids`, or with
+        `upstream=False` every function they can end up calling.
+        """
+        step, back = ("caller", "callee") if upstream else ("callee", "caller")
+        marks = ",".join("?" * len(fids))
+        return self.conn.execute(
+            f"WITH RECURSIVE r(fn) AS ("
+            f" SELECT id FROM functions WHERE id IN ({marks})"
+            f" UNION SELECT c.{step} FROM calls c JOIN r ON c.{back} = r.fn)"
+            f" SELECT f.qualname FROM r JOIN functions f ON f.id = r.fn"
+            f" WHERE r.fn NOT IN ({marks}) ORDER BY f.qualname",
+            fids + fids,
+        ).fetchall()
+
+    def path(self, sources: List[int], targets: List[int]) -> List[str]:
+        """Shortest call chain from any of `sources` to any of `targets`."""
+        if self._callees is None:
+            self._callees = {}
+            for caller, callee in self.conn.execute("SELECT caller, callee FROM calls"):
+                self._callees.setdefault(caller, []).append(callee)
+        goal = set(targets)
+        parent = {fid: None for fid in sources}
+        queue = deque(sources)
+        while queue:
+            fid = queue.popleft()
+            if fid in goal:
+                chain = []
+                while fid is not None:
+                    chain.append(fid)
+                    fid = parent[fid]
+                return [self.qualname(f) for f in reversed(chain)]
+            for callee in self._callees.get(fid, ()):
+                if callee not in parent:
+                    parent[callee] = fid
+                    queue.append(callee)
+        return []
+
+    def qualname(self, fid: int) -> str:
+        row = self.conn.execute(
+            "SELECT qualname FROM functions WHERE id = ?", (fid,)
+        ).fetchone()
+        return row[0]
+
+    def find(self, pattern: str, node_type: Optional[str] = None, limit: int = 50):
+        """Nodes whose label matches the SQL LIKE `pattern`, with their function."""
+        sql = (
+            "SELECT n.key, n.type, n.label, f.qualname FROM nodes n"
+            " LEFT JOIN functions f ON f.id = n.function WHERE n.label LIKE ?"
+        )
+        params = [pattern]
+        if node_type:
+            sql += " AND n.type = ?"
+            params.append(node_type.upper())
+        return self.conn.execute(f"{sql} LIMIT ?", params + [limit]).fetchall()
@@ -0,0 +1,122 @@
+import hashlib
+import json
+import os
+import pickle
+import struct
+from typing import Optional, Tuple
+
+from file_pipeline import (
+    BUILDER_VERSION,
+    FileAnalysis,
+    FunctionGraph,
+    analyze_file,
+    lang_of,
+)
+import ir_binary
+
+CACHE_DIRNAME = ".logic_cache"
+# Bump when the entry layout or its serialization changes (what is stored per
+# file, the graph encoding); changes to the graphs themselves bump
+# file_pipeline.BUILDER_VERSION
+CACHE_FORMAT = 5
+
+
+def config_digest(config) -> str:
+    """Hash of the loaded logic_config.yaml (descriptions feed node labels)."""
+    payload = json.dumps(getattr(config, "config", {}), sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CFGCache:
+    """
+    Content-addressed store of per-function CFGs.
+    Key: sha256(file bytes + builder version + config digest). An entry is
+    (imports, [(fn_name, qualname, ULG binary, call sites), ...]) for one
+    file, so an unchanged file skips tree-sitter and CFG building entirely.
+    Graphs are stored in the `ir_binary` format, which loads column-wise.
+    """
+
+    def __init__(self, cache_dir: str, config):
+        self.cache_dir = cache_dir
+        salt = f"f{CACHE_FORMAT}:v{BUILDER_VERSION}:{config_digest(config)}"
+        self.salt = salt.encode("utf-8")
+
+    def key(self, code: bytes) -> str:
+        h = hashlib.sha256(self.salt)
+        h.update(b"\0")
+        h.update(code)
+        return h.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def load(self, key: str) -> Optional[tuple]:
+        try:
+            with open(self._path(key), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            self.discard(key)
+            return None
+
+    def discard(self, key: str):
+        """Drop an unreadable entry; the file is rebuilt and stored again."""
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def store(self, key: str, entry: tuple):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write-then-rename: concurrent workers never observe a partial file
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+
+def analyze_file_cached(
+    file_path, config, engine, cache: CFGCache
+) -> Tuple[Optional[FileAnalysis], bool]:
+    """`analyze_file` behind the cache. Returns (analysis, cache_hit)."""
+    lang = lang_of(file_path)
+    if lang is None:
+        return None, False
+
+    with open(file_path, "rb") as f:
+        code = f.read()
+    key = cache.key(code)
+
+    entry = cache.load(key)
+    if entry is not None:
+        try:
+            imports, cached = entry
+            functions = [
+                FunctionGraph(
+                    name,
+                    ir_binary.to_backend(ir_binary.loads(blob)[0]),
+                    qualname,
+                    calls,
+                )
+                for name, qualname, blob, calls in cached
+            ]
+        except (ValueError, TypeError, IndexError, struct.error):
+            # A truncated or corrupt graph blob is a miss, not a failed file
+            cache.discard(key)
+        else:
+            return FileAnalysis(file_path, lang, functions, imports=imports), True
+
+    analysis = analyze_file(file_path, config, engine, code)
+    cache.store(
+        key,
+        (
+            analysis.imports,
+            [
+                (fn.name, fn.qualname, ir_binary.dumps(fn.graph), fn.call_sites)
+                for fn in analysis.functions
+            ],
+        ),
+    )
+    return analysis, False
@@ -1,5 +1,7 @@
 from typing import Optional
-from ir_graph import UniversalLogicGraph, NodeType, EdgeType, Node
+from ir_graph import NodeType, EdgeType, Node, new_graph
+from source_text import SourceText
+from dispatch import dispatch_table
 from cfg_python_stmt import PythonStmtMixin
 from cfg_python_flow import PythonFlowMixin
 
@@ -9,17 +11,35 @@ class PythonCFGBuilder(PythonStmtMixin, PythonFlowMixin):
     Python CFG Builder.
     """
 
+    DISPATCH = {
+        "statement": (PythonStmtMixin.STATEMENT_ROUTES, "_handle_simple_stmt"),
+        "flow": (PythonFlowMixin.FLOW_ROUTES, "_keep_current"),
+    }
+
     def __init__(self, code_bytes: bytes):
         self.code = code_bytes
-        self.graph = UniversalLogicGraph("python_cfg")
+        # Shared by every label of the file: spans, decoded on first read
+        self.source = SourceText(code_bytes)
+        # kind_id -> handler tables, compiled once per builder class
+        self._statements = dispatch_table(type(self), "py", "statement")
+        self._flows = dispatch_table(type(self), "py", "flow")
+        self.config_loader = None
+        self.reset()
+
+    def reset(self):
+        """Start a fresh graph so one builder can serve every function in a file."""
+        self.graph = new_graph("python_cfg")
+        # Callee key -> IDs of the CALL nodes that invoke it (atlas linking)
+        self.call_sites = {}
         self.loop_stack = []
         self.fn_exit = None
-        self.config_loader = None
 
     def set_config_loader(self, loader):
         self.config_loader = loader
 
     def build_from_function(self, fn_node):
+        if self.graph.entry_node:
+            self.reset()
         fn_name = self._get_text(fn_node.child_by_field_name("name"))
 
         desc = ""
@@ -54,6 +74,4 @@ class PythonCFGBuilder(PythonStmtMixin, PythonFlowMixin):
         return current
 
     def _get_text(self, node) -> str:
-        if not node:
-            return ""
-        return self.code[node.start_byte : node.end_byte].decode("utf-8")
+        return self.source.text(node)
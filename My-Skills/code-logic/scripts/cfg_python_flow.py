@@ -7,27 +7,28 @@ class PythonFlowMixin:
     Handles flow control for Python.
     """
 
+    FLOW_ROUTES = {
+        "if_statement": "_handle_if",
+        "for_statement": "_handle_loop",
+        "while_statement": "_handle_loop",
+        "match_statement": "_handle_match",
+        "break_statement": "_handle_break",
+        "continue_statement": "_handle_continue",
+    }
+
     def _dispatch_flow(self, node, current_node: Node) -> Optional[Node]:
-        t = node.type
-        if t == "if_statement":
-            return self._handle_if(node, current_node)
-        if t in ["for_statement", "while_statement"]:
-            return self._handle_loop(node, current_node)
-        if t == "match_statement":
-            return self._handle_match(node, current_node)
-        if t == "break_statement":
-            return self._handle_break(node, current_node)
-        if t == "continue_statement":
-            return self._handle_continue(node, current_node)
+        table = self._flows
+        return table.routes.get(node.kind_id, table.default)(self, node, current_node)
+
+    def _keep_current(self, node, current_node: Node) -> Optional[Node]:
         return current_node
 
     def _handle_if(self, node, current_node: Node) -> Optional[Node]:
         # if cond: body elif ...
         cond = node.child_by_field_name("condition")
-        cond_text = self._get_text(cond)
 
         fork = self.graph.add_node(
-            NodeType.FORK, label=f"if {cond_text}", ast_node=node
+            NodeType.FORK, label=self.source.label("if {}", cond), ast_node=node
         )
         self.graph.add_edge(current_node, fork, EdgeType.SEQ)
 
@@ -81,9 +82,8 @@ class PythonFlowMixin:
     def _handle_elif_clause(self, node, current_node: Node) -> Optional[Node]:
         # elif cond: body
         cond = node.child_by_field_name("condition")
-        cond_text = self._get_text(cond)
         fork = self.graph.add_node(
-            NodeType.FORK, label=f"elif {cond_text}", ast_node=node
+            NodeType.FORK, label=self.source.label("elif {}", cond), ast_node=node
         )
         self.graph.add_edge(current_node, fork, EdgeType.SEQ)
 
@@ -125,11 +125,11 @@ class PythonFlowMixin:
 
         if is_while:
             cond = node.child_by_field_name("condition")
-            label_text = f"while {self._get_text(cond)}"
+            label_text = self.source.label("while {}", cond)
         else:
             left = node.child_by_field_name("left")  # vars
             right = node.child_by_field_name("right")  # iterable
-            label_text = f"for {self._get_text(left)} in ..."
+            label_text = self.source.label("for {} in ...", left)
 
         check = self.graph.add_node(NodeType.FORK, label=label_text, ast_node=node)
         self.graph.add_edge(current_node, check, EdgeType.SEQ)
@@ -186,7 +186,7 @@ class PythonFlowMixin:
         # Python 3.10 match
         subject = node.child_by_field_name("subject")
         fork = self.graph.add_node(
-            NodeType.FORK, label=f"match {self._get_text(subject)}"
+            NodeType.FORK, label=self.source.label("match {}", subject)
         )
         self.graph.add_edge(current_node, fork, EdgeType.SEQ)
 
@@ -1,5 +1,6 @@
 from typing import Optional, Any
-from ir_graph import NodeType, EdgeType, Node
+from ir_graph import NodeType, EdgeType, Node, call_key
+from cfg_python_flow import PythonFlowMixin
 
 
 class PythonStmtMixin:
@@ -7,60 +8,40 @@ class PythonStmtMixin:
     Handles simple statements, try/except, and with blocks.
     """
 
-    def _dispatch_statement(self, node, current_node: Node) -> Optional[Node]:
-        t = node.type
-
+    # Node kind -> handler (method name, or name and keyword arguments),
+    # compiled once into a kind_id table by dispatch.dispatch_table
+    STATEMENT_ROUTES = {
         # Simple statements
-        if t == "expression_statement":
-            # Handle assignments, calls within expression stmt
-            return self._dispatch_statement(node.children[0], current_node)
-        elif t == "assignment":
-            return self._handle_simple_stmt(node, current_node, label_prefix="")
-        elif t == "return_statement":
-            return self._handle_return(node, current_node)
-        elif t == "raise_statement":
-            return self._handle_raise(node, current_node)
-        elif t == "assert_statement":
-            return self._handle_simple_stmt(node, current_node, label_prefix="assert ")
-        elif t == "call":
-            return self._handle_call(node, current_node)
-
+        "expression_statement": "_handle_expression_stmt",
+        "assignment": "_handle_simple_stmt",
+        "return_statement": "_handle_return",
+        "raise_statement": "_handle_raise",
+        "assert_statement": ("_handle_simple_stmt", {"label_prefix": "assert "}),
+        "call": "_handle_call",
         # Complex statements
-        elif t == "try_statement":
-            return self._handle_try(node, current_node)
-        elif t == "with_statement":
-            return self._handle_with(node, current_node)
-        elif t == "function_definition":
-            # Nested function def is just a statement that defines a name
-            return self._handle_simple_stmt(node, current_node, label_prefix="def ")
-        elif t == "class_definition":
-            return self._handle_simple_stmt(node, current_node, label_prefix="class ")
-
-        # Flow dispatch
-        elif t in [
-            "if_statement",
-            "for_statement",
-            "while_statement",
-            "match_statement",
-        ]:
-            return self._dispatch_flow(node, current_node)
-        elif t in ["break_statement", "continue_statement"]:
-            return self._dispatch_flow(node, current_node)
-
-        # Default fallback
-        else:
-            return self._handle_simple_stmt(node, current_node)
+        "try_statement": "_handle_try",
+        "with_statement": "_handle_with",
+        # Nested function def is just a statement that defines a name
+        "function_definition": ("_handle_simple_stmt", {"label_prefix": "def "}),
+        "class_definition": ("_handle_simple_stmt", {"label_prefix": "class "}),
+        # Flow (PythonFlowMixin)
+        **PythonFlowMixin.FLOW_ROUTES,
+    }
+
+    def _dispatch_statement(self, node, current_node: Node) -> Optional[Node]:
+        # Anything unrouted falls back to a simple statement
+        table = self._statements
+        return table.routes.get(node.kind_id, table.default)(self, node, current_node)
+
+    def _handle_expression_stmt(self, node, current_node: Node) -> Optional[Node]:
+        # Handle assignments, calls within expression stmt
+        return self._dispatch_statement(node.children[0], current_node)
 
     def _handle_simple_stmt(
         self, node, current_node: Node, label_prefix=""
     ) -> Optional[Node]:
-        text = self._get_text(node)
-        summary = text.split("\n")[0].strip()
-        if len(summary) > 40:
-            summary = summary[:37] + "..."
-        if label_prefix and not summary.startswith(label_prefix):
-            summary = label_prefix + summary
-
+        # First line only, decoded when a renderer reads the label
+        summary = self.source.summary(node, label_prefix)
         stmt_node = self.graph.add_node(NodeType.BLOCK, label=summary, ast_node=node)
         self.graph.add_edge(current_node, stmt_node, EdgeType.SEQ)
         return stmt_node
@@ -73,6 +54,7 @@ class PythonStmtMixin:
             NodeType.CALL, label=f"{func_name}()", ast_node=node
         )
         self.graph.add_edge(current_node, call_node, EdgeType.SEQ)
+        self.call_sites.setdefault(call_key(call_node.label), []).append(call_node.id)
         return call_node
 
     def _handle_return(self, node, current_node: Node) -> Optional[Node]:
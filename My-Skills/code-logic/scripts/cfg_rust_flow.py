@@ -8,28 +8,27 @@ class RustFlowMixin:
     Part of the RustCFGBuilder mixin composition.
     """
 
+    FLOW_ROUTES = {
+        "if_expression": "_handle_if",
+        "match_expression": "_handle_match",
+        "loop_expression": "_handle_loop",
+        "while_expression": "_handle_while",
+        "for_expression": "_handle_for",
+        "break_expression": "_handle_break",
+        "continue_expression": "_handle_continue",
+    }
+
     def _dispatch_flow(self, node, current_node: Node) -> Optional[Node]:
-        t = node.type
-        if t == "if_expression":
-            return self._handle_if(node, current_node)
-        if t == "match_expression":
-            return self._handle_match(node, current_node)
-        if t == "loop_expression":
-            return self._handle_loop(node, current_node)
-        if t == "while_expression":
-            return self._handle_while(node, current_node)
-        if t == "for_expression":
-            return self._handle_for(node, current_node)
-        if t == "break_expression":
-            return self._handle_break(node, current_node)
-        if t == "continue_expression":
-            return self._handle_continue(node, current_node)
+        table = self._flows
+        return table.routes.get(node.kind_id, table.default)(self, node, current_node)
+
+    def _keep_current(self, node, current_node: Node) -> Optional[Node]:
         return current_node
 
     def _handle_if(self, node, current_node: Node) -> Optional[Node]:
-        cond_text = self._get_text(node.child_by_field_name("condition"))
+        cond = node.child_by_field_name("condition")
         fork = self.graph.add_node(
-            NodeType.FORK, label=f"if {cond_text}", ast_node=node
+            NodeType.FORK, label=self.source.label("if {}", cond), ast_node=node
         )
         self.graph.add_edge(current_node, fork, EdgeType.SEQ)
 
@@ -135,9 +134,9 @@ class RustFlowMixin:
                 return self._dispatch_statement(node, v_node)
 
     def _handle_match(self, node, current_node: Node) -> Optional[Node]:
-        val_text = self._get_text(node.child_by_field_name("value"))
+        value = node.child_by_field_name("value")
         fork = self.graph.add_node(
-            NodeType.FORK, label=f"match {val_text}", ast_node=node
+            NodeType.FORK, label=self.source.label("match {}", value), ast_node=node
         )
         self.graph.add_edge(current_node, fork, EdgeType.SEQ)
 
@@ -181,9 +180,9 @@ class RustFlowMixin:
         return loop_exit
 
     def _handle_while(self, node, current_node: Node) -> Optional[Node]:
-        cond_text = self._get_text(node.child_by_field_name("condition"))
+        cond = node.child_by_field_name("condition")
         check = self.graph.add_node(
-            NodeType.FORK, label=f"while {cond_text}", ast_node=node
+            NodeType.FORK, label=self.source.label("while {}", cond), ast_node=node
         )
         self.graph.add_edge(current_node, check, EdgeType.SEQ)
 
@@ -204,11 +203,12 @@ class RustFlowMixin:
         return loop_exit
 
     def _handle_for(self, node, current_node: Node) -> Optional[Node]:
-        pat_text = self._get_text(node.child_by_field_name("pattern"))
-        val_text = self._get_text(node.child_by_field_name("value"))
-        check = self.graph.add_node(
-            NodeType.FORK, label=f"for {pat_text} in {val_text}", ast_node=node
+        label = self.source.label(
+            "for {} in {}",
+            node.child_by_field_name("pattern"),
+            node.child_by_field_name("value"),
         )
+        check = self.graph.add_node(NodeType.FORK, label=label, ast_node=node)
         self.graph.add_edge(current_node, check, EdgeType.SEQ)
 
         loop_exit = self.graph.add_node(NodeType.JOIN, label="end for")
@@ -1,5 +1,6 @@
 from typing import Optional, Any
-from ir_graph import NodeType, EdgeType, Node
+from ir_graph import NodeType, EdgeType, Node, call_key
+from cfg_rust_flow import RustFlowMixin
 
 
 class RustStmtMixin:
@@ -8,41 +9,31 @@ class RustStmtMixin:
     Part of the RustCFGBuilder mixin composition.
     """
 
+    # Node kind -> handler (method name, or name and keyword arguments),
+    # compiled once into a kind_id table by dispatch.dispatch_table
+    STATEMENT_ROUTES = {
+        # Simple statements
+        "let_declaration": ("_handle_simple_stmt", {"label_prefix": "let "}),
+        "return_expression": "_handle_return",
+        "expression_statement": "_handle_expression_stmt",
+        "call_expression": "_handle_call",
+        "macro_invocation": "_handle_macro",
+        # Complex flow (RustFlowMixin)
+        **RustFlowMixin.FLOW_ROUTES,
+    }
+
     def _dispatch_statement(self, node, current_node: Node) -> Optional[Node]:
         # 1. Check for '?' operator side effects first
         current_node = self._scan_for_try_operator(node, current_node)
         if current_node is None:
             return None
 
-        t = node.type
-
-        # Simple statements dispatch
-        if t == "let_declaration":
-            return self._handle_simple_stmt(node, current_node, label_prefix="let ")
-        elif t == "return_expression":
-            return self._handle_return(node, current_node)
-        elif t == "expression_statement":
-            return self._dispatch_statement(node.children[0], current_node)
-        elif t == "call_expression":
-            return self._handle_call(node, current_node)
-        elif t == "macro_invocation":
-            return self._handle_macro(node, current_node)
-
-        # Complex flow dispatch (delegated to RustFlowMixin)
-        elif t in [
-            "if_expression",
-            "match_expression",
-            "loop_expression",
-            "while_expression",
-            "for_expression",
-            "break_expression",
-            "continue_expression",
-        ]:
-            return self._dispatch_flow(node, current_node)
-
-        # Default fallback
-        else:
-            return self._handle_simple_stmt(node, current_node)
+        # 2. Anything unrouted falls back to a simple statement
+        table = self._statements
+        return table.routes.get(node.kind_id, table.default)(self, node, current_node)
+
+    def _handle_expression_stmt(self, node, current_node: Node) -> Optional[Node]:
+        return self._dispatch_statement(node.children[0], current_node)
 
     def _scan_for_try_operator(self, root_node, current_node: Node) -> Optional[Node]:
         """
@@ -50,10 +41,11 @@ class RustStmtMixin:
         Fix: Stops at closure/async boundaries to prevent scope leakage.
         """
         # Stop recursion at scope boundaries
-        if root_node.type in ["closure_expression", "async_block"]:
+        kind = root_node.kind_id
+        if kind in self._scope_kinds:
             return current_node
 
-        if root_node.type == "try_expression":
+        if kind in self._try_kinds:
             # Found '?': Insert Virtual Node & Error Path
             check_node = self.graph.add_node(
                 NodeType.VIRTUAL, label="Check '?'", ast_node=root_node
@@ -78,13 +70,8 @@ class RustStmtMixin:
     def _handle_simple_stmt(
         self, node, current_node: Node, label_prefix=""
     ) -> Optional[Node]:
-        text = self._get_text(node)
-        summary = text.split("\n")[0].strip()
-        if len(summary) > 40:
-            summary = summary[:37] + "..."
-        if label_prefix and not summary.startswith(label_prefix):
-            summary = label_prefix + summary
-
+        # First line only, decoded when a renderer reads the label
+        summary = self.source.summary(node, label_prefix)
         stmt_node = self.graph.add_node(NodeType.BLOCK, label=summary, ast_node=node)
         self.graph.add_edge(current_node, stmt_node, EdgeType.SEQ)
         return stmt_node
@@ -106,6 +93,7 @@ class RustStmtMixin:
             NodeType.CALL, label=f"{func_name}()", ast_node=node
         )
         self.graph.add_edge(current_node, call_node, EdgeType.SEQ)
+        self.call_sites.setdefault(call_key(call_node.label), []).append(call_node.id)
         return call_node
 
     def _handle_macro(self, node, current_node: Node) -> Optional[Node]:
@@ -0,0 +1,101 @@
+from dataclasses import dataclass
+from typing import Any, Iterator, List, Optional
+
+# Per language: function node kind, qualified-name separator and the
+# enclosing scopes that contribute a path segment (kind -> field holding it)
+LANG_SPECS = {
+    "rs": {
+        "function": "function_item",
+        "sep": "::",
+        "scopes": {"mod_item": "name", "impl_item": "type", "trait_item": "name"},
+    },
+    "py": {
+        "function": "function_definition",
+        "sep": ".",
+        "scopes": {"class_definition": "name"},
+    },
+}
+
+
+@dataclass
+class FunctionInfo:
+    node: Any  # tree-sitter function node
+    name: str  # bare name, e.g. "run"
+    qualname: str  # scope path, e.g. "Engine::run" / "Engine.run"
+
+
+def _segment(code: bytes, node, field: str) -> Optional[str]:
+    child = node.child_by_field_name(field)
+    if child is None:
+        return None
+    text = code[child.start_byte : child.end_byte].decode("utf-8")
+    # `impl<T> Stack<T>` -> "Stack"
+    return text.split("<")[0].strip()
+
+
+def iter_functions(
+    root, lang: str, code: bytes, module: str = ""
+) -> Iterator[FunctionInfo]:
+    """
+    Single TreeCursor sweep (no recursion, no list concatenation) yielding
+    every function in document order with its qualified name. Enclosing
+    functions also count as scopes, so nested defs are `outer.inner`.
+    `module` optionally prefixes every qualname.
+    """
+    spec = LANG_SPECS[lang]
+    fn_kind, sep, scopes = spec["function"], spec["sep"], spec["scopes"]
+
+    path = [module] if module else []
+    # One entry per node on the cursor's ancestry: True if it pushed a segment
+    pushed = []
+    cursor = root.walk()
+    while True:
+        node = cursor.node
+        kind = node.type
+        segment = None
+        if kind == fn_kind:
+            segment = _segment(code, node, "name")
+            if segment is not None:
+                yield FunctionInfo(node, segment, sep.join(path + [segment]))
+        elif kind in scopes:
+            segment = _segment(code, node, scopes[kind])
+
+        if segment is not None:
+            path.append(segment)
+        pushed.append(segment is not None)
+
+        if cursor.goto_first_child():
+            continue
+        if pushed.pop():
+            path.pop()
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return
+            if pushed.pop():
+                path.pop()
+
+
+def find_function(functions: List[FunctionInfo], focus: str) -> Optional[FunctionInfo]:
+    """Match `--focus` against qualified names first, then bare names."""
+    for info in functions:
+        if info.qualname == focus:
+            return info
+    for info in functions:
+        if info.name == focus:
+            return info
+    return None
+
+
+def function_keys(functions) -> List[str]:
+    """
+    Stable per-function artifact keys: the qualified name with `::` as `.`,
+    repeats (e.g. a redefined Python function) suffixed `_1`, `_2`, ...
+    """
+    seen = {}
+    keys = []
+    for info in functions:
+        count = seen.get(info.qualname, 0)
+        seen[info.qualname] = count + 1
+        key = info.qualname if count == 0 else f"{info.qualname}_{count}"
+        keys.append(key.replace("::", "."))
+    return keys
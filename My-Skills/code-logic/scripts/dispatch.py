@@ -0,0 +1,60 @@
+from functools import partial
+from typing import Callable, Dict, FrozenSet, Iterable, List
+
+from parser_registry import get_parser
+
+# (builder class, table name) -> KindDispatch, shared by every builder
+_tables = {}
+
+
+class KindDispatch:
+    """
+    Statement handlers indexed by tree-sitter `kind_id`: one dict lookup
+    per AST node instead of a chain of string compares. Handlers are
+    plain functions called as `handler(builder, node, current_node)`.
+    """
+
+    def __init__(self, language, default: Callable):
+        self.default = default
+        self.routes: Dict[int, Callable] = {}
+        # A name can have several ids (aliases, named and anonymous forms)
+        self.kind_ids: Dict[str, List[int]] = {}
+        for i in range(language.node_kind_count):
+            self.kind_ids.setdefault(language.node_kind_for_id(i), []).append(i)
+
+    def register(self, kind: str, handler: Callable):
+        """Route every id of node kind `kind` to `handler` (replacing any)."""
+        ids = self.kind_ids.get(kind)
+        if not ids:
+            raise KeyError(f"Unknown node kind: {kind}")
+        for i in ids:
+            self.routes[i] = handler
+
+    def ids(self, kinds: Iterable[str]) -> FrozenSet[int]:
+        """Kind ids of several node kinds, for `node.kind_id in ...` tests."""
+        return frozenset(i for kind in kinds for i in self.kind_ids.get(kind, ()))
+
+
+def _handler(cls, spec) -> Callable:
+    """A route target: a method name, or (method name, keyword arguments)."""
+    if isinstance(spec, str):
+        return getattr(cls, spec)
+    name, kwargs = spec
+    return partial(getattr(cls, name), **kwargs)
+
+
+def dispatch_table(cls, lang: str, name: str) -> KindDispatch:
+    """
+    Table `name` of builder class `cls`, compiled from `cls.DISPATCH[name]`
+    (routes, default) on first use and shared afterwards. Call `register`
+    on the result to add or override handlers for every later build.
+    """
+    key = (cls, name)
+    table = _tables.get(key)
+    if table is None:
+        routes, default = cls.DISPATCH[name]
+        table = KindDispatch(get_parser(lang).language, _handler(cls, default))
+        for kind, spec in routes.items():
+            table.register(kind, _handler(cls, spec))
+        _tables[key] = table
+    return table
@@ -0,0 +1,335 @@
+import contextlib
+import io
+import itertools
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterator, List, Optional
+
+from ast_engine import get_engine
+from config_loader import ConfigLoader
+from discovery import find_function, iter_functions
+from file_pipeline import LANGUAGES, analyze_file, lang_of
+from ir_binary import IR_SUFFIX, save as save_ir
+from ir_graph import set_backend
+from layout_service import LayoutService
+from output_writer import (
+    condensed,
+    logic_output_dir,
+    resolve_svg_dir,
+    write_function_outputs,
+    write_logic_outputs,
+)
+from parallel_index import resolve_jobs
+import profiler
+from render_manifest import RenderManifest
+from renderer_dot import DotRenderer
+from syntax_errors import attach_to_graph, find_syntax_errors
+
+REPORT_NAME = "logic_report.json"
+# Bump when the report layout changes
+REPORT_FORMAT = 1
+
+
+class FileFailure(Exception):
+    """A file that cannot be analyzed; recorded in the report, never fatal."""
+
+
+@dataclass
+class FileReport:
+    path: str
+    status: str = "ok"  # ok | skipped | failed
+    error: Optional[str] = None
+    functions: int = 0
+    nodes: int = 0
+    edges: int = 0
+    timings: Dict[str, float] = field(default_factory=dict)  # phase -> ms
+    log: str = ""  # worker output, replayed by the parent (not reported)
+
+
+class _Phases:
+    """Wall time of consecutive phases, in ms, into `report.timings`."""
+
+    def __init__(self, report: FileReport):
+        self.report = report
+        self.start = time.perf_counter()
+
+    def done(self, phase: str):
+        now = time.perf_counter()
+        self.report.timings[phase] = round((now - self.start) * 1000, 2)
+        self.start = now
+
+
+def process_file(file_path, args, config, project_root, layout=None, manifest=None):
+    """
+    Classic mode for one file: the `--focus` function (or the first one, or
+    every one with --all-functions) to DSL/DOT/SVG. Returns a FileReport;
+    raises FileFailure when the file cannot be analyzed.
+    """
+    print(f"[*] Analyzing {file_path}...")
+    report = FileReport(file_path)
+    phases = _Phases(report)
+
+    # 1. Parse AST
+    try:
+        engine = get_engine()
+        tree, code_bytes = engine.parse_file(file_path)
+    except Exception as e:
+        print(
+            "    Ensure tree-sitter, tree-sitter-rust, and tree-sitter-python are installed."
+        )
+        raise FileFailure(f"AST Parsing Failed: {e}") from e
+    phases.done("parse")
+
+    # 2. Build CFG
+    # Find the target function, the first one, or every one (--all-functions)
+    root = tree.root_node
+
+    # Dispatch based on extension for CFG Builder
+    ext = lang_of(file_path)
+    if ext is None:
+        raise FileFailure(f"Unsupported extension for CFG building: {file_path}")
+
+    if args.all_functions:
+        process_all_functions(
+            file_path,
+            args,
+            config,
+            project_root,
+            layout,
+            manifest,
+            tree,
+            code_bytes,
+            report,
+        )
+        return report
+
+    builder = LANGUAGES[ext](code_bytes)
+    builder.set_config_loader(config)
+
+    # One cursor sweep finds every function (methods included) with its
+    # qualified name, so --focus accepts `run` or `Engine::run`
+    with profiler.phase("discover", file=file_path):
+        functions = list(iter_functions(root, ext, code_bytes))
+    if not functions:
+        print("[!] No functions found in file.")
+        report.status = "skipped"
+        return report
+
+    # Select function
+    if args.focus:
+        target = find_function(functions, args.focus)
+        if not target:
+            # Not an error in a directory run: most files lack the function
+            print(f"[!] Function '{args.focus}' not found.")
+            report.status = "skipped"
+            report.error = f"Function '{args.focus}' not found."
+            return report
+    else:
+        # Default to first function for Prototype v1
+        print(f"[*] No focus specified, analyzing first function found.")
+        target = functions[0]
+    target_node = target.node
+
+    with profiler.phase("build", file=file_path, functions=1):
+        ulg = builder.build_from_function(target_node)
+        attach_to_graph(ulg, target_node, find_syntax_errors(root))
+    report.functions = 1
+    report.nodes = ulg.number_of_nodes()
+    report.edges = sum(1 for _ in ulg.edges())
+    phases.done("build")
+
+    # 3. Render Outputs
+    base_name = os.path.splitext(file_path)[0]
+    filename = os.path.basename(base_name)
+    output_dir = logic_output_dir(file_path)
+    svg_dir = resolve_svg_dir(file_path, output_dir, args.svg_dir, project_root)
+    write_logic_outputs(
+        ulg,
+        args.format,
+        output_dir,
+        filename,
+        svg_dir,
+        layout,
+        manifest,
+        key=f"{os.path.abspath(file_path)}#{target.qualname}",
+        dot_renderer=DotRenderer(condensed(ulg)) if args.condense else None,
+    )
+    if args.save_ir:
+        ir_path = os.path.join(output_dir, f"{filename}.logic{IR_SUFFIX}")
+        save_ir(ir_path, ulg)
+        print(f"[+] Saved IR: {ir_path}")
+    phases.done("render")
+    return report
+
+
+def process_all_functions(
+    file_path, args, config, project_root, layout, manifest, tree, code_bytes, report
+):
+    """Build every function from one parse and write the batched outputs."""
+    phases = _Phases(report)
+    analysis = analyze_file(file_path, config, code=code_bytes, tree=tree)
+    if not analysis.functions:
+        print("[!] No functions found in file.")
+        report.status = "skipped"
+        return
+    print(f"[*] Built {len(analysis.functions)} functions from one parse.")
+    report.functions = len(analysis.functions)
+    report.nodes = sum(fn.graph.number_of_nodes() for fn in analysis.functions)
+    report.edges = sum(sum(1 for _ in fn.graph.edges()) for fn in analysis.functions)
+    phases.done("build")
+
+    base_name = os.path.splitext(file_path)[0]
+    output_dir = logic_output_dir(file_path)
+    svg_dir = resolve_svg_dir(file_path, output_dir, args.svg_dir, project_root)
+    write_function_outputs(
+        analysis,
+        args.format,
+        output_dir,
+        os.path.basename(base_name),
+        svg_dir,
+        layout,
+        manifest,
+        key=os.path.abspath(file_path),
+        split=args.split_functions,
+        dot_transform=condensed if args.condense else None,
+    )
+    phases.done("render")
+
+
+def run_file(file_path, args, config, project_root, layout=None, manifest=None):
+    """`process_file` with every error turned into a failed FileReport."""
+    try:
+        report = process_file(file_path, args, config, project_root, layout, manifest)
+    except FileFailure as e:
+        print(f"[!] {e}")
+        report = FileReport(file_path, "failed", str(e))
+    except Exception as e:
+        print(f"[!] Failed to process {file_path}: {e}")
+        report = FileReport(file_path, "failed", f"{type(e).__name__}: {e}")
+    profiler.record_file(file_path, report.functions, report.nodes, report.edges)
+    return report
+
+
+# Per-worker state, created once by _init_worker
+_worker_args = None
+_worker_config = None
+_worker_root = None
+_worker_manifest = None
+
+
+def _init_worker(args, project_root, manifest_dir, profile):
+    global _worker_args, _worker_config, _worker_root, _worker_manifest
+    set_backend(args.ir_backend)
+    profiler.configure(profile)
+    _worker_args = args
+    _worker_config = ConfigLoader(args.config)
+    _worker_root = project_root
+    # Read-only copy: new entries go back to the parent, which saves once
+    _worker_manifest = RenderManifest(manifest_dir, enabled=not args.force)
+
+
+def _run_in_worker(file_path):
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        # No LayoutService: each worker lays out its own files synchronously
+        report = run_file(
+            file_path,
+            _worker_args,
+            _worker_config,
+            _worker_root,
+            None,
+            _worker_manifest,
+        )
+    report.log = log.getvalue()
+    return report, _worker_manifest.take_changes(), profiler.take()
+
+
+def run_files(
+    targets, args, config, project_root, manifest, manifest_dir
+) -> Iterator[FileReport]:
+    """
+    Classic mode over `targets`, yielding one FileReport per file in order.
+    With --jobs > 1 files fan out over a process pool that parses, builds,
+    writes and lays out each file; worker output is replayed per file and
+    manifest entries are merged here. A failing file never stops the run,
+    not even one that kills its worker (see `_run_pooled`).
+    """
+    jobs = resolve_jobs(args.jobs)
+    if jobs <= 1 or len(targets) <= 1:
+        # Layouts overlap with parsing the next file
+        with LayoutService(args.render_jobs, timeout=args.layout_timeout) as layout:
+            for file_path in targets:
+                yield run_file(file_path, args, config, project_root, layout, manifest)
+        return
+
+    initargs = (args, project_root, manifest_dir, profiler.settings())
+    window = jobs * 2
+    rest = list(targets)
+    while rest:
+        done = yield from _run_pooled(rest, jobs, window, initargs, manifest)
+        rest = rest[done:]
+        # A worker died (OOM, a crash in native code) with at most `window`
+        # files in flight: run each of those alone to find the culprit
+        for file_path in rest[:window]:
+            if not (yield from _run_pooled([file_path], 1, 1, initargs, manifest)):
+                print(f"[!] Worker process died on {file_path}")
+                yield FileReport(file_path, "failed", "Worker process died")
+        rest = rest[window:]
+
+
+def _run_pooled(targets, jobs, window, initargs, manifest):
+    """
+    Yield the reports of `targets` in order from a fresh pool, keeping at
+    most `window` files submitted. Returns how many were yielded before
+    the pool broke (all of them if it did not).
+    """
+    done = 0
+    with ProcessPoolExecutor(
+        max_workers=jobs, initializer=_init_worker, initargs=initargs
+    ) as pool:
+        futures = deque()
+        queued = iter(targets)
+        try:
+            for file_path in itertools.islice(queued, window):
+                futures.append(pool.submit(_run_in_worker, file_path))
+            while futures:
+                report, changes, trace = futures.popleft().result()
+                for file_path in itertools.islice(queued, 1):
+                    futures.append(pool.submit(_run_in_worker, file_path))
+                print(report.log, end="")
+                report.log = ""
+                manifest.merge(*changes)
+                profiler.merge(trace)
+                done += 1
+                yield report
+        except BrokenProcessPool:
+            pass
+    return done
+
+
+def write_report(path: str, reports: List[FileReport], jobs: int, seconds: float):
+    """The JSON run report: per-file status, phase timings and graph sizes."""
+    counts = {"ok": 0, "skipped": 0, "failed": 0}
+    for report in reports:
+        counts[report.status] += 1
+    data = {
+        "format": REPORT_FORMAT,
+        "jobs": jobs,
+        "seconds": round(seconds, 3),
+        "summary": counts,
+        "files": [
+            {k: v for k, v in asdict(report).items() if k != "log"}
+            for report in reports
+        ],
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+    return counts
@@ -0,0 +1,131 @@
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ast_engine import get_engine
+from discovery import function_keys, iter_functions
+from cfg_rust_core import RustCFGBuilder
+from cfg_python_core import PythonCFGBuilder
+from ir_graph import UniversalLogicGraph
+from imports import collect_imports
+from ir_view import GraphView
+from profiler import phase
+from syntax_errors import SyntaxIssue, attach_to_graph, find_syntax_errors
+
+# Bump whenever the graphs built for a file change (nodes, edges, labels,
+# metadata such as syntax errors); invalidates cached graphs. Changes to how
+# a cache entry is laid out bump cfg_cache.CACHE_FORMAT instead.
+# 2: syntax_errors metadata on ULG nodes
+BUILDER_VERSION = 2
+
+# Extension -> CFG builder class (function discovery lives in discovery.py)
+LANGUAGES = {
+    "rs": RustCFGBuilder,
+    "py": PythonCFGBuilder,
+}
+
+
+@dataclass
+class FunctionGraph:
+    name: str
+    graph: UniversalLogicGraph
+    qualname: str = ""
+    # Callee key -> IDs of the CALL nodes invoking it, as emitted by the builder
+    call_sites: Dict[str, List[str]] = field(default_factory=dict)
+
+
+@dataclass
+class FileAnalysis:
+    path: str
+    lang: str
+    functions: List[FunctionGraph] = field(default_factory=list)
+    syntax_errors: List[SyntaxIssue] = field(default_factory=list)
+    # File-level (local name, imported path) pairs, see imports.collect_imports
+    imports: Tuple[Tuple[str, str], ...] = ()
+
+
+def lang_of(file_path: str) -> Optional[str]:
+    ext = file_path.split(".")[-1].lower()
+    return ext if ext in LANGUAGES else None
+
+
+def analyze_file(
+    file_path, config, engine=None, code=None, tree=None
+) -> Optional[FileAnalysis]:
+    """
+    Parse a file once and build the CFG of every function it defines.
+    The source buffer and the builder are shared by all functions of the file.
+    `code` may carry bytes the caller already read (e.g. to hash them), and
+    `tree` a parse of exactly those bytes to reuse.
+    Returns None for unsupported extensions; parse errors propagate.
+    """
+    lang = lang_of(file_path)
+    if lang is None:
+        return None
+
+    if tree is None:
+        engine = engine or get_engine()
+        tree, code_bytes = engine.parse_file(file_path, code)
+    else:
+        code_bytes = code
+
+    builder = LANGUAGES[lang](code_bytes)
+    builder.set_config_loader(config)
+
+    analysis = FileAnalysis(file_path, lang)
+    with phase("discover", file=file_path):
+        analysis.imports = collect_imports(tree.root_node, lang, code_bytes)
+        analysis.syntax_errors = find_syntax_errors(tree.root_node)
+        functions = list(iter_functions(tree.root_node, lang, code_bytes))
+    with phase("build", file=file_path, functions=len(functions)):
+        for fn in functions:
+            fn_graph = builder.build_from_function(fn.node)
+            if not fn_graph.entry_node:
+                continue
+            if analysis.syntax_errors:
+                attach_to_graph(fn_graph, fn.node, analysis.syntax_errors)
+            analysis.functions.append(
+                FunctionGraph(fn.name, fn_graph, fn.qualname, builder.call_sites)
+            )
+    return analysis
+
+
+def function_prefixes(functions) -> List[str]:
+    """
+    ID prefix of each function in a file graph: its qualified key with
+    non-word characters as `_`, so `A::new` and `B::new` stay apart.
+    """
+    return [re.sub(r"\W", "_", key) for key in function_keys(functions)]
+
+
+def build_file_graph(analysis: FileAnalysis) -> UniversalLogicGraph:
+    """
+    Fuse the per-function graphs of one file, one cluster per function.
+    The functions are attached by reference, not copied.
+    """
+    file_graph = GraphView(os.path.basename(analysis.path))
+    with phase("merge", file=analysis.path):
+        for fn, prefix in zip(
+            analysis.functions, function_prefixes(analysis.functions)
+        ):
+            file_graph.merge_graph(fn.graph, prefix)
+    return file_graph
+
+
+def file_symbols(analysis: FileAnalysis) -> List[Tuple[str, str, str]]:
+    """(name, qualname, entry node ID in the file graph) per function."""
+    return [
+        (fn.name, fn.qualname, f"{prefix}_{fn.graph.entry_node}")
+        for fn, prefix in zip(analysis.functions, function_prefixes(analysis.functions))
+    ]
+
+
+def file_call_sites(analysis: FileAnalysis) -> List[Tuple[str, str, str]]:
+    """(callee, call node ID in the file graph, caller qualname) triples."""
+    sites = []
+    for fn, prefix in zip(analysis.functions, function_prefixes(analysis.functions)):
+        for callee, node_ids in fn.call_sites.items():
+            for nid in node_ids:
+                sites.append((callee, f"{prefix}_{nid}", fn.qualname))
+    return sites
@@ -0,0 +1,163 @@
+import os
+from functools import lru_cache
+from typing import List, Tuple
+
+# Path separator per language
+SEPARATORS = {"rs": "::", "py": "."}
+
+# Rust files that stand for their directory (or the crate) rather than a module
+_RUST_ROOTS = ("lib", "main", "mod")
+
+
+def _text(code: bytes, node) -> str:
+    # `crate :: a` and `crate::a` name the same path
+    return "".join(code[node.start_byte : node.end_byte].decode("utf-8").split())
+
+
+def collect_imports(root, lang: str, code: bytes) -> Tuple[Tuple[str, str], ...]:
+    """
+    File-level `use` / `import` bindings of a parsed file as
+    (local name, path as written) pairs, e.g. ("Client", "crate::net::Client")
+    or ("g", "..pkg.mod.f"). Glob imports use the name "*". Only statements
+    at file level (and Python `try`/`if` blocks there) are read; imports
+    local to a function or an inline `mod` are not.
+    """
+    out: List[Tuple[str, str]] = []
+    if lang == "rs":
+        for node in root.named_children:
+            if node.type == "use_declaration":
+                arg = node.child_by_field_name("argument")
+                if arg is not None:
+                    _rust_use(code, arg, "", out)
+    elif lang == "py":
+        stack = list(reversed(root.named_children))
+        while stack:
+            node = stack.pop()
+            if node.type == "import_statement":
+                _python_import(code, node, out)
+            elif node.type == "import_from_statement":
+                _python_from(code, node, out)
+            elif node.type in ("try_statement", "if_statement", "block") or (
+                node.type.endswith("_clause")
+            ):
+                stack.extend(reversed(node.named_children))
+    return tuple(out)
+
+
+def _rust_use(code: bytes, node, prefix: str, out):
+    kind = node.type
+    if kind == "use_as_clause":
+        path = _text(code, node.child_by_field_name("path"))
+        out.append((_text(code, node.child_by_field_name("alias")), prefix + path))
+    elif kind == "scoped_use_list":
+        path = node.child_by_field_name("path")
+        inner = f"{prefix}{_text(code, path)}::" if path is not None else prefix
+        _rust_use(code, node.child_by_field_name("list"), inner, out)
+    elif kind == "use_list":
+        for child in node.named_children:
+            _rust_use(code, child, prefix, out)
+    elif kind == "use_wildcard":
+        path = node.named_children[0] if node.named_children else None
+        out.append(("*", prefix + _text(code, path) if path else prefix[:-2]))
+    elif kind == "self" and prefix:
+        # `use a::b::{self}` binds `b`
+        path = prefix[:-2]
+        out.append((path.rsplit("::", 1)[-1], path))
+    elif kind in ("identifier", "scoped_identifier", "crate", "super", "self"):
+        path = prefix + _text(code, node)
+        out.append((path.rsplit("::", 1)[-1], path))
+
+
+def _python_import(code: bytes, node, out):
+    for name in node.children_by_field_name("name"):
+        if name.type == "aliased_import":
+            alias = _text(code, name.child_by_field_name("alias"))
+            out.append((alias, _text(code, name.child_by_field_name("name"))))
+        else:
+            # `import a.b.c` binds `a`
+            head = _text(code, name).split(".", 1)[0]
+            out.append((head, head))
+
+
+def _python_from(code: bytes, node, out):
+    module = _text(code, node.child_by_field_name("module_name"))
+    base = module if module.endswith(".") else f"{module}."
+    for child in node.named_children:
+        if child.type == "wildcard_import":
+            out.append(("*", module))
+    for name in node.children_by_field_name("name"):
+        if name.type == "aliased_import":
+            alias = _text(code, name.child_by_field_name("alias"))
+            out.append((alias, base + _text(code, name.child_by_field_name("name"))))
+        else:
+            out.append((_text(code, name).rsplit(".", 1)[-1], base + _text(code, name)))
+
+
+@lru_cache(maxsize=None)
+def _is_package(directory: str) -> bool:
+    return os.path.isfile(os.path.join(directory, "__init__.py"))
+
+
+@lru_cache(maxsize=None)
+def _crate_of(directory: str) -> Tuple[str, Tuple[str, ...]]:
+    """(crate name, module segments) of a directory under some `src/`."""
+    parts = []
+    head = directory
+    while True:
+        head, tail = os.path.split(head)
+        if tail == "src":
+            name = os.path.basename(head) or "crate"
+            return name.replace("-", "_"), tuple(reversed(parts))
+        if not tail:
+            return "crate", ()
+        parts.append(tail)
+
+
+def module_path(file_path: str, lang: str) -> Tuple[str, bool]:
+    """
+    Qualified module of a source file and whether it is a package.
+    Rust: `<crate>/src/net/client.rs` -> "<crate>::net::client", with
+    lib.rs/main.rs/mod.rs naming their directory. Python: dotted path
+    through the enclosing `__init__.py` packages, e.g. "pkg.sub.mod".
+    """
+    directory, filename = os.path.split(os.path.abspath(file_path))
+    stem = os.path.splitext(filename)[0]
+    if lang == "rs":
+        crate, parts = _crate_of(directory)
+        if stem not in _RUST_ROOTS:
+            parts += (stem,)
+        return "::".join((crate, *parts)), stem in _RUST_ROOTS
+
+    parts = [] if stem == "__init__" else [stem]
+    while _is_package(directory):
+        directory, package = os.path.split(directory)
+        parts.append(package)
+    return ".".join(reversed(parts)), stem == "__init__"
+
+
+def absolute_path(path: str, lang: str, module: str, is_package: bool) -> str:
+    """Resolve `crate::`/`self::`/`super::` and Python relative imports."""
+    if lang == "rs":
+        head, _, rest = path.partition("::")
+        segments = module.split("::")
+        if head == "crate":
+            return "::".join((segments[0], rest)) if rest else segments[0]
+        if head == "self":
+            return f"{module}::{rest}" if rest else module
+        if head == "super":
+            ups = 1
+            while rest.startswith("super::"):
+                ups += 1
+                rest = rest[len("super::") :]
+            base = "::".join(segments[: max(1, len(segments) - ups)])
+            return f"{base}::{rest}" if rest else base
+        return path
+
+    if not path.startswith("."):
+        return path
+    rest = path.lstrip(".")
+    level = len(path) - len(rest)
+    segments = module.split(".") if module else []
+    keep = len(segments) - level + (1 if is_package else 0)
+    base = ".".join(segments[: max(0, keep)])
+    return ".".join(p for p in (base, rest) if p)
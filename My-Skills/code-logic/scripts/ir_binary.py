@@ -0,0 +1,185 @@
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Optional, Tuple
+
+from ir_compact import CompactLogicGraph
+from ir_graph import graph_class
+
+MAGIC = b"ULGB"
+# Bump when the layout changes; readers reject other versions
+FORMAT_VERSION = 1
+IR_SUFFIX = ".ulg"
+
+# magic, version, flags, nodes, edges, strings, counter, name, entry,
+# string blob bytes, extras bytes
+_HEADER = struct.Struct("<4sHHIIIIIIQQ")
+_HAS_ENTRY = 1
+_NUL_FREE = 2  # no string contains "\0": the blob splits in one call
+_SWAP = sys.byteorder != "little"  # the file is always little-endian
+
+
+def _pad(n: int) -> int:
+    return -n % 8
+
+
+def _column(typecode: str, values) -> bytes:
+    col = values if isinstance(values, array) else array(typecode, values)
+    if _SWAP:
+        col = array(typecode, col)
+        col.byteswap()
+    data = col.tobytes()
+    return data + b"\0" * _pad(len(data))
+
+
+def dumps(graph, extras: Optional[dict] = None) -> bytes:
+    """
+    Serialize any ULG. Layout after the 48-byte header, every section
+    8-byte aligned and little-endian so the file can be memory-mapped:
+      u32 string offsets[S+1] | NUL-terminated UTF-8 strings
+      u8 type | u32 local, prefix, cluster, label, description   (N rows)
+      u32 src, dst | u8 type | u32 label   (E edges, grouped by source)
+      u32 CSR offsets[N+1] | JSON extras (non-cluster metadata, caller data)
+    """
+    if not isinstance(graph, CompactLogicGraph):
+        graph = CompactLogicGraph.from_compact(graph.to_compact())
+    strings = graph.strings.strings
+    intern = graph.strings.intern
+    name = intern(graph.name or "")
+    entry = intern(graph.entry_node) if graph.entry_node is not None else 0
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = array("I", [0])
+    for s in encoded:
+        offsets.append(offsets[-1] + len(s) + 1)
+    blob = b"\0".join(encoded) + b"\0"
+    flags = (_HAS_ENTRY if graph.entry_node is not None else 0) | (
+        0 if any(b"\0" in s for s in encoded) else _NUL_FREE
+    )
+
+    csr_offsets, order = graph._build_csr()
+    meta = {
+        str(i): {k: v for k, v in m.items() if k != "cluster"}
+        for i, m in graph._meta.items()
+        if any(k != "cluster" for k in m)
+    }
+    extras_blob = json.dumps(
+        {"meta": meta, **(extras or {})}, default=str, separators=(",", ":")
+    ).encode("utf-8")
+
+    n, m = len(graph._type), len(order)
+    parts = [
+        _HEADER.pack(
+            MAGIC,
+            FORMAT_VERSION,
+            flags,
+            n,
+            m,
+            len(strings),
+            graph._counter,
+            name,
+            entry,
+            len(blob),
+            len(extras_blob),
+        ),
+        _column("I", offsets),
+        blob + b"\0" * _pad(len(blob)),
+        _column("B", graph._type),
+        _column("I", graph._local),
+        _column("I", graph._prefix),
+        _column("I", graph._cluster),
+        _column("I", graph._label),
+        _column("I", graph._desc),
+        _column("I", [graph._src[e] for e in order]),
+        _column("I", [graph._dst[e] for e in order]),
+        _column("B", [graph._etype[e] for e in order]),
+        _column("I", [graph._elabel[e] for e in order]),
+        _column("I", csr_offsets),
+        extras_blob,
+    ]
+    return b"".join(parts)
+
+
+def loads(data) -> Tuple[CompactLogicGraph, dict]:
+    """Inverse of `dumps`: (graph, extras). Columns are copied in bulk."""
+    view = memoryview(data)
+    (
+        magic,
+        version,
+        flags,
+        n,
+        m,
+        n_strings,
+        counter,
+        name,
+        entry,
+        blob_len,
+        extras_len,
+    ) = _HEADER.unpack_from(view)
+    if magic != MAGIC or version != FORMAT_VERSION:
+        raise ValueError("not a ULG binary file (or an unsupported version)")
+    pos = _HEADER.size
+
+    def take(typecode: str, count: int) -> array:
+        nonlocal pos
+        col = array(typecode)
+        size = col.itemsize * count
+        col.frombytes(view[pos : pos + size])
+        if _SWAP:
+            col.byteswap()
+        pos += size + _pad(size)
+        return col
+
+    offsets = take("I", n_strings + 1)
+    blob = bytes(view[pos : pos + blob_len])
+    pos += blob_len + _pad(blob_len)
+    if flags & _NUL_FREE:
+        strings = blob[:-1].decode("utf-8").split("\0") if n_strings else []
+    else:
+        strings = [
+            blob[offsets[i] : offsets[i + 1] - 1].decode("utf-8")
+            for i in range(n_strings)
+        ]
+
+    g = CompactLogicGraph(strings[name])
+    g.entry_node = strings[entry] if flags & _HAS_ENTRY else None
+    g._counter = counter
+    g.strings.strings = strings
+    g.strings.index = {s: i for i, s in enumerate(strings)}
+    g._type, g._local, g._prefix = take("B", n), take("I", n), take("I", n)
+    g._cluster, g._label, g._desc = take("I", n), take("I", n), take("I", n)
+    g._src, g._dst, g._etype, g._elabel = (
+        take("I", m),
+        take("I", m),
+        take("B", m),
+        take("I", m),
+    )
+    # Edges are stored grouped by source: the CSR order is the identity
+    g._csr = (take("I", n + 1), array("I", range(m)))
+    g._prefixes = set(g._prefix)
+
+    extras = json.loads(bytes(view[pos : pos + extras_len]).decode("utf-8"))
+    for row, meta in extras.pop("meta", {}).items():
+        g._metadata(int(row)).update(meta)
+    return g, extras
+
+
+def save(path: str, graph, extras: Optional[dict] = None):
+    """Write `dumps(graph, extras)` to `path` via a temp file and rename."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(dumps(graph, extras))
+    os.replace(tmp_path, path)
+
+
+def load(path: str) -> Tuple[CompactLogicGraph, dict]:
+    with open(path, "rb") as f:
+        return loads(f.read())
+
+
+def to_backend(graph: CompactLogicGraph):
+    """A loaded graph in the class of the active `--ir-backend`."""
+    cls = graph_class()
+    return graph if cls is CompactLogicGraph else cls.from_compact(graph.to_compact())
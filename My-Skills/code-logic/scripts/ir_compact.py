@@ -0,0 +1,409 @@
+from array import array
+from typing import Dict, Iterator, Optional
+
+from ir_graph import EdgeType, NodeType
+from source_text import resolve_label
+
+_NODE_TYPES = list(NodeType)
+_EDGE_TYPES = list(EdgeType)
+_TYPE_CODE = {t: i for i, t in enumerate(_NODE_TYPES)}
+_EDGE_CODE = {t: i for i, t in enumerate(_EDGE_TYPES)}
+_TYPE_NAMES = [t.name.lower() for t in _NODE_TYPES]
+_TYPE_BY_NAME = {name: i for i, name in enumerate(_TYPE_NAMES)}
+
+
+class StringTable:
+    """Interned strings; rows store small integer indexes instead of str objects."""
+
+    __slots__ = ("strings", "index")
+
+    def __init__(self):
+        self.strings = [""]
+        self.index = {"": 0}
+
+    def intern(self, s: str) -> int:
+        i = self.index.get(s)
+        if i is None:
+            i = len(self.strings)
+            self.strings.append(s)
+            self.index[s] = i
+        return i
+
+
+class NodeRef:
+    """Flyweight view of one node row; duck-types `ir_graph.Node`."""
+
+    __slots__ = ("_g", "_i")
+
+    def __init__(self, graph, index: int):
+        self._g = graph
+        self._i = index
+
+    @property
+    def id(self) -> str:
+        return self._g._id_of(self._i)
+
+    @property
+    def type(self) -> NodeType:
+        return _NODE_TYPES[self._g._type[self._i]]
+
+    @property
+    def label(self) -> str:
+        return self._g.strings.strings[self._g._label[self._i]]
+
+    @property
+    def description(self) -> str:
+        return self._g.strings.strings[self._g._desc[self._i]]
+
+    @property
+    def ast_node(self):
+        return self._g._ast.get(self._i)
+
+    @property
+    def metadata(self) -> dict:
+        return self._g._metadata(self._i)
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, NodeRef) and other._g is self._g and other._i == self._i
+        )
+
+    def __hash__(self):
+        return hash((id(self._g), self._i))
+
+    def __repr__(self):
+        return f"NodeRef({self.id!r}, {self.type.name}, {self.label!r})"
+
+
+class CompactLogicGraph:
+    """
+    Array-backed ULG with the same API as `UniversalLogicGraph`.
+    Nodes are integer rows in struct-of-arrays columns (type, label,
+    description, id prefix, cluster) over one string table; IDs such as
+    `lib_rs_run_block_3` are rebuilt from (prefix, type, counter) on demand.
+    Edges are appended as parallel arrays and grouped into CSR on first
+    traversal. Tree-sitter nodes are kept only on builder graphs: merged
+    (atlas) rows drop them.
+    """
+
+    __slots__ = (
+        "name", "entry_node", "_counter", "strings",
+        "_type", "_local", "_prefix", "_cluster", "_label", "_desc",
+        "_ast", "_meta", "_src", "_dst", "_etype", "_elabel",
+        "_csr", "_id_index", "_prefixes",
+    )  # fmt: skip
+
+    def __init__(self, name: str):
+        self.name = name
+        self.entry_node: Optional[str] = None
+        self._counter = 0
+        self.strings = StringTable()
+        # Node columns; _local == 0 marks a verbatim ID stored in _prefix
+        self._type = array("B")
+        self._local = array("I")
+        self._prefix = array("I")
+        self._cluster = array("I")
+        self._label = array("I")
+        self._desc = array("I")
+        self._ast: Dict[int, object] = {}
+        self._meta: Dict[int, dict] = {}
+        # Edge columns (COO until _build_csr)
+        self._src = array("I")
+        self._dst = array("I")
+        self._etype = array("B")
+        self._elabel = array("I")
+        self._csr = None
+        self._id_index: Optional[Dict[str, int]] = None
+        self._prefixes = set()  # ID prefixes in use, for merge collision checks
+
+    # --- Rows ---
+
+    def _id_of(self, i: int) -> str:
+        prefix = self.strings.strings[self._prefix[i]]
+        local = self._local[i]
+        if local == 0:
+            return prefix
+        base = f"{_TYPE_NAMES[self._type[i]]}_{local}"
+        return f"{prefix}_{base}" if prefix else base
+
+    def _append_row(self, type_code, local, prefix, cluster, label, desc) -> int:
+        i = len(self._type)
+        self._type.append(type_code)
+        self._local.append(local)
+        self._prefix.append(prefix)
+        self._cluster.append(cluster)
+        self._label.append(label)
+        self._desc.append(desc)
+        if self._id_index is not None:
+            self._id_index[self._id_of(i)] = i
+        return i
+
+    def _metadata(self, i: int) -> dict:
+        meta = self._meta.get(i)
+        if meta is None:
+            meta = {}
+            if self._cluster[i]:
+                meta["cluster"] = self.strings.strings[self._cluster[i]]
+            self._meta[i] = meta
+        return meta
+
+    def _lookup(self, nid: str) -> int:
+        if self._id_index is None:
+            self._id_index = {self._id_of(i): i for i in range(len(self._type))}
+        return self._id_index[nid]
+
+    def _row_of(self, node) -> int:
+        if isinstance(node, NodeRef) and node._g is self:
+            return node._i
+        return self._lookup(node.id)
+
+    # --- UniversalLogicGraph API ---
+
+    def add_node(
+        self, type: NodeType, label: str = "", ast_node=None, description: str = ""
+    ) -> NodeRef:
+        self._counter += 1
+        intern = self.strings.intern
+        i = self._append_row(
+            _TYPE_CODE[type],
+            self._counter,
+            0,
+            0,
+            # The string table needs the text: span labels are decoded here
+            intern(resolve_label(label)),
+            intern(description),
+        )
+        if ast_node is not None:
+            self._ast[i] = ast_node
+        return NodeRef(self, i)
+
+    def add_edge(self, source, target, type: EdgeType, label: str = ""):
+        self._src.append(self._row_of(source))
+        self._dst.append(self._row_of(target))
+        self._etype.append(_EDGE_CODE[type])
+        self._elabel.append(self.strings.intern(label))
+        self._csr = None
+
+    def get_node(self, nid: str) -> NodeRef:
+        return NodeRef(self, self._lookup(nid))
+
+    def set_entry(self, node):
+        self.entry_node = node.id
+
+    def number_of_nodes(self) -> int:
+        return len(self._type)
+
+    def nodes(self) -> Iterator[NodeRef]:
+        for i in range(len(self._type)):
+            yield NodeRef(self, i)
+
+    def edges(self):
+        offsets, order = self._build_csr()
+        labels = self.strings.strings
+        for u in range(len(self._type)):
+            start, end = offsets[u], offsets[u + 1]
+            if start == end:
+                continue
+            src = NodeRef(self, u)
+            for k in range(start, end):
+                e = order[k]
+                yield (
+                    src,
+                    NodeRef(self, self._dst[e]),
+                    _EDGE_TYPES[self._etype[e]],
+                    labels[self._elabel[e]],
+                )
+
+    def out_edges(self, node):
+        u = self._row_of(node)
+        offsets, order = self._build_csr()
+        labels = self.strings.strings
+        src = NodeRef(self, u)
+        for k in range(offsets[u], offsets[u + 1]):
+            e = order[k]
+            yield (
+                src,
+                NodeRef(self, self._dst[e]),
+                _EDGE_TYPES[self._etype[e]],
+                labels[self._elabel[e]],
+            )
+
+    def _build_csr(self):
+        """
+        Group edges by source row (stable). A repeated (u, v) keeps its first
+        position and its last attributes, matching DiGraph.add_edge.
+        """
+        if self._csr is not None:
+            return self._csr
+        n, src, dst = len(self._type), self._src, self._dst
+        offsets = array("I", bytes(4 * (n + 1)))
+        for s in src:
+            offsets[s + 1] += 1
+        for u in range(n):
+            offsets[u + 1] += offsets[u]
+        cursor = array("I", offsets[:-1] if n else [])
+        order = array("I", bytes(4 * len(src)))
+        for e, s in enumerate(src):
+            order[cursor[s]] = e
+            cursor[s] += 1
+
+        if self._has_parallel_edges(offsets, order):
+            dedup = array("I")
+            new_offsets = array("I", [0])
+            for u in range(n):
+                first = {}
+                for k in range(offsets[u], offsets[u + 1]):
+                    e = order[k]
+                    if dst[e] in first:
+                        dedup[first[dst[e]]] = e  # last attributes win
+                    else:
+                        first[dst[e]] = len(dedup)
+                        dedup.append(e)
+                new_offsets.append(len(dedup))
+            offsets, order = new_offsets, dedup
+
+        self._csr = (offsets, order)
+        return self._csr
+
+    def _has_parallel_edges(self, offsets, order) -> bool:
+        dst = self._dst
+        for u in range(len(self._type)):
+            start, end = offsets[u], offsets[u + 1]
+            if end - start > 1:
+                targets = [dst[order[k]] for k in range(start, end)]
+                if len(set(targets)) != len(targets):
+                    return True
+        return False
+
+    def merge_graph(self, other_graph, prefix: str):
+        """
+        Merge another graph into this one, prefixing IDs to avoid collisions.
+        Compact sources are copied column-wise with string remapping.
+        """
+        if not isinstance(other_graph, CompactLogicGraph):
+            other_graph = CompactLogicGraph.from_compact(other_graph.to_compact())
+
+        intern = self.strings.intern
+        other_strings = other_graph.strings.strings
+        remap = {}
+
+        def local_str(j):
+            k = remap.get(j)
+            if k is None:
+                k = remap[j] = intern(other_strings[j])
+            return k
+
+        cluster = intern(prefix)
+        prefix_map = {}
+        for p in set(other_graph._prefix):
+            old = other_strings[p]
+            prefix_map[p] = intern(f"{prefix}_{old}" if old else prefix)
+
+        # An ID prefix already in use means IDs may repeat: DiGraph semantics
+        # overwrite the existing row in place instead of appending a new one
+        collide = any(p in self._prefixes for p in prefix_map.values())
+        existing = None
+        if collide:
+            targets = set(prefix_map.values())
+            existing = {
+                self._id_of(i): i
+                for i in range(len(self._type))
+                if self._prefix[i] in targets
+            }
+        self._prefixes.update(prefix_map.values())
+
+        rows = array("I")
+        for j in range(len(other_graph._type)):
+            values = (
+                other_graph._type[j],
+                other_graph._local[j],
+                prefix_map[other_graph._prefix[j]],
+                cluster,
+                local_str(other_graph._label[j]),
+                local_str(other_graph._desc[j]),
+            )
+            i = None
+            if existing is not None:
+                i = existing.get(self._id_of_values(values))
+            if i is None:
+                i = self._append_row(*values)
+            else:
+                self._overwrite_row(i, values)
+                self._meta.pop(i, None)
+            rows.append(i)
+            extra = other_graph._meta.get(j)
+            if extra:
+                meta = self._metadata(i)
+                meta.update({k: v for k, v in extra.items() if k != "cluster"})
+
+        for e in range(len(other_graph._src)):
+            self._src.append(rows[other_graph._src[e]])
+            self._dst.append(rows[other_graph._dst[e]])
+            self._etype.append(other_graph._etype[e])
+            self._elabel.append(local_str(other_graph._elabel[e]))
+        self._csr = None
+
+    def _id_of_values(self, values) -> str:
+        type_code, local, prefix = values[0], values[1], values[2]
+        prefix_str = self.strings.strings[prefix]
+        if local == 0:
+            return prefix_str
+        base = f"{_TYPE_NAMES[type_code]}_{local}"
+        return f"{prefix_str}_{base}" if prefix_str else base
+
+    def _overwrite_row(self, i, values):
+        (
+            self._type[i],
+            self._local[i],
+            self._prefix[i],
+            self._cluster[i],
+            self._label[i],
+            self._desc[i],
+        ) = values
+
+    # --- Serialization (same tuple layout as UniversalLogicGraph) ---
+
+    def to_compact(self) -> tuple:
+        nodes = [
+            (n.id, n.type.value, n.label, n.description, n.metadata)
+            for n in self.nodes()
+        ]
+        edges = [(u.id, v.id, t.value, label) for u, v, t, label in self.edges()]
+        return (self.name, self.entry_node, self._counter, nodes, edges)
+
+    @classmethod
+    def from_compact(cls, data: tuple) -> "CompactLogicGraph":
+        name, entry_node, counter, nodes, edges = data
+        g = cls(name)
+        g.entry_node = entry_node
+        g._counter = counter
+        intern = g.strings.intern
+        rows = {}
+        for nid, type_value, label, description, metadata in nodes:
+            type_code = _TYPE_CODE[NodeType(type_value)]
+            local, prefix = 0, nid
+            parts = nid.rsplit("_", 2)
+            if len(parts) >= 2 and parts[-1].isdigit() and int(parts[-1]) > 0:
+                if _TYPE_BY_NAME.get(parts[-2]) == type_code:
+                    local = int(parts[-1])
+                    prefix = parts[0] if len(parts) == 3 else ""
+            cluster = metadata.get("cluster", "") if metadata else ""
+            i = g._append_row(
+                type_code,
+                local,
+                intern(prefix),
+                intern(cluster),
+                intern(label),
+                intern(description),
+            )
+            g._prefixes.add(g._prefix[i])
+            rows[nid] = i
+            extra = {k: v for k, v in (metadata or {}).items() if k != "cluster"}
+            if extra:
+                g._metadata(i).update(extra)
+        for u, v, type_value, label in edges:
+            g._src.append(rows[u])
+            g._dst.append(rows[v])
+            g._etype.append(_EDGE_CODE[EdgeType(type_value)])
+            g._elabel.append(intern(label))
+        return g
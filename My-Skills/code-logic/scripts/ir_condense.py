@@ -0,0 +1,221 @@
+import time
+from typing import Dict, List, Optional, Sequence
+
+from ir_graph import EdgeType, NodeType, graph_class
+
+LOD_LEVELS = ("full", "function")
+
+
+class _Work:
+    """Mutable adjacency copy of a graph; node and edge order are kept."""
+
+    def __init__(self, graph):
+        self.name, self.entry, _, nodes, edges = graph.to_compact()
+        self.nodes: Dict[str, list] = {}  # id -> [type, label, description, metadata]
+        self.succ: Dict[str, Dict[str, tuple]] = {}  # u -> {v: (type, label)}
+        self.pred: Dict[str, Dict[str, None]] = {}
+        for nid, type, label, desc, meta in nodes:
+            self.nodes[nid] = [NodeType(type), label, desc, dict(meta or {})]
+            self.succ[nid] = {}
+            self.pred[nid] = {}
+        for u, v, type, label in edges:
+            self.succ[u][v] = (EdgeType(type), label)
+            self.pred[v][u] = None
+
+    def redirect(self, u: str, old: str, new: str, attrs: tuple):
+        """Point u's edge to `old` at `new` instead, in the same position."""
+        self.succ[u] = {
+            (new if v == old else v): (attrs if v == old else a)
+            for v, a in self.succ[u].items()
+        }
+        self.pred[new][u] = None
+
+    def drop(self, nid: str):
+        for v in self.succ.pop(nid):
+            self.pred[v].pop(nid, None)
+        for u in self.pred.pop(nid):
+            if u in self.succ:
+                self.succ[u].pop(nid, None)
+        del self.nodes[nid]
+
+    def build(self):
+        nodes = [
+            (nid, type.value, label, desc, meta)
+            for nid, (type, label, desc, meta) in self.nodes.items()
+        ]
+        edges = [
+            (u, v, type.value, label)
+            for u, targets in self.succ.items()
+            for v, (type, label) in targets.items()
+        ]
+        return graph_class().from_compact((self.name, self.entry, 0, nodes, edges))
+
+
+def _join_labels(*labels: str) -> str:
+    seen = []
+    for label in labels:
+        if label and label not in seen:
+            seen.append(label)
+    return " / ".join(seen)
+
+
+def collapse_chains(work: _Work) -> None:
+    """Merge BLOCK -SEQ-> BLOCK links where neither side branches."""
+    for nid in list(work.nodes):
+        node = work.nodes.get(nid)
+        if node is None or node[0] != NodeType.BLOCK:
+            continue
+        while len(work.succ[nid]) == 1:
+            ((nxt, (type, label)),) = work.succ[nid].items()
+            other = work.nodes[nxt]
+            if (
+                type != EdgeType.SEQ
+                or label
+                or other[0] != NodeType.BLOCK
+                or len(work.pred[nxt]) != 1
+                or nxt == work.entry
+            ):
+                break
+            node[1] = f"{node[1]}\n{other[1]}"
+            node[3] = {**other[3], **node[3]}
+            for v, attrs in work.succ[nxt].items():
+                work.succ[nid][v] = attrs
+                work.pred[v][nid] = None
+            work.succ[nid].pop(nxt)
+            work.drop(nxt)
+
+
+def elide_virtual(work: _Work) -> None:
+    """A VIRTUAL anchor with one way in and one way out becomes an edge label."""
+    for nid in list(work.nodes):
+        node = work.nodes[nid]
+        if node[0] != NodeType.VIRTUAL or nid == work.entry:
+            continue
+        if len(work.pred[nid]) != 1 or len(work.succ[nid]) != 1:
+            continue
+        (u,) = work.pred[nid]
+        ((v, (out_type, out_label)),) = work.succ[nid].items()
+        if v in work.succ[u] or v == nid:
+            continue  # would create a parallel edge or a self-loop
+        in_type, in_label = work.succ[u][nid]
+        type = in_type if in_type != EdgeType.SEQ else out_type
+        work.redirect(u, nid, v, (type, _join_labels(in_label, node[1], out_label)))
+        work.drop(nid)
+
+
+def fold_joins(work: _Work) -> None:
+    """A JOIN reached from a single predecessor is skipped."""
+    for nid in list(work.nodes):
+        node = work.nodes[nid]
+        if node[0] != NodeType.JOIN or nid == work.entry or len(work.pred[nid]) != 1:
+            continue
+        (u,) = work.pred[nid]
+        targets = work.succ[nid]
+        if u == nid or any(v in work.succ[u] or v == u for v in targets):
+            continue
+        in_type, in_label = work.succ[u][nid]
+        replaced = {}
+        for v, (type, label) in targets.items():
+            type = in_type if type == EdgeType.SEQ else type
+            replaced[v] = (type, _join_labels(in_label, label))
+        edges = {}
+        for v, attrs in work.succ[u].items():
+            if v == nid:
+                edges.update(replaced)
+            else:
+                edges[v] = attrs
+        work.succ[u] = edges
+        for v in replaced:
+            work.pred[v][u] = None
+        work.drop(nid)
+
+
+PASSES = {
+    "chains": collapse_chains,
+    "virtual": elide_virtual,
+    "joins": fold_joins,
+}
+
+
+def condense(
+    graph, passes: Sequence[str] = tuple(PASSES), timings: Optional[list] = None
+):
+    """
+    Rewrite a copy of `graph` for layout with each named pass in order.
+    Surviving nodes keep their IDs. Appends (pass, seconds, nodes removed)
+    to `timings` when given.
+    """
+    work = _Work(graph)
+    for name in passes:
+        before = len(work.nodes)
+        start = time.perf_counter()
+        PASSES[name](work)
+        if timings is not None:
+            timings.append(
+                (name, time.perf_counter() - start, before - len(work.nodes))
+            )
+    return work.build()
+
+
+def format_timings(timings: List[tuple], before: int, after: int) -> str:
+    passes = ", ".join(
+        f"{name} -{removed} in {secs * 1000:.1f} ms" for name, secs, removed in timings
+    )
+    return f"[*] Condensed {before} -> {after} nodes ({passes})"
+
+
+def function_level(graph, functions) -> object:
+    """
+    Atlas level of detail `function`: one node per function (at its entry
+    ID, labelled with the qualified name, in the same cluster) and one
+    LINK edge per calling pair, labelled with the call count.
+    `functions` are (qualname, name, file_path, entry ID) rows.
+    """
+    succ: Dict[str, List[str]] = {}
+    links = []
+    for u, v, type, _ in graph.edges():
+        if type == EdgeType.LINK:
+            links.append((u.id, v.id))
+        else:
+            succ.setdefault(u.id, []).append(v.id)
+
+    owner: Dict[str, str] = {}
+    entries = []
+    for qualname, _, _, entry_id in functions:
+        if entry_id in owner:
+            continue
+        entries.append((entry_id, qualname))
+        stack = [entry_id]
+        while stack:
+            nid = stack.pop()
+            if nid not in owner:
+                owner[nid] = entry_id
+                stack.extend(succ.get(nid, ()))
+
+    clusters = {}
+    for n in graph.nodes():
+        if n.id in owner and owner[n.id] not in clusters:
+            clusters[owner[n.id]] = n.metadata.get("cluster")
+
+    counts: Dict[tuple, int] = {}
+    for u, v in links:
+        pair = (owner.get(u), owner.get(v))
+        if None not in pair:
+            counts[pair] = counts.get(pair, 0) + 1
+
+    nodes = [
+        (
+            entry_id,
+            NodeType.BLOCK.value,
+            qualname,
+            "",
+            {"cluster": clusters[entry_id]} if clusters.get(entry_id) else {},
+        )
+        for entry_id, qualname in entries
+        if entry_id in clusters
+    ]
+    edges = [
+        (u, v, EdgeType.LINK.value, "calls" if n == 1 else f"calls x{n}")
+        for (u, v), n in counts.items()
+    ]
+    return graph_class().from_compact((graph.name, None, 0, nodes, edges))
@@ -1,6 +1,6 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum, auto
-from typing import Optional, List, Any, Dict
+from typing import Optional, Any, Dict
 import networkx as nx
 
 # --- Definitions ---
@@ -24,18 +24,45 @@ class EdgeType(Enum):
     LINK = auto()  # Cross-file reference (New in v1.3)
 
 
-@dataclass
+@dataclass(init=False)
 class Node:
     id: str
     type: NodeType
-    label: str = ""
-    ast_node: Any = None
-    description: str = ""  # Added for Chinese comments
-    metadata: Dict[str, Any] = field(default_factory=dict)
+    raw_label: Any  # str, or a source_text span label decoded on first read
+    ast_node: Any
+    description: str  # Added for Chinese comments
+    metadata: Dict[str, Any]
+
+    def __init__(
+        self,
+        id: str,
+        type: NodeType,
+        label: Any = "",
+        ast_node: Any = None,
+        description: str = "",
+        metadata: Optional[Dict[str, Any]] = None,
+    ):
+        # `label` may be a lazy span label; it is kept as is until first read
+        self.id = id
+        self.type = type
+        self.raw_label = label
+        self.ast_node = ast_node
+        self.description = description
+        self.metadata = {} if metadata is None else metadata
 
     def __hash__(self):
         return hash(self.id)
 
+    @property
+    def label(self) -> str:
+        if not isinstance(self.raw_label, str):
+            self.raw_label = self.raw_label.resolve()
+        return self.raw_label
+
+    @label.setter
+    def label(self, value: Any):
+        self.raw_label = value
+
 
 @dataclass
 class Edge:
@@ -45,6 +72,11 @@ class Edge:
     label: str = ""
 
 
+def call_key(label: str) -> str:
+    """Callee name of a CALL node label: "parse()" -> "parse"."""
+    return label.replace("()", "")
+
+
 # --- Graph Structure ---
 
 
@@ -69,7 +101,11 @@ class UniversalLogicGraph:
     ) -> Node:
         nid = self._gen_id(type.name.lower())
         node = Node(
-            id=nid, type=type, label=label, ast_node=ast_node, description=description
+            id=nid,
+            type=type,
+            label=label,
+            ast_node=ast_node,
+            description=description,
         )
         self.graph.add_node(nid, data=node)
         return node
@@ -86,6 +122,9 @@ class UniversalLogicGraph:
     def set_entry(self, node: Node):
         self.entry_node = node.id
 
+    def number_of_nodes(self) -> int:
+        return self.graph.number_of_nodes()
+
     def nodes(self):
         for nid in self.graph.nodes:
             yield self.get_node(nid)
@@ -94,6 +133,10 @@ class UniversalLogicGraph:
         for u, v, data in self.graph.edges(data=True):
             yield (self.get_node(u), self.get_node(v), data["type"], data["label"])
 
+    def out_edges(self, node):
+        for v, data in self.graph.adj[node.id].items():
+            yield node, self.get_node(v), data["type"], data["label"]
+
     def merge_graph(self, other_graph, prefix: str):
         """
         Merge another graph into this one, prefixing IDs to avoid collisions.
@@ -110,10 +153,11 @@ class UniversalLogicGraph:
             new_node = Node(
                 id=new_id,
                 type=node.type,
-                label=node.label,
+                # A lazy label stays lazy in the merged copy
+                label=node.raw_label if isinstance(node, Node) else node.label,
                 ast_node=node.ast_node,
                 description=node.description,
-                metadata=node.metadata.copy(),  # Shallow copy dict
+                metadata=dict(node.metadata),  # Shallow copy dict
             )
             # Tag with cluster info for Graphviz
             new_node.metadata["cluster"] = prefix
@@ -125,3 +169,63 @@ class UniversalLogicGraph:
             new_u_id = id_map[u.id]
             new_v_id = id_map[v.id]
             self.graph.add_edge(new_u_id, new_v_id, type=type, label=label)
+
+    def to_compact(self) -> tuple:
+        """
+        Picklable snapshot of the graph (no live tree-sitter nodes).
+        Node and edge order is preserved so a round-trip renders identically.
+        """
+        nodes = [
+            (n.id, n.type.value, n.label, n.description, n.metadata)
+            for n in self.nodes()
+        ]
+        edges = [
+            (u, v, data["type"].value, data["label"])
+            for u, v, data in self.graph.edges(data=True)
+        ]
+        return (self.name, self.entry_node, self._counter, nodes, edges)
+
+    @classmethod
+    def from_compact(cls, data: tuple) -> "UniversalLogicGraph":
+        name, entry_node, counter, nodes, edges = data
+        ulg = cls(name)
+        ulg.entry_node = entry_node
+        ulg._counter = counter
+        for nid, type_value, label, description, metadata in nodes:
+            node = Node(
+                id=nid,
+                type=NodeType(type_value),
+                label=label,
+                description=description,
+                metadata=metadata,
+            )
+            ulg.graph.add_node(nid, data=node)
+        for u, v, type_value, label in edges:
+            ulg.graph.add_edge(u, v, type=EdgeType(type_value), label=label)
+        return ulg
+
+
+# --- Backend selection ---
+
+BACKENDS = ("networkx", "compact")
+_backend = "networkx"
+
+
+def set_backend(name: str):
+    """Select the graph class used by builders, pipelines and loaders."""
+    global _backend
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown IR backend: {name}")
+    _backend = name
+
+
+def graph_class():
+    if _backend == "compact":
+        from ir_compact import CompactLogicGraph
+
+        return CompactLogicGraph
+    return UniversalLogicGraph
+
+
+def new_graph(name: str):
+    return graph_class()(name)
@@ -0,0 +1,207 @@
+from collections import ChainMap
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+from ir_graph import new_graph
+
+
+class ViewNode:
+    """
+    A child's node seen through a `GraphView`. The prefixed ID and the
+    `cluster` tag are computed on access; nothing is copied. Its metadata
+    is read-only (writes would be lost): annotate the child graph's nodes,
+    or flatten the view into a concrete graph first.
+    """
+
+    __slots__ = ("_child", "_prefix", "_inner")
+
+    def __init__(self, child, prefix: str, inner):
+        self._child = child
+        self._prefix = prefix
+        self._inner = inner
+
+    @property
+    def id(self) -> str:
+        return f"{self._prefix}_{self._inner.id}"
+
+    @property
+    def type(self):
+        return self._inner.type
+
+    @property
+    def label(self) -> str:
+        return self._inner.label
+
+    @property
+    def description(self) -> str:
+        return self._inner.description
+
+    @property
+    def ast_node(self):
+        return self._inner.ast_node
+
+    @property
+    def metadata(self):
+        # The outermost merge sets the cluster, as before; writing raises
+        # TypeError instead of landing in a throwaway overlay
+        return MappingProxyType(
+            ChainMap({"cluster": self._prefix}, self._inner.metadata)
+        )
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, ViewNode)
+            and other._prefix == self._prefix
+            and (other._inner is self._inner or other._inner == self._inner)
+        )
+
+    def __hash__(self):
+        return hash((self._prefix, self._inner))
+
+    def __repr__(self):
+        return f"ViewNode({self.id!r})"
+
+
+class GraphView:
+    """
+    Hierarchical ULG. `merge_graph` attaches the child by reference under
+    its prefix; renderers and cross-linking iterate the composed graph
+    without a duplicate of every node. Edges added on the view itself
+    (atlas LINKs) live in an overlay and are emitted right after their
+    source's own out-edges, which is where a DiGraph would put them.
+
+    If a merge could make two IDs coincide (e.g. two functions with the
+    same name in one file), the view falls back to a copying merge into a
+    concrete graph so DiGraph overwrite semantics are kept.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.entry_node: Optional[str] = None
+        self._children: List[Tuple[str, object]] = []
+        self._by_prefix: Dict[str, object] = {}
+        # "a" -> ["a_b", "a_b_c"]: prefixes that extend another one
+        self._extensions: Dict[str, List[str]] = {}
+        self._links: Dict[ViewNode, Dict[ViewNode, tuple]] = {}
+        self._flat = None
+
+    # --- Composition ---
+
+    def merge_graph(self, other_graph, prefix: str):
+        if self._flat is None and self._may_collide(other_graph, prefix):
+            self._flatten()
+        if self._flat is not None:
+            self._flat.merge_graph(other_graph, prefix)
+            return
+
+        self._children.append((prefix, other_graph))
+        self._by_prefix[prefix] = other_graph
+        for i, ch in enumerate(prefix):
+            if ch == "_":
+                self._extensions.setdefault(prefix[:i], []).append(prefix)
+
+    def _may_collide(self, other_graph, prefix: str) -> bool:
+        """True if some `prefix_<id>` of `other_graph` is already an ID here."""
+        candidates = []
+        if prefix in self._by_prefix:
+            candidates.append(prefix)
+        candidates.extend(self._extensions.get(prefix, ()))
+        for i, ch in enumerate(prefix):
+            if ch == "_" and prefix[:i] in self._by_prefix:
+                candidates.append(prefix[:i])
+        if not candidates:
+            return False
+
+        mine = {f"{prefix}_{n.id}" for n in other_graph.nodes()}
+        for q in candidates:
+            if any(f"{q}_{n.id}" in mine for n in self._by_prefix[q].nodes()):
+                return True
+        return False
+
+    def _flatten(self):
+        flat = new_graph(self.name)
+        flat.entry_node = self.entry_node
+        for prefix, child in self._children:
+            flat.merge_graph(child, prefix)
+        for u, targets in self._links.items():
+            for v, (type, label) in targets.items():
+                flat.add_edge(flat.get_node(u.id), flat.get_node(v.id), type, label)
+        self._flat = flat
+        self._children, self._by_prefix, self._extensions = [], {}, {}
+        self._links = {}
+
+    # --- UniversalLogicGraph API ---
+
+    def add_edge(self, source, target, type, label: str = ""):
+        if self._flat is not None:
+            self._flat.add_edge(source, target, type, label)
+            return
+        self._links.setdefault(source, {})[target] = (type, label)
+
+    def get_node(self, nid: str):
+        if self._flat is not None:
+            return self._flat.get_node(nid)
+        for i, ch in enumerate(nid):
+            if ch != "_":
+                continue
+            child = self._by_prefix.get(nid[:i])
+            if child is None:
+                continue
+            try:
+                return ViewNode(child, nid[:i], child.get_node(nid[i + 1 :]))
+            except KeyError:
+                pass
+        raise KeyError(nid)
+
+    def set_entry(self, node):
+        self.entry_node = node.id
+
+    def number_of_nodes(self) -> int:
+        if self._flat is not None:
+            return self._flat.number_of_nodes()
+        return sum(child.number_of_nodes() for _, child in self._children)
+
+    def nodes(self):
+        if self._flat is not None:
+            yield from self._flat.nodes()
+            return
+        for prefix, child in self._children:
+            for inner in child.nodes():
+                yield ViewNode(child, prefix, inner)
+
+    def edges(self):
+        if self._flat is not None:
+            yield from self._flat.edges()
+            return
+        linked = {u._prefix for u in self._links}
+        for prefix, child in self._children:
+            if prefix in linked:
+                for inner in child.nodes():
+                    yield from self.out_edges(ViewNode(child, prefix, inner))
+                continue
+            for u, v, type, label in child.edges():
+                u, v = ViewNode(child, prefix, u), ViewNode(child, prefix, v)
+                yield u, v, type, label
+
+    def out_edges(self, node):
+        if self._flat is not None:
+            yield from self._flat.out_edges(node)
+            return
+        child, prefix = node._child, node._prefix
+        pending = dict(self._links.get(node, {}))
+        for _, v, type, label in child.out_edges(node._inner):
+            v = ViewNode(child, prefix, v)
+            if pending and v in pending:
+                # Re-adding an existing edge only updates its attributes
+                type, label = pending.pop(v)
+            yield node, v, type, label
+        for v, (type, label) in pending.items():
+            yield node, v, type, label
+
+    def to_compact(self) -> tuple:
+        nodes = [
+            (n.id, n.type.value, n.label, n.description, dict(n.metadata))
+            for n in self.nodes()
+        ]
+        edges = [(u.id, v.id, t.value, label) for u, v, t, label in self.edges()]
+        return (self.name, self.entry_node, 0, nodes, edges)
@@ -0,0 +1,172 @@
+import re
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+from parallel_index import resolve_jobs
+from profiler import phase
+
+try:  # In-process Graphviz (libgvc) when the bindings are installed
+    import pygraphviz
+except ImportError:
+    pygraphviz = None
+
+# DOT documents per `dot` process
+BATCH_SIZE = 16
+
+# `dot -Tsvg a.dot b.dot` prints one XML document per input graph
+_SVG_START = re.compile(rb"(?=<\?xml )")
+
+
+class LayoutResult(NamedTuple):
+    dot_path: str
+    svg_path: str
+    status: str  # ok | timeout | failed | no-graphviz
+    seconds: float
+
+
+def layout_file(dot_path: str, svg_path: str, timeout: Optional[float] = None):
+    """Run one Graphviz layout. Returns (status, wall seconds)."""
+    start = time.perf_counter()
+    try:
+        with phase("layout", file=dot_path):
+            subprocess.run(
+                ["dot", "-Tsvg", dot_path, "-o", svg_path],
+                check=True,
+                timeout=timeout,
+                stderr=subprocess.DEVNULL,
+            )
+        status = "ok"
+    except subprocess.TimeoutExpired:
+        status = "timeout"
+    except FileNotFoundError:
+        status = "no-graphviz"
+    except subprocess.CalledProcessError:
+        status = "failed"
+    return status, time.perf_counter() - start
+
+
+def layout_batch(batch, timeout: Optional[float] = None) -> List[LayoutResult]:
+    """
+    Lay out several (dot_path, svg_path) pairs with a single `dot` process,
+    splitting its stdout into one SVG per input. `timeout` is per file, so
+    the process gets `timeout * len(batch)`. If it fails or times out, the
+    SVGs can no longer all be matched to inputs: the documents completed
+    before that are kept and only the remaining files are redone one by one.
+    """
+    if len(batch) == 1:
+        return [LayoutResult(*batch[0], *layout_file(*batch[0], timeout))]
+
+    start = time.perf_counter()
+    try:
+        with phase("layout", files=len(batch)):
+            proc = subprocess.run(
+                ["dot", "-Tsvg", *(dot_path for dot_path, _ in batch)],
+                check=True,
+                capture_output=True,
+                timeout=timeout * len(batch) if timeout else timeout,
+            )
+        docs = [doc for doc in _SVG_START.split(proc.stdout) if doc]
+        if len(docs) != len(batch):
+            docs = []
+    except FileNotFoundError:
+        return [LayoutResult(d, s, "no-graphviz", 0.0) for d, s in batch]
+    except subprocess.TimeoutExpired as e:
+        # Inputs are laid out in order; a document followed by the next
+        # one's XML header is complete
+        docs = [doc for doc in _SVG_START.split(e.stdout or b"") if doc][:-1]
+    except subprocess.CalledProcessError:
+        docs = []
+
+    done = batch[: len(docs)]
+    for (_, svg_path), doc in zip(done, docs):
+        with open(svg_path, "wb") as f:
+            f.write(doc)
+    share = (time.perf_counter() - start) / max(1, len(done))
+    results = [LayoutResult(d, s, "ok", share) for d, s in done]
+    for d, s in batch[len(done) :]:
+        results.append(LayoutResult(d, s, *layout_file(d, s, timeout)))
+    return results
+
+
+def layout_in_process(dot_path: str, svg_path: str) -> LayoutResult:
+    """libgvc layout; it cannot be interrupted, so there is no timeout."""
+    start = time.perf_counter()
+    try:
+        with phase("layout", file=dot_path):
+            pygraphviz.AGraph(dot_path).draw(svg_path, prog="dot")
+        status = "ok"
+    except Exception:
+        status = "failed"
+    return LayoutResult(dot_path, svg_path, status, time.perf_counter() - start)
+
+
+def report(result: LayoutResult):
+    """Per-file messages of the synchronous path in output_writer."""
+    if result.status == "ok":
+        print(f"[+] Generated Visualization: {result.svg_path}")
+    elif result.status == "no-graphviz":
+        print(
+            f"[!] Graphviz 'dot' command not found. Saved .dot file only: {result.dot_path}"
+        )
+    else:
+        print(f"[!] Graphviz generation failed ({result.status}): {result.dot_path}")
+
+
+class LayoutService:
+    """
+    Turns DOT files into SVGs in the background so the caller keeps
+    building CFGs meanwhile. Files are queued and handed to a bounded
+    thread pool in batches, one `dot` process per batch. With pygraphviz
+    installed layouts run in-process instead, on a single thread since
+    libgvc is not thread-safe; `timeout` then does not apply.
+    """
+
+    def __init__(
+        self,
+        jobs: int = 0,
+        batch_size: int = BATCH_SIZE,
+        timeout: Optional[float] = None,
+        on_done=report,
+    ):
+        self.in_process = pygraphviz is not None
+        self.workers = 1 if self.in_process else resolve_jobs(jobs)
+        self.batch_size = max(1, batch_size)
+        self.timeout = timeout
+        self.on_done = on_done
+        self.pool = ThreadPoolExecutor(max_workers=self.workers)
+        self.pending = []
+        self.futures = []
+
+    def submit(self, dot_path: str, svg_path: str):
+        self.pending.append((dot_path, svg_path))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if self.pending:
+            self.futures.append(self.pool.submit(self._run, self.pending))
+            self.pending = []
+
+    def _run(self, batch) -> List[LayoutResult]:
+        if self.in_process:
+            results = [layout_in_process(d, s) for d, s in batch]
+        else:
+            results = layout_batch(batch, self.timeout)
+        if self.on_done:
+            for result in results:
+                self.on_done(result)
+        return results
+
+    def close(self) -> List[LayoutResult]:
+        """Flush the queue and wait for every layout; results in submit order."""
+        self.flush()
+        self.pool.shutdown(wait=True)
+        return [r for future in self.futures for r in future.result()]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
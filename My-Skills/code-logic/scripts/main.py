@@ -1,11 +1,9 @@
 import argparse
 import sys
 import os
-from ast_engine import ASTEngine
-from cfg_rust_core import RustCFGBuilder
-from cfg_python_core import PythonCFGBuilder
+import time
+from parser_registry import engine_stats
 from renderer_dot import DotRenderer
-from renderer_dsl import DSLRenderer
 
 
 from config_loader import ConfigLoader
@@ -33,10 +31,28 @@ def main():
 
 
 from symbol_table import SymbolTable
-from ir_graph import UniversalLogicGraph, EdgeType, Node, NodeType
+from ir_graph import BACKENDS, EdgeType, NodeType, call_key, set_backend
+from ir_view import GraphView
+from parallel_index import index_files, resolve_jobs
+from file_batch import REPORT_NAME, run_files, write_report
+from atlas_shards import SHARD_MODES, render_shards
+from atlas_store import STORE_NAME, write_store
+from atlas_query import query_main
+from ir_condense import LOD_LEVELS, function_level
+from ir_binary import IR_SUFFIX, load as load_ir, save as save_ir
+from layout_service import LayoutService
+from render_manifest import OUTPUT_DIRNAME, RenderManifest
+from cfg_cache import CACHE_DIRNAME
+from watch_mode import watch_file
+from output_writer import condensed, logic_output_dir, write_logic_outputs
+import profiler
 
 
 def main():
+    # `main.py query <db> ...` answers questions from a stored atlas
+    if len(sys.argv) > 1 and sys.argv[1] == "query":
+        sys.exit(query_main(sys.argv[2:]))
+
     # Load Config (Singleton)
     config = ConfigLoader("logic_config.yaml")
     parser = argparse.ArgumentParser(
@@ -58,8 +74,126 @@ def main():
     parser.add_argument(
         "--unified", action="store_true", help="Generate a unified project graph"
     )
+    parser.add_argument(
+        "--all-functions",
+        action="store_true",
+        help="Analyze every function of each file (one parse, one .lisp and one clustered .dot)",
+    )
+    parser.add_argument(
+        "--split-functions",
+        action="store_true",
+        help="With --all-functions, also lay out one SVG per function in parallel",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for indexing or per-file mode (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--report",
+        default=None,
+        help=f"JSON run report of per-file mode (default for directories: {REPORT_NAME} next to the manifest)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rebuild every CFG instead of reusing the cache in the output directory",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Watch a single file and re-render the functions changed on each save",
+    )
+    parser.add_argument(
+        "--shard",
+        choices=SHARD_MODES,
+        default=None,
+        help="Split the atlas into per-cluster or per-LINK-component SVGs plus an index",
+    )
+    parser.add_argument(
+        "--render-jobs",
+        type=int,
+        default=0,
+        help="Concurrent Graphviz layouts, atlas shards or per-file SVGs (0 = one per CPU core)",
+    )
+    parser.add_argument(
+        "--layout-timeout",
+        type=float,
+        default=600,
+        help="Seconds before a single Graphviz layout is abandoned (not applied to in-process pygraphviz layouts)",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rewrite and re-layout every output, even if unchanged since the last run",
+    )
+    parser.add_argument(
+        "--store",
+        action="store_true",
+        help="With --unified, also save the atlas to <svg-dir>/project_atlas.db for `main.py query`",
+    )
+    parser.add_argument(
+        "--condense",
+        action="store_true",
+        help="Simplify graphs before DOT layout: merge straight-line blocks, "
+        "turn VIRTUAL anchors into edge labels, skip single-entry JOINs",
+    )
+    parser.add_argument(
+        "--lod",
+        choices=LOD_LEVELS,
+        default="full",
+        help="Atlas level of detail: every CFG node, or one node per function",
+    )
+    parser.add_argument(
+        "--save-ir",
+        action="store_true",
+        help="Also save the graph as a binary .ulg (project_atlas.ulg / <file>.logic.ulg)",
+    )
+    parser.add_argument(
+        "--from-ir",
+        action="store_true",
+        help="Input is a saved .ulg: render it (and --store it) without parsing source",
+    )
+    parser.add_argument(
+        "--ir-backend",
+        choices=BACKENDS,
+        default="networkx",
+        help="Graph storage: NetworkX objects or compact struct-of-arrays rows",
+    )
+    parser.add_argument(
+        "--engine-stats",
+        action="store_true",
+        help="Report tree-sitter import, grammar loading and parsing time (main process)",
+    )
+    parser.add_argument(
+        "--profile",
+        default=None,
+        metavar="PATH",
+        help="Write per-phase wall/CPU timings, per-file graph sizes and peak RSS "
+        "as JSON (a Chrome trace, workers included)",
+    )
+    parser.add_argument(
+        "--cprofile",
+        default="",
+        metavar="PHASES",
+        help=f"With --profile, also cProfile these phases into <PATH stem>.<phase>.prof "
+        f"(comma-separated: {', '.join(profiler.PHASES)})",
+    )
 
     args = parser.parse_args()
+    run_start = time.perf_counter()
+
+    cprofile_phases = [name for name in args.cprofile.split(",") if name]
+    unknown = sorted(set(cprofile_phases) - set(profiler.PHASES))
+    if unknown:
+        parser.error(f"unknown --cprofile phase(s): {', '.join(unknown)}")
+    if cprofile_phases and not args.profile:
+        parser.error("--cprofile requires --profile")
+    if args.profile:
+        profiler.enable(cprofile_phases)
+
+    set_backend(args.ir_backend)
 
     # Reload config if custom path provided
     if args.config != "logic_config.yaml":
@@ -71,6 +205,18 @@ def main():
         print(f"Error: Path not found: {input_path}")
         sys.exit(1)
 
+    if args.from_ir:
+        render_from_ir(input_path, args)
+        write_profile(args, run_start)
+        return
+
+    if args.watch:
+        if os.path.isdir(input_path):
+            print("[!] --watch expects a single source file.")
+            sys.exit(1)
+        watch_file(input_path, args, config)
+        return
+
     targets = []
     if os.path.isdir(input_path):
         # Recursive scan
@@ -84,307 +230,325 @@ def main():
         targets.append(input_path)
 
     # V1.3: Unified Atlas Mode
+    failed = False
     if args.unified and len(targets) > 1:
         run_unified_atlas(targets, args, config, input_path)
     else:
-        # Classic Mode (Per file)
-        for file_path in targets:
-            process_file(
-                file_path,
-                args,
-                config,
-                input_path if os.path.isdir(input_path) else None,
-            )
+        # Classic Mode (Per file): a failing file is reported, not fatal
+        project_root = input_path if os.path.isdir(input_path) else None
+        # Run bookkeeping stays with the outputs, never in the source tree
+        if args.svg_dir:
+            manifest_dir = args.svg_dir
+        elif project_root:
+            manifest_dir = os.path.join(project_root, OUTPUT_DIRNAME)
+        else:
+            manifest_dir = logic_output_dir(input_path)
+        manifest = RenderManifest(manifest_dir, enabled=not args.force)
+        start = time.perf_counter()
+        reports = []
+        try:
+            for report in run_files(
+                targets, args, config, project_root, manifest, manifest_dir
+            ):
+                reports.append(report)
+        finally:
+            manifest.save()
+            print(manifest.summary())
+            # Also when the run is cut short: the files finished so far
+            report_path = args.report
+            if report_path is None and project_root:
+                report_path = os.path.join(manifest_dir, REPORT_NAME)
+            if report_path:
+                counts = write_report(
+                    report_path,
+                    reports,
+                    resolve_jobs(args.jobs),
+                    time.perf_counter() - start,
+                )
+                print(
+                    f"[+] Run report saved to: {report_path} ({counts['ok']} ok, "
+                    f"{counts['skipped']} skipped, {counts['failed']} failed)"
+                )
+        failed = any(report.status == "failed" for report in reports)
 
+    if args.engine_stats:
+        print(engine_stats())
+    write_profile(args, run_start)
+    if failed:
+        sys.exit(1)
 
-def run_unified_atlas(targets, args, config, project_root):
-    print("[*] Starting Phase A: Symbol Indexing...")
-    symbol_table = SymbolTable()
-    graphs = {}  # Map file_path -> ULG
 
-    # Phase A & B Interleaved: Parse and Build Graphs
-    for file_path in targets:
-        try:
-            builder, tree = get_builder_for_file(file_path, config)
-            if not builder:
-                continue
+def write_profile(args, run_start):
+    """`--profile`: save the phase trace of this run (and any cProfile dumps)."""
+    if not args.profile:
+        return
+    events = profiler.write(args.profile, time.perf_counter() - run_start)
+    print(f"[+] Profile saved to: {args.profile} ({events} phase events)")
 
-            # 1. Find all functions in file
-            root = tree.root_node
-            lang = "rs" if file_path.endswith(".rs") else "py"
-            funcs = find_functions(root, lang)
 
-            file_graph = UniversalLogicGraph(os.path.basename(file_path))
+def file_prefix(file_path, project_root) -> str:
+    """Atlas ID prefix of a file: its path relative to the project, flattened."""
+    return (
+        os.path.relpath(file_path, project_root).replace(os.sep, "_").replace(".", "_")
+    )
 
-            # 2. Build each function and merge into file_graph
-            for fn_node in funcs:
-                with open(file_path, "rb") as f:
-                    code = f.read()
 
-                b_class = RustCFGBuilder if lang == "rs" else PythonCFGBuilder
-                sub_builder = b_class(code)
-                sub_builder.set_config_loader(config)
+def layout_graph(graph, args, functions=()):
+    """The graph to lay out under --lod / --condense; stores keep `graph`."""
+    if args.lod == "function":
+        with profiler.phase("condense", lod=args.lod):
+            graph = function_level(graph, functions)
+        print(f"[*] Function-level atlas: {graph.number_of_nodes()} nodes")
+        return graph
+    return condensed(graph) if args.condense else graph
+
+
+def atlas_functions(symbol_table, prefixes):
+    """(qualname, name, file_path, atlas entry ID) of every indexed function."""
+    return [
+        (
+            info.qualname or info.name,
+            info.name,
+            info.file_path,
+            f"{prefixes[info.file_path]}_{info.node_id}",
+        )
+        for infos in symbol_table.index.values()
+        for info in infos
+    ]
 
-                fn_graph = sub_builder.build_from_function(fn_node)
 
-                if not fn_graph.entry_node:
-                    continue
+def render_from_ir(ir_path, args):
+    """`--from-ir`: render (and optionally store) a saved .ulg; no parsing."""
+    start = time.perf_counter()
+    try:
+        graph, extras = load_ir(ir_path)
+    except (OSError, ValueError) as e:
+        print(f"[!] Cannot load IR: {e}")
+        sys.exit(1)
+    print(
+        f"[*] Loaded {ir_path}: {graph.number_of_nodes()} nodes "
+        f"in {(time.perf_counter() - start) * 1000:.1f} ms"
+    )
 
-                entry_node = fn_graph.get_node(fn_graph.entry_node)
-                fn_name_raw = entry_node.label.split(" ")[1]
-                fn_name = fn_name_raw.split("(")[0]
+    output_dir = args.svg_dir or os.path.dirname(ir_path)
+    os.makedirs(output_dir, exist_ok=True)
+    stem = os.path.basename(ir_path)
+    if stem.endswith(IR_SUFFIX):
+        stem = stem[: -len(IR_SUFFIX)]
+    if stem.endswith(".logic"):
+        stem = stem[: -len(".logic")]
+
+    if args.store:
+        store_path = os.path.join(output_dir, STORE_NAME)
+        write_store(
+            store_path, graph, extras.get("functions", ()), extras.get("clusters")
+        )
+        print(f"[+] Atlas store saved to: {store_path}")
 
-                file_graph.merge_graph(fn_graph, fn_name)
+    render_graph = layout_graph(graph, args, extras.get("functions", ()))
+    manifest = RenderManifest(output_dir, enabled=not args.force)
+    try:
+        if args.shard and args.format in ["svg", "both"]:
+            render_shards(
+                render_graph,
+                args.shard,
+                output_dir,
+                args.render_jobs,
+                args.layout_timeout,
+                manifest,
+            )
+        else:
+            with LayoutService(args.render_jobs, timeout=args.layout_timeout) as layout:
+                write_logic_outputs(
+                    graph,
+                    args.format,
+                    output_dir,
+                    stem,
+                    layout=layout,
+                    manifest=manifest,
+                    key=f"{os.path.abspath(ir_path)}#ir",
+                    dot_renderer=DotRenderer(render_graph),
+                )
+    finally:
+        manifest.save()
+    print(manifest.summary())
 
-                final_entry_id = f"{fn_name}_{entry_node.id}"
-                symbol_table.register(fn_name, file_path, final_entry_id)
 
-            graphs[file_path] = file_graph
+def run_unified_atlas(targets, args, config, project_root):
+    """Phases A-C and the atlas outputs. Returns node, link and call-site counts."""
+    output_dir = args.svg_dir if args.svg_dir else "atlas_output"
+    cache_dir = None if args.no_cache else os.path.join(output_dir, CACHE_DIRNAME)
+    timings = {}
 
-        except Exception as e:
-            print(f"[!] Failed to index {file_path}: {e}")
+    print("[*] Starting Phase A: Symbol Indexing...")
+    phase_start = time.perf_counter()
+    symbol_table = SymbolTable()
+    graphs = {}  # Map file_path -> ULG
+    # Prefix table: relpath surgery is done once per file, not per call site
+    prefixes = {}
+    # Call-site index emitted by the builders:
+    # callee -> [(file_path, call_id, caller qualname)]
+    call_index = {}
+    cache_hits = 0
+
+    # Phase A & B Interleaved: Parse once per file, build every function
+    for result in index_files(
+        targets, config, args.jobs, args.config, cache_dir, args.ir_backend
+    ):
+        if result.error:
+            print(f"[!] Failed to index {result.file_path}: {result.error}")
+            continue
+        if result.graph is None:
+            continue
+
+        cache_hits += result.cached
+        symbol_table.add_file(result.file_path, result.lang, result.imports)
+        for fn_name, qualname, entry_id in result.symbols:
+            symbol_table.register(
+                fn_name, result.file_path, entry_id, qualname=qualname
+            )
+        for callee, call_id, caller in result.calls:
+            call_index.setdefault(callee, []).append(
+                (result.file_path, call_id, caller)
+            )
+        graphs[result.file_path] = result.graph
+        prefixes[result.file_path] = file_prefix(result.file_path, project_root)
+    timings["A"] = time.perf_counter() - phase_start
 
-    print("[*] Starting Phase B: Graph Fusion...")
-    unified_graph = UniversalLogicGraph("ProjectAtlas")
-
-    for file_path, file_graph in graphs.items():
-        # Prefix with relative path to avoid "main.rs" vs "other/main.rs" collision
-        rel_path = (
-            os.path.relpath(file_path, project_root)
-            .replace(os.sep, "_")
-            .replace(".", "_")
+    if cache_dir:
+        print(
+            f"[*] CFG cache: {cache_hits}/{len(graphs)} files reused from {cache_dir}"
         )
-        unified_graph.merge_graph(file_graph, rel_path)
-
-        # Update Symbol Table mapping to reflect the double prefix?
-        # Wait, merge_graph prefixes IDs.
-        # file_graph IDs were "func_id".
-        # unified_graph IDs will be "rel_path_func_id".
-        # We need to re-index or just calculate it?
-        # Let's re-index? No, we can just update the symbol table logic.
-        # Ideally, we should have built the symbol table *after* fusion?
-        # Or, we update the symbol table entries now.
-        pass
+
+    print("[*] Starting Phase B: Graph Fusion...")
+    phase_start = time.perf_counter()
+    # Files are attached by reference; IDs are prefixed lazily on access
+    unified_graph = GraphView("ProjectAtlas")
+
+    with profiler.phase("merge", files=len(graphs)):
+        for file_path, file_graph in graphs.items():
+            # Prefix with relative path to avoid "main.rs" vs "other/main.rs" collision
+            unified_graph.merge_graph(file_graph, prefixes[file_path])
+    timings["B"] = time.perf_counter() - phase_start
 
     print("[*] Starting Phase C: Cross-Linking...")
-    # Iterate all CALL nodes in unified_graph
+    phase_start = time.perf_counter()
+    # Join the call-site index with the symbol table; each site resolves
+    # through its own file's module and imports
     link_count = 0
-    for node in unified_graph.nodes():
-        if node.type == NodeType.CALL:
-            # Extract name "foo()" -> "foo"
-            call_name = node.label.replace("()", "")
-
-            # Lookup
-            target_info = symbol_table.resolve(call_name)
-            if target_info:
-                # We need the final ID of the target in the unified graph.
-                # target_info stored "func_id" (from file graph phase).
-                # We need "file_prefix_func_id".
-
-                # Reconstruct target ID
-                # This requires us to know which file the target came from.
-                # SymbolInfo has file_path.
-                target_rel = (
-                    os.path.relpath(target_info.file_path, project_root)
-                    .replace(os.sep, "_")
-                    .replace(".", "_")
-                )
-                final_target_id = f"{target_rel}_{target_info.node_id}"
-
-                # Add LINK edge
-                # Check if target node exists (it should)
+    call_count = 0
+    targets = {}  # target node ID -> node (None if absent)
+    with profiler.phase("link", call_sites=sum(map(len, call_index.values()))):
+        for callee, sites in call_index.items():
+            call_count += len(sites)
+            for file_path, call_id, caller in sites:
+                target_info = symbol_table.resolve_call(callee, file_path, caller)
+                if not target_info:
+                    continue
+                target_id = f"{prefixes[target_info.file_path]}_{target_info.node_id}"
+                if target_id not in targets:
+                    try:
+                        targets[target_id] = unified_graph.get_node(target_id)
+                    except KeyError:
+                        targets[target_id] = None
+                target_node = targets[target_id]
+                if target_node is None:
+                    continue
                 try:
-                    target_node = unified_graph.get_node(final_target_id)
-                    unified_graph.add_edge(node, target_node, EdgeType.LINK, "calls")
-                    link_count += 1
-                except:
-                    pass  # Node missing?
+                    node = unified_graph.get_node(f"{prefixes[file_path]}_{call_id}")
+                except KeyError:
+                    continue
+                # A same-named function merged later may have overwritten the ID
+                if node.type != NodeType.CALL or call_key(node.label) != callee:
+                    continue
+                unified_graph.add_edge(node, target_node, EdgeType.LINK, "calls")
+                link_count += 1
+    timings["C"] = time.perf_counter() - phase_start
 
     print(
-        f"[*] Atlas Generated: {len(unified_graph.graph.nodes)} nodes, {link_count} cross-links."
+        f"[*] Atlas Generated: {unified_graph.number_of_nodes()} nodes, {link_count} cross-links."
     )
+    print(f"[*] Call sites: {call_count} indexed, {len(call_index)} distinct callees")
 
     # Render
-    output_dir = args.svg_dir if args.svg_dir else "atlas_output"
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
     base_name = "project_atlas"
 
-    if args.format in ["svg", "both"]:
-        dot_out = DotRenderer(unified_graph).render()
+    functions = ()
+    if args.store or args.save_ir or args.lod == "function":
+        functions = atlas_functions(symbol_table, prefixes)
+    if args.store or args.save_ir:
+        phase_start = time.perf_counter()
+        clusters = {prefix: path for path, prefix in prefixes.items()}
+        if args.save_ir:
+            ir_path = os.path.join(output_dir, f"{base_name}{IR_SUFFIX}")
+            extras = {"functions": functions, "clusters": clusters}
+            with profiler.phase("store", file=ir_path):
+                save_ir(ir_path, unified_graph, extras)
+            print(f"[+] Atlas IR saved to: {ir_path}")
+        if args.store:
+            store_path = os.path.join(output_dir, STORE_NAME)
+            with profiler.phase("store", file=store_path):
+                n_nodes, n_edges, n_functions = write_store(
+                    store_path, unified_graph, functions, clusters
+                )
+            print(
+                f"[+] Atlas store saved to: {store_path} "
+                f"({n_nodes} nodes, {n_edges} edges, {n_functions} functions)"
+            )
+        timings["store"] = time.perf_counter() - phase_start
+
+    phase_start = time.perf_counter()
+    render_graph = layout_graph(unified_graph, args, functions)
+    manifest = RenderManifest(output_dir, enabled=not args.force)
+    if args.shard and args.format in ["svg", "both"]:
+        render_shards(
+            render_graph,
+            args.shard,
+            output_dir,
+            args.render_jobs,
+            args.layout_timeout,
+            manifest,
+        )
+    elif args.format in ["svg", "both"]:
         dot_path = os.path.join(output_dir, f"{base_name}.dot")
         svg_path = os.path.join(output_dir, f"{base_name}.svg")
 
-        with open(dot_path, "w", encoding="utf-8") as f:
-            f.write(dot_out)
-
-        try:
-            import subprocess
-
-            # Use fdp or sfdp for large disconnected graphs? Or dot is fine with clusters?
-            # dot is best for hierarchical.
-            subprocess.run(["dot", "-Tsvg", dot_path, "-o", svg_path], check=True)
-            print(f"[+] Atlas SVG saved to: {svg_path}")
-        except Exception as e:
-            print(f"[!] Graphviz failed: {e}")
-
-
-def get_builder_for_file(file_path, config):
-    try:
-        engine = ASTEngine()
-        tree, code_bytes = engine.parse_file(file_path)
-        ext = file_path.split(".")[-1].lower()
-        if ext == "rs":
-            return RustCFGBuilder(code_bytes), tree
-        if ext == "py":
-            return PythonCFGBuilder(code_bytes), tree
-        return None, None
-    except:
-        return None, None
-
-
-def find_functions(node, lang_type):
-    funcs = []
-    if lang_type == "rs" and node.type == "function_item":
-        funcs.append(node)
-    elif lang_type == "py" and node.type == "function_definition":
-        funcs.append(node)
-
-    if hasattr(node, "children"):
-        for child in node.children:
-            funcs.extend(find_functions(child, lang_type))
-    return funcs
-
-
-def process_file(file_path, args, config, project_root):
-    print(f"[*] Analyzing {file_path}...")
-
-    # 1. Parse AST
-    try:
-        engine = ASTEngine()
-        tree, code_bytes = engine.parse_file(file_path)
-    except Exception as e:
-        print(f"[!] AST Parsing Failed: {e}")
-        print(
-            "    Ensure tree-sitter, tree-sitter-rust, and tree-sitter-python are installed."
-        )
-        sys.exit(1)
-
-    # 2. Build CFG
-    # Find the target function or use the first one for now
-    # TODO: Handle multiple functions / file-level module analysis
-    target_node = None
-    root = tree.root_node
-
-    functions = []
-
-    # Dispatch based on extension for CFG Builder
-    ext = file_path.split(".")[-1].lower()
-
-    # Search for functions (recursively for methods)
-    def find_functions(node, lang_type):
-        funcs = []
-        # Check current node
-        if lang_type == "rs" and node.type == "function_item":
-            funcs.append(node)
-        elif lang_type == "py" and node.type == "function_definition":
-            funcs.append(node)
-
-        # Recurse
-        if hasattr(node, "children"):
-            for child in node.children:
-                funcs.extend(find_functions(child, lang_type))
-        return funcs
-
-    builder = None
-    if ext == "rs":
-        builder = RustCFGBuilder(code_bytes)
-        functions = find_functions(root, "rs")
-    elif ext == "py":
-        builder = PythonCFGBuilder(code_bytes)
-        functions = find_functions(root, "py")
-    else:
-        print(f"[!] Unsupported extension for CFG building: {ext}")
-        sys.exit(1)
-
-    # Inject config loader into builder if supported
-    if hasattr(builder, "set_config_loader"):
-        builder.set_config_loader(config)
-
-    if not functions:
-        print("[!] No functions found in file.")
-        sys.exit(0)
-
-    # Select function
-    if args.focus:
-        for fn in functions:
-            name_node = fn.child_by_field_name("name")
-            name = code_bytes[name_node.start_byte : name_node.end_byte].decode("utf-8")
-            if name == args.focus:
-                target_node = fn
-                break
-        if not target_node:
-            print(f"[!] Function '{args.focus}' not found.")
-            sys.exit(1)
-    else:
-        # Default to first function for Prototype v1
-        print(f"[*] No focus specified, analyzing first function found.")
-        target_node = functions[0]
-
-    ulg = builder.build_from_function(target_node)
-
-    # 3. Render Outputs
-    base_name = os.path.splitext(file_path)[0]
-    filename = os.path.basename(base_name)
-    output_dir = f"{base_name}_logic"
-
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
-    if args.format in ["dsl", "both"]:
-        dsl_out = DSLRenderer(ulg).render()
-        dsl_path = os.path.join(output_dir, f"{filename}.logic.lisp")
-        with open(dsl_path, "w", encoding="utf-8") as f:
-            f.write(dsl_out)
-        print(f"[+] Generated Logic DSL: {dsl_path}")
-
-    if args.format in ["svg", "both"]:
-        dot_out = DotRenderer(ulg).render()
-        dot_path = os.path.join(output_dir, f"{filename}.logic.dot")
-
-        # Determine SVG path
-        if args.svg_dir:
-            # If project root is set, mirror structure
-            if project_root:
-                rel_path = os.path.relpath(os.path.dirname(file_path), project_root)
-                target_svg_dir = os.path.join(args.svg_dir, rel_path)
-            else:
-                target_svg_dir = args.svg_dir
-
-            if not os.path.exists(target_svg_dir):
-                os.makedirs(target_svg_dir)
-            svg_path = os.path.join(target_svg_dir, f"{filename}.logic.svg")
+        # Streamed: the atlas document is never held in memory as one string
+        with profiler.phase("dot", file=dot_path):
+            written = manifest.write_artifact(
+                "atlas", DotRenderer(render_graph), dot_path, [svg_path]
+            )
+        if not written:
+            print(f"[=] Unchanged atlas: {svg_path}")
         else:
-            svg_path = os.path.join(output_dir, f"{filename}.logic.svg")
+            try:
+                import subprocess
+
+                # Use fdp or sfdp for large disconnected graphs? Or dot is fine with clusters?
+                # dot is best for hierarchical.
+                with profiler.phase("layout", file=dot_path):
+                    subprocess.run(
+                        ["dot", "-Tsvg", dot_path, "-o", svg_path], check=True
+                    )
+                print(f"[+] Atlas SVG saved to: {svg_path}")
+            except Exception as e:
+                print(f"[!] Graphviz failed: {e}")
+    manifest.save()
+    print(manifest.summary())
+    timings["render"] = time.perf_counter() - phase_start
 
-        with open(dot_path, "w", encoding="utf-8") as f:
-            f.write(dot_out)
-
-        # Try running dot
-        try:
-            import subprocess
-
-            subprocess.run(["dot", "-Tsvg", dot_path, "-o", svg_path], check=True)
-            print(f"[+] Generated Visualization: {svg_path}")
-            # Optional: remove dot file
-            # os.remove(dot_path)
-        except FileNotFoundError:
-            print(
-                f"[!] Graphviz 'dot' command not found. Saved .dot file only: {dot_path}"
-            )
-        except Exception as e:
-            print(f"[!] Graphviz generation failed: {e}")
+    print(
+        "[*] Phase timings: "
+        + ", ".join(f"{phase} {secs * 1000:.1f} ms" for phase, secs in timings.items())
+    )
+    return {
+        "nodes": unified_graph.number_of_nodes(),
+        "cross_links": link_count,
+        "call_sites": call_count,
+    }
 
 
 if __name__ == "__main__":
@@ -0,0 +1,183 @@
+import os
+import subprocess
+
+from discovery import function_keys
+from file_pipeline import function_prefixes
+from ir_condense import condense, format_timings
+from ir_view import GraphView
+from profiler import phase
+from renderer_dot import DotRenderer
+from renderer_dsl import DSLRenderer
+from render_manifest import RenderManifest
+
+
+def logic_output_dir(file_path: str) -> str:
+    """`src/foo.rs` -> `src/foo_logic`, the per-file artifact directory."""
+    return f"{os.path.splitext(file_path)[0]}_logic"
+
+
+def resolve_svg_dir(file_path, output_dir, svg_dir=None, project_root=None) -> str:
+    """SVGs go next to the DOT unless --svg-dir is set (mirrored per project)."""
+    if not svg_dir:
+        return output_dir
+    if project_root:
+        rel_path = os.path.relpath(os.path.dirname(file_path), project_root)
+        return os.path.join(svg_dir, rel_path)
+    return svg_dir
+
+
+def condensed(graph):
+    """`--condense`: the rewritten graph for layout, with per-pass timings."""
+    timings = []
+    with phase("condense", nodes=graph.number_of_nodes()):
+        result = condense(graph, timings=timings)
+    before, after = graph.number_of_nodes(), result.number_of_nodes()
+    print(format_timings(timings, before, after))
+    return result
+
+
+def write_logic_outputs(
+    ulg,
+    fmt,
+    output_dir,
+    stem,
+    svg_dir=None,
+    layout=None,
+    manifest=None,
+    key=None,
+    dot_renderer=None,
+):
+    """
+    Write `<stem>.logic.lisp`, `<stem>.logic.dot` and lay out the SVG,
+    in the background when a `LayoutService` is given. With a
+    `RenderManifest`, outputs whose text is unchanged under `key` are skipped.
+    """
+    manifest = manifest or RenderManifest(None)
+    key = key or os.path.join(output_dir, stem)
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    if fmt in ["dsl", "both"]:
+        dsl_path = os.path.join(output_dir, f"{stem}.logic.lisp")
+        with phase("dsl", file=dsl_path):
+            written = manifest.write_artifact(f"{key}:dsl", DSLRenderer(ulg), dsl_path)
+        if written:
+            print(f"[+] Generated Logic DSL: {dsl_path}")
+        else:
+            print(f"[=] Unchanged Logic DSL: {dsl_path}")
+
+    if fmt in ["svg", "both"]:
+        dot_path = os.path.join(output_dir, f"{stem}.logic.dot")
+
+        svg_dir = svg_dir or output_dir
+        if not os.path.exists(svg_dir):
+            os.makedirs(svg_dir)
+        svg_path = os.path.join(svg_dir, f"{stem}.logic.svg")
+
+        dot_renderer = dot_renderer or DotRenderer(ulg)
+        with phase("dot", file=dot_path):
+            written = manifest.write_artifact(
+                f"{key}:dot", dot_renderer, dot_path, [svg_path]
+            )
+        if not written:
+            print(f"[=] Unchanged Visualization: {svg_path}")
+            return
+
+        if layout is not None:
+            layout.submit(dot_path, svg_path)
+            return
+
+        # Try running dot
+        try:
+            with phase("layout", file=dot_path):
+                subprocess.run(["dot", "-Tsvg", dot_path, "-o", svg_path], check=True)
+            print(f"[+] Generated Visualization: {svg_path}")
+        except FileNotFoundError:
+            print(
+                f"[!] Graphviz 'dot' command not found. Saved .dot file only: {dot_path}"
+            )
+        except Exception as e:
+            print(f"[!] Graphviz generation failed: {e}")
+
+
+class FunctionBlocks:
+    """One `(flow-graph :name "<qualname>" ...)` block per function."""
+
+    def __init__(self, functions):
+        self.functions = functions
+
+    def write(self, sink):
+        for i, fn in enumerate(self.functions):
+            if i:
+                sink.write("\n\n")
+            DSLRenderer(fn.graph, name=fn.qualname or fn.name).write(sink)
+
+
+def write_function_outputs(
+    analysis,
+    fmt,
+    output_dir,
+    stem,
+    svg_dir=None,
+    layout=None,
+    manifest=None,
+    key=None,
+    split=False,
+    dot_transform=None,
+):
+    """
+    `--all-functions`: every function of one parsed file goes into a single
+    `<stem>.logic.lisp` (one block each) and a single `<stem>.logic.dot`
+    (one cluster each). With `split`, each function also gets its own
+    `<stem>.<fn>.logic.svg`, laid out concurrently when `layout` is set.
+    `dot_transform` rewrites graphs before DOT rendering (e.g. `--condense`).
+    """
+    dot_transform = dot_transform or (lambda graph: graph)
+    manifest = manifest or RenderManifest(None)
+    key = key or os.path.join(output_dir, stem)
+    keys = function_keys(analysis.functions)
+
+    file_graph = GraphView(os.path.basename(analysis.path))
+    labels = {}
+    for fn, prefix in zip(analysis.functions, function_prefixes(analysis.functions)):
+        file_graph.merge_graph(fn.graph, prefix)
+        labels[prefix] = fn.qualname or fn.name
+
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+    if fmt in ["dsl", "both"]:
+        dsl_path = os.path.join(output_dir, f"{stem}.logic.lisp")
+        with phase("dsl", file=dsl_path):
+            written = manifest.write_artifact(
+                f"{key}#*:dsl", FunctionBlocks(analysis.functions), dsl_path
+            )
+        if written:
+            print(f"[+] Generated Logic DSL ({len(keys)} functions): {dsl_path}")
+        else:
+            print(f"[=] Unchanged Logic DSL: {dsl_path}")
+
+    if fmt in ["svg", "both"]:
+        write_logic_outputs(
+            file_graph,
+            "svg",
+            output_dir,
+            stem,
+            svg_dir,
+            layout,
+            manifest,
+            f"{key}#*",
+            DotRenderer(dot_transform(file_graph), clusters=labels),
+        )
+        if split:
+            for fn, fn_key in zip(analysis.functions, keys):
+                write_logic_outputs(
+                    fn.graph,
+                    "svg",
+                    output_dir,
+                    f"{stem}.{fn_key}",
+                    svg_dir,
+                    layout,
+                    manifest,
+                    f"{key}#{fn_key}",
+                    DotRenderer(dot_transform(fn.graph)),
+                )
@@ -0,0 +1,121 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from ast_engine import get_engine
+from cfg_cache import CFGCache, analyze_file_cached
+from config_loader import ConfigLoader
+from file_pipeline import (
+    analyze_file,
+    build_file_graph,
+    file_call_sites,
+    file_symbols,
+)
+from ir_graph import UniversalLogicGraph, graph_class, set_backend
+import profiler
+
+
+class IndexResult(NamedTuple):
+    file_path: str
+    graph: Optional[UniversalLogicGraph]
+    symbols: List[Tuple[str, str, str]]  # [(fn_name, qualname, entry_id), ...]
+    error: Optional[str] = None
+    cached: bool = False
+    calls: Tuple[Tuple[str, str, str], ...] = ()  # ((callee, call_id, caller), ...)
+    lang: str = ""
+    imports: Tuple[Tuple[str, str], ...] = ()  # ((local name, path), ...)
+    trace: Optional[tuple] = None  # worker `profiler.take()`, merged by the parent
+
+
+# Per-worker state, created once by _init_worker
+_worker_config = None
+_worker_engine = None
+_worker_cache = None
+
+
+def resolve_jobs(jobs: int) -> int:
+    """`--jobs 0` means one worker per core."""
+    return jobs if jobs > 0 else (os.cpu_count() or 1)
+
+
+def _index_one(file_path, config, engine, cache=None) -> IndexResult:
+    try:
+        cached = False
+        if cache:
+            analysis, cached = analyze_file_cached(file_path, config, engine, cache)
+        else:
+            analysis = analyze_file(file_path, config, engine)
+        if not analysis:
+            return IndexResult(file_path, None, [])
+        graph = build_file_graph(analysis)
+        if profiler.enabled():
+            profiler.record_file(
+                file_path,
+                len(analysis.functions),
+                graph.number_of_nodes(),
+                sum(1 for _ in graph.edges()),
+            )
+        return IndexResult(
+            file_path,
+            graph,
+            file_symbols(analysis),
+            cached=cached,
+            calls=tuple(file_call_sites(analysis)),
+            lang=analysis.lang,
+            imports=analysis.imports,
+        )
+    except Exception as e:
+        return IndexResult(file_path, None, [], str(e))
+
+
+def _init_worker(config_path, cache_dir, ir_backend, profile):
+    global _worker_config, _worker_engine, _worker_cache
+    set_backend(ir_backend)
+    profiler.configure(profile)
+    _worker_config = ConfigLoader(config_path)
+    _worker_engine = get_engine()
+    _worker_cache = CFGCache(cache_dir, _worker_config) if cache_dir else None
+
+
+def _index_in_worker(file_path):
+    result = _index_one(file_path, _worker_config, _worker_engine, _worker_cache)
+    # Live tree-sitter nodes cannot cross the process boundary
+    compact = result.graph.to_compact() if result.graph else None
+    return result._replace(graph=compact, trace=profiler.take())
+
+
+def index_files(
+    targets,
+    config,
+    jobs=1,
+    config_path="logic_config.yaml",
+    cache_dir=None,
+    ir_backend="networkx",
+) -> Iterator[IndexResult]:
+    """
+    Parse and build every target, yielding results in `targets` order.
+    With jobs > 1 files fan out over a process pool; ordered collection
+    keeps the merged atlas identical to the serial path. With `cache_dir`
+    unchanged files are served from the CFG cache instead of re-parsed.
+    """
+    jobs = resolve_jobs(jobs)
+    if jobs <= 1 or len(targets) <= 1:
+        engine = get_engine()
+        cache = CFGCache(cache_dir, config) if cache_dir else None
+        for file_path in targets:
+            yield _index_one(file_path, config, engine, cache)
+        return
+
+    chunksize = max(1, len(targets) // (jobs * 4))
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_worker,
+        initargs=(config_path, cache_dir, ir_backend, profiler.settings()),
+    ) as pool:
+        for result in pool.map(_index_in_worker, targets, chunksize=chunksize):
+            if result.trace:
+                profiler.merge(result.trace)
+                result = result._replace(trace=None)
+            if result.graph:
+                result = result._replace(graph=graph_class().from_compact(result.graph))
+            yield result
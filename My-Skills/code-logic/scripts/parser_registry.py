@@ -0,0 +1,75 @@
+import importlib
+import time
+
+from profiler import phase
+
+_t0 = time.perf_counter()
+try:
+    from tree_sitter import Language, Parser  # noqa: E402
+except ImportError:  # --from-ir renders stored graphs without tree-sitter
+    Language = Parser = None
+
+# Extension -> grammar package, imported on first use only
+GRAMMARS = {
+    "rs": "tree_sitter_rust",
+    "py": "tree_sitter_python",
+}
+
+# Process-wide timing counters (seconds), see `engine_stats`
+STATS = {
+    "import_tree_sitter": time.perf_counter() - _t0,
+    "grammar_load": {},  # ext -> seconds spent importing + building the Parser
+    "parse": 0.0,
+    "parse_count": 0,
+}
+
+_parsers = {}
+
+
+def supports(ext: str) -> bool:
+    return ext in GRAMMARS
+
+
+def get_parser(ext: str):
+    """Shared Parser for `ext`, creating the Language lazily on first request."""
+    parser = _parsers.get(ext)
+    if parser is not None:
+        return parser
+    if ext not in GRAMMARS:
+        raise ValueError(f"Unsupported file extension: {ext}")
+    if Parser is None:
+        raise ImportError("tree-sitter is not installed")
+
+    start = time.perf_counter()
+    try:
+        # New API for tree-sitter >= 0.22
+        module = importlib.import_module(GRAMMARS[ext])
+        parser = Parser(Language(module.language()))
+    except Exception as e:
+        print(f"Error initializing {ext} parser: {e}")
+        raise e
+    STATS["grammar_load"][ext] = time.perf_counter() - start
+    _parsers[ext] = parser
+    return parser
+
+
+def timed_parse(ext: str, code: bytes, old_tree=None):
+    parser = get_parser(ext)
+    start = time.perf_counter()
+    with phase("parse", bytes=len(code)):
+        tree = parser.parse(code, old_tree) if old_tree else parser.parse(code)
+    STATS["parse"] += time.perf_counter() - start
+    STATS["parse_count"] += 1
+    return tree
+
+
+def engine_stats() -> str:
+    """One-line summary: grammar loading versus parsing time in this process."""
+    loads = ", ".join(
+        f"{ext} {secs * 1000:.1f} ms" for ext, secs in STATS["grammar_load"].items()
+    )
+    return (
+        f"[*] Engine: import tree_sitter {STATS['import_tree_sitter'] * 1000:.1f} ms; "
+        f"grammar load {loads or 'none'}; "
+        f"parse {STATS['parse'] * 1000:.1f} ms over {STATS['parse_count']} file(s)"
+    )
@@ -0,0 +1,250 @@
+import contextlib
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+try:  # Peak RSS; not available on Windows
+    import resource
+except ImportError:
+    resource = None
+
+# Bump when the profile layout changes
+PROFILE_FORMAT = 1
+
+# Phase names emitted by the pipeline (also the valid --cprofile targets)
+PHASES = (
+    "parse",  # tree-sitter parse of one file
+    "discover",  # function discovery, imports and syntax-error scan
+    "build",  # CFG construction
+    "merge",  # fusing function/file graphs (atlas Phase B)
+    "link",  # cross-file call resolution (atlas Phase C)
+    "store",  # --store / --save-ir
+    "condense",  # --condense / --lod rewrites
+    "dsl",  # DSL rendering and writing
+    "dot",  # DOT rendering and writing
+    "layout",  # Graphviz (one event per dot run)
+)
+
+_NULL = contextlib.nullcontext()
+
+
+class _State:
+    def __init__(self):
+        self.enabled = False
+        self.cprofile_phases = frozenset()
+        self.events: List[dict] = []  # Chrome trace "X" events
+        self.files: List[dict] = []  # per-file graph sizes and RSS
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self.stats: Dict[str, List[dict]] = {}  # phase -> worker pstats dicts
+        self.local = threading.local()  # .profiling: a cProfile is active
+
+
+_state = _State()
+
+
+def enable(cprofile_phases: Iterable[str] = ()):
+    """Start recording phases in this process (workers: see `settings`)."""
+    _state.enabled = True
+    _state.cprofile_phases = frozenset(cprofile_phases)
+
+
+def enabled() -> bool:
+    return _state.enabled
+
+
+def settings():
+    """Picklable profiler setup for worker initializers (None: disabled)."""
+    return sorted(_state.cprofile_phases) if _state.enabled else None
+
+
+def configure(worker_settings):
+    """Apply `settings()` from the parent in a worker process."""
+    if worker_settings is not None:
+        enable(worker_settings)
+
+
+class _Span:
+    __slots__ = ("name", "args", "wall", "cpu", "profile")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.cpu = time.thread_time_ns()
+        self.wall = time.perf_counter_ns()
+        self.profile = None
+        local = _state.local
+        if self.name in _state.cprofile_phases and not getattr(
+            local, "profiling", False
+        ):
+            # One cProfile per thread at a time; nested phases are covered
+            # by the outer one. Enabled last so only the body is profiled.
+            self.profile = _state.profiles.setdefault(self.name, cProfile.Profile())
+            local.profiling = True
+            self.profile.enable()
+        return self
+
+    def __exit__(self, *exc):
+        if self.profile is not None:
+            self.profile.disable()
+            _state.local.profiling = False
+        wall = time.perf_counter_ns() - self.wall
+        cpu = time.thread_time_ns() - self.cpu
+        self.args["cpu_ms"] = round(cpu / 1e6, 3)
+        _state.events.append(
+            {
+                "name": self.name,
+                "cat": "phase",
+                "ph": "X",
+                "ts": self.wall // 1000,
+                "dur": wall // 1000,
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": self.args,
+            }
+        )
+        return False
+
+
+def phase(name: str, **args):
+    """
+    Context manager timing one occurrence of phase `name` (wall and thread
+    CPU time), under cProfile if requested. A no-op unless enabled.
+    """
+    if not _state.enabled:
+        return _NULL
+    return _Span(name, args)
+
+
+def peak_rss_kib(children: bool = False) -> Optional[int]:
+    """
+    Peak resident set size of this process so far, in KiB; with `children`,
+    of its largest finished child (pool workers, Graphviz).
+    """
+    if resource is None:
+        return None
+    who = resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def record_file(path: str, functions: int, nodes: int, edges: int):
+    """Per-file graph sizes, with the process peak RSS after the file."""
+    if _state.enabled:
+        _state.files.append(
+            {
+                "path": path,
+                "functions": functions,
+                "nodes": nodes,
+                "edges": edges,
+                "peak_rss_kib": peak_rss_kib(),
+                "pid": os.getpid(),
+            }
+        )
+
+
+class _StatsDict:
+    """Adapter: a raw pstats dict accepted by `pstats.Stats`."""
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def create_stats(self):
+        pass
+
+
+def take():
+    """
+    Everything recorded so far in this (worker) process, reset: a
+    picklable tuple for `merge` in the parent.
+    """
+    stats = {}
+    for name, profile in _state.profiles.items():
+        profile.create_stats()
+        stats[name] = profile.stats
+    taken = (_state.events, _state.files, stats)
+    _state.events, _state.files, _state.profiles = [], [], {}
+    return taken
+
+
+def merge(taken):
+    """Fold a worker's `take()` into this process."""
+    events, files, stats = taken
+    _state.events.extend(events)
+    _state.files.extend(files)
+    for name, data in stats.items():
+        _state.stats.setdefault(name, []).append(data)
+
+
+def phase_totals(events) -> Dict[str, dict]:
+    """Count, wall and CPU ms per phase name over trace events."""
+    summary = {}
+    for event in events:
+        entry = summary.setdefault(
+            event["name"], {"count": 0, "wall_ms": 0.0, "cpu_ms": 0.0}
+        )
+        entry["count"] += 1
+        entry["wall_ms"] += event["dur"] / 1000
+        entry["cpu_ms"] += event["args"]["cpu_ms"]
+    for entry in summary.values():
+        entry["wall_ms"] = round(entry["wall_ms"], 3)
+        entry["cpu_ms"] = round(entry["cpu_ms"], 3)
+    return summary
+
+
+def _dump_cprofile(path: str) -> List[str]:
+    """One `<stem>.<phase>.prof` per profiled phase, workers merged in."""
+    stem = os.path.splitext(path)[0]
+    written = []
+    for name in sorted(set(_state.profiles) | set(_state.stats)):
+        sources = [_state.profiles[name]] if name in _state.profiles else []
+        sources += [_StatsDict(data) for data in _state.stats.get(name, ())]
+        stats = pstats.Stats(sources[0])
+        if len(sources) > 1:
+            stats.add(*sources[1:])
+        prof_path = f"{stem}.{name}.prof"
+        stats.dump_stats(prof_path)
+        written.append(prof_path)
+    return written
+
+
+def write(path: str, seconds: float) -> int:
+    """
+    The profile: a Chrome trace (chrome://tracing, Perfetto) whose extra
+    keys hold per-phase totals, per-file sizes and peak RSS. Returns the
+    number of phase events.
+    """
+    events = _state.events
+    origin = min((event["ts"] for event in events), default=0)
+    trace = [dict(event, ts=event["ts"] - origin) for event in events]
+    main_pid = os.getpid()
+    for pid in sorted({event["pid"] for event in events}):
+        name = "main" if pid == main_pid else f"worker {pid}"
+        trace.append(
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": name}}
+        )
+
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    data = {
+        "format": PROFILE_FORMAT,
+        "displayTimeUnit": "ms",
+        "seconds": round(seconds, 3),
+        "peak_rss_kib": peak_rss_kib(),
+        "children_peak_rss_kib": peak_rss_kib(children=True),
+        "phases": phase_totals(events),
+        "files": _state.files,
+        "cprofile": _dump_cprofile(path),
+        "traceEvents": trace,
+    }
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1)
+    os.replace(tmp_path, path)
+    return len(events)
@@ -0,0 +1,152 @@
+import hashlib
+import io
+import json
+import os
+from typing import Optional, Sequence
+
+MANIFEST_NAME = ".logic_manifest.json"
+# Per-file mode over a directory: manifest and run report, unless --svg-dir
+OUTPUT_DIRNAME = ".logic_out"
+MANIFEST_FORMAT = 1
+
+
+class HashingWriter(io.TextIOBase):
+    """Text sink that forwards to `sink` and hashes everything written."""
+
+    def __init__(self, sink):
+        self.sink = sink
+        self.sha = hashlib.sha256()
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, s: str) -> int:
+        self.sha.update(s.encode("utf-8"))
+        return self.sink.write(s)
+
+    def hexdigest(self) -> str:
+        return self.sha.hexdigest()
+
+
+class RenderManifest:
+    """
+    `<dir>/.logic_manifest.json`: output key (source path + focus function,
+    atlas shard, ...) -> digest of the rendered text and the artifacts it
+    produced. An output whose digest matches and whose artifacts all still
+    exist is neither rewritten nor laid out again.
+    `directory=None` (or `enabled=False`) writes everything and records nothing.
+    """
+
+    def __init__(self, directory: Optional[str], enabled: bool = True):
+        self.path = os.path.join(directory, MANIFEST_NAME) if directory else None
+        self.enabled = enabled and self.path is not None
+        self.entries = {}
+        self.changes = {}  # entries recorded since load / take_changes()
+        self.dirty = False
+        self.written = 0
+        self.skipped = 0
+        if self.path and os.path.exists(self.path):
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("format") == MANIFEST_FORMAT:
+                    self.entries = data.get("outputs", {})
+            except (OSError, ValueError):
+                pass
+        # Artifact path -> key that last wrote it; several keys can share a
+        # path (e.g. `--focus a` and `--focus b` both write foo.logic.dot)
+        self.owners = {p: key for key, e in self.entries.items() for p in e["files"]}
+
+    def write_artifact(
+        self, key: str, renderer, path: str, products: Sequence[str] = ()
+    ) -> bool:
+        """
+        Stream `renderer` to `path` unless its text is unchanged since the
+        last run and `path` and every derived file in `products` (e.g. the
+        SVG laid out from it) exist. Returns True when `path` was rewritten;
+        stale products are removed then so they cannot outlive a failed layout.
+        """
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                tee = HashingWriter(f)
+                renderer.write(tee)
+        except BaseException:
+            # A failed render leaves neither a partial output nor its tmp file
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        entry = {"digest": tee.hexdigest(), "files": [path, *products]}
+
+        if (
+            self.enabled
+            and self.entries.get(key) == entry
+            and all(os.path.exists(p) for p in entry["files"])
+        ):
+            os.remove(tmp_path)
+            self.skipped += 1
+            return False
+
+        os.replace(tmp_path, path)
+        if self.path:
+            for product in products:
+                if os.path.exists(product):
+                    os.remove(product)
+            self._record(key, entry)
+        self.written += 1
+        return True
+
+    def _record(self, key: str, entry: dict):
+        for p in entry["files"]:
+            owner = self.owners.get(p)
+            if owner is not None and owner != key:
+                self.entries.pop(owner, None)
+            self.owners[p] = key
+        self.entries[key] = entry
+        self.changes[key] = entry
+        self.dirty = True
+
+    def forget(self, keys):
+        """Drop the entries of outputs that are no longer produced."""
+        for key in list(keys):
+            entry = self.entries.pop(key, None)
+            if entry is None:
+                continue
+            for p in entry["files"]:
+                if self.owners.get(p) == key:
+                    del self.owners[p]
+            self.changes.pop(key, None)
+            self.dirty = True
+
+    def take_changes(self):
+        """(entries, written, skipped) since the last call, for `merge`."""
+        changes = (self.changes, self.written, self.skipped)
+        self.changes, self.written, self.skipped = {}, 0, 0
+        return changes
+
+    def merge(self, changes: dict, written: int, skipped: int):
+        """Fold in what a worker process's manifest recorded (`--jobs`)."""
+        if self.path:
+            for key, entry in changes.items():
+                self._record(key, entry)
+        self.written += written
+        self.skipped += skipped
+
+    def save(self):
+        if not (self.path and self.dirty):
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"format": MANIFEST_FORMAT, "outputs": self.entries},
+                f,
+                indent=1,
+                sort_keys=True,
+            )
+        os.replace(tmp_path, self.path)
+        self.dirty = False
+
+    def summary(self) -> str:
+        total = self.written + self.skipped
+        return f"[*] Unchanged outputs skipped: {self.skipped}/{total}"
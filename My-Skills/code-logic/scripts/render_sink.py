@@ -0,0 +1,39 @@
+import io
+
+# Flush threshold in characters; keeps rendering memory flat for any graph size
+CHUNK_SIZE = 1 << 16
+
+
+class ChunkedWriter:
+    """
+    Buffers small writes and forwards them to `sink` in ~CHUNK_SIZE pieces.
+    Text sinks receive str, anything else (binary files, sockets, pipes)
+    receives UTF-8 bytes.
+    """
+
+    def __init__(self, sink, chunk_size: int = CHUNK_SIZE):
+        self.sink = sink
+        self.binary = not isinstance(sink, io.TextIOBase)
+        self.chunk_size = chunk_size
+        self.parts = []
+        self.size = 0
+
+    def write(self, s: str):
+        self.parts.append(s)
+        self.size += len(s)
+        if self.size >= self.chunk_size:
+            self.flush()
+
+    def flush(self):
+        if not self.parts:
+            return
+        chunk = "".join(self.parts)
+        self.sink.write(chunk.encode("utf-8") if self.binary else chunk)
+        self.parts = []
+        self.size = 0
+
+
+def render_to_string(renderer) -> str:
+    buf = io.StringIO()
+    renderer.write(buf)
+    return buf.getvalue()
@@ -1,74 +1,122 @@
+from typing import Dict, Optional
+
 from ir_graph import UniversalLogicGraph, NodeType, EdgeType
+from render_sink import ChunkedWriter, render_to_string
+from syntax_errors import METADATA_KEY as SYNTAX_ERRORS
+
+# Metadata key of a hyperlink target (e.g. the shard a call target lives in)
+HREF_KEY = "href"
+
+HEADER = (
+    "digraph LogicFlow {\n"
+    "  rankdir=TB;\n"
+    "  splines=ortho;\n"
+    '  node [fontname="Courier New", shape=box, style=filled, fillcolor=white];\n'
+    '  edge [fontname="Arial", fontsize=10];\n'
+)
+
+# Per-type attribute strings, built once instead of per element
+NODE_STYLE = {
+    NodeType.BLOCK: "shape=box",
+    NodeType.FORK: 'shape=diamond, fillcolor="#FFF3CD"',  # Light yellow
+    NodeType.JOIN: "shape=point, width=0.1",
+    NodeType.CALL: 'shape=ellipse, fillcolor="#E2E3E5"',  # Light gray
+    NodeType.EXIT: 'shape=doublecircle, fillcolor="#F8D7DA", color="#DC3545"',
+    NodeType.VIRTUAL: 'style="dashed,filled"',
+}
+
+EDGE_STYLE = {
+    EdgeType.SEQ: 'color="black"',
+    EdgeType.COND_TRUE: 'color="#198754", fontcolor="#198754"',  # Green
+    EdgeType.COND_FALSE: 'color="#FD7E14", fontcolor="#FD7E14"',  # Orange
+    EdgeType.ERR: 'color="#DC3545", style="dashed"',  # Red
+    EdgeType.JUMP: 'color="#6C757D", constraint=false',  # Gray
+}
 
 
 class DotRenderer:
-    def __init__(self, graph: UniversalLogicGraph):
+    def __init__(
+        self, graph: UniversalLogicGraph, clusters: Optional[Dict[str, str]] = None
+    ):
         self.graph = graph
+        # metadata["cluster"] -> box label; nodes of each cluster are drawn
+        # inside a `subgraph cluster_<id>` (one per function, file, ...)
+        self.clusters = clusters
+        self._edge_attrs = {}  # (type, label) -> attribute string
 
     def render(self) -> str:
-        lines = []
-        lines.append("digraph LogicFlow {")
-        lines.append("  rankdir=TB;")
-        lines.append("  splines=ortho;")
-        lines.append(
-            '  node [fontname="Courier New", shape=box, style=filled, fillcolor=white];'
-        )
-        lines.append('  edge [fontname="Arial", fontsize=10];')
+        return render_to_string(self)
+
+    def write(self, sink):
+        """Stream the DOT document to a text or binary file-like `sink`."""
+        out = ChunkedWriter(sink)
+        out.write(HEADER)
 
         # Nodes
-        for node in self.graph.nodes():
-            attr = self._get_node_attr(node)
-            lines.append(f"  {node.id} [{attr}];")
+        if self.clusters is None:
+            for node in self.graph.nodes():
+                out.write(f"  {node.id} [{self._get_node_attr(node)}];\n")
+        else:
+            self._write_clustered_nodes(out)
 
         # Edges
+        edge_attr = self._get_edge_attr
         for u, v, type, label in self.graph.edges():
-            attr = self._get_edge_attr(type, label)
-            lines.append(f"  {u.id} -> {v.id} [{attr}];")
+            out.write(f"  {u.id} -> {v.id} [{edge_attr(type, label)}];\n")
+
+        out.write("}")
+        out.flush()
 
-        lines.append("}")
-        return "\n".join(lines)
+    def _write_clustered_nodes(self, out):
+        """Nodes arrive grouped by cluster (merge order); open a box per run."""
+        current = None
+        for node in self.graph.nodes():
+            cluster = node.metadata.get("cluster")
+            if cluster != current:
+                if current is not None:
+                    out.write("  }\n")
+                if cluster is not None:
+                    label = self.clusters.get(cluster, cluster).replace('"', '\\"')
+                    out.write(f"  subgraph cluster_{cluster} {{\n")
+                    out.write(f'    label="{label}"; style=rounded; color="#6C757D";\n')
+                current = cluster
+            indent = "    " if current is not None else "  "
+            out.write(f"{indent}{node.id} [{self._get_node_attr(node)}];\n")
+        if current is not None:
+            out.write("  }\n")
 
     def _get_node_attr(self, node) -> str:
-        label = node.label.replace('"', '\\"')
+        # Condensed blocks join their statements with newlines
+        label = node.label.replace('"', '\\"').replace("\n", "\\n")
 
         # Append description if available
         if hasattr(node, "description") and node.description:
             label += f"\\n({node.description})"
 
-        # Base attributes
-        attrs = [f'label="{label}"']
-
-        if node.type == NodeType.BLOCK:
-            attrs.append("shape=box")
-        elif node.type == NodeType.FORK:
-            attrs.append('shape=diamond, fillcolor="#FFF3CD"')  # Light yellow
-        elif node.type == NodeType.JOIN:
-            attrs.append("shape=point, width=0.1")
-        elif node.type == NodeType.CALL:
-            attrs.append('shape=ellipse, fillcolor="#E2E3E5"')  # Light gray
-        elif node.type == NodeType.EXIT:
-            attrs.append(
-                'shape=doublecircle, fillcolor="#F8D7DA", color="#DC3545"'
-            )  # Reddish
-        elif node.type == NodeType.VIRTUAL:
-            attrs.append('style="dashed,filled"')
-
-        return ", ".join(attrs)
+        attr = f'label="{label}"'
+        style = NODE_STYLE.get(node.type)
+        if style:
+            attr = f"{attr}, {style}"
+
+        href = node.metadata.get(HREF_KEY)
+        if href:
+            attr += f', URL="{href}", style="dashed,filled"'
+
+        issues = node.metadata.get(SYNTAX_ERRORS)
+        if issues:
+            where = ", ".join(f"{i['line']}:{i['column']}" for i in issues)
+            attr += f', color="#DC3545", penwidth=2, tooltip="syntax error at {where}"'
+
+        return attr
 
     def _get_edge_attr(self, type: EdgeType, label: str) -> str:
-        attrs = []
-        if label:
-            attrs.append(f'label="{label}"')
-
-        if type == EdgeType.SEQ:
-            attrs.append('color="black"')
-        elif type == EdgeType.COND_TRUE:
-            attrs.append('color="#198754", fontcolor="#198754"')  # Green
-        elif type == EdgeType.COND_FALSE:
-            attrs.append('color="#FD7E14", fontcolor="#FD7E14"')  # Orange
-        elif type == EdgeType.ERR:
-            attrs.append('color="#DC3545", style="dashed"')  # Red
-        elif type == EdgeType.JUMP:
-            attrs.append('color="#6C757D", constraint=false')  # Gray
-
-        return ", ".join(attrs)
+        key = (type, label)
+        attr = self._edge_attrs.get(key)
+        if attr is None:
+            attrs = []
+            if label:
+                attrs.append(f'label="{label}"')
+            if type in EDGE_STYLE:
+                attrs.append(EDGE_STYLE[type])
+            attr = self._edge_attrs[key] = ", ".join(attrs)
+        return attr
@@ -1,36 +1,46 @@
-from ir_graph import UniversalLogicGraph
+from typing import Optional
+
+from ir_graph import UniversalLogicGraph, NodeType, EdgeType
+from render_sink import ChunkedWriter, render_to_string
+
+# Padded type columns, built once instead of per element
+NODE_COLUMN = {t: f"{t.name.lower():<6}" for t in NodeType}
+EDGE_COLUMN = {t: f"{t.name.lower():<8}" for t in EdgeType}
 
 
 class DSLRenderer:
-    def __init__(self, graph: UniversalLogicGraph):
+    def __init__(self, graph: UniversalLogicGraph, name: Optional[str] = None):
         self.graph = graph
+        self.name = name or graph.name
 
     def render(self) -> str:
-        lines = []
-        lines.append(f'(flow-graph :name "{self.graph.name}"')
+        return render_to_string(self)
+
+    def write(self, sink):
+        """Stream the S-expression document to a text or binary `sink`."""
+        out = ChunkedWriter(sink)
+        out.write(f'(flow-graph :name "{self.name}"\n')
 
         # Nodes section
-        lines.append("  (nodes")
+        out.write("  (nodes\n")
         for node in self.graph.nodes():
-            lines.append(self._render_node(node))
-        lines.append("  )")
+            out.write(self._render_node(node))
+        out.write("  )\n")
 
         # Edges section
-        lines.append("  (edges")
+        out.write("  (edges\n")
         for u, v, type, label in self.graph.edges():
-            lines.append(self._render_edge(u, v, type, label))
-        lines.append("  )")
+            out.write(self._render_edge(u, v, type, label))
+        out.write("  )\n")
 
-        lines.append(")")
-        return "\n".join(lines)
+        out.write(")")
+        out.flush()
 
     def _render_node(self, node) -> str:
         # Sanitize label
         label = node.label.replace('"', '\\"').replace("\n", " ")
-        type_str = node.type.name.lower()
-        return f'    ({type_str:<6} :id {node.id:<10} :label "{label}")'
+        return f'    ({NODE_COLUMN[node.type]} :id {node.id:<10} :label "{label}")\n'
 
     def _render_edge(self, u, v, type, label) -> str:
-        type_str = type.name.lower()
         lbl_part = f' :label "{label}"' if label else ""
-        return f"    ({type_str:<8} {u.id} -> {v.id}{lbl_part})"
+        return f"    ({EDGE_COLUMN[type]} {u.id} -> {v.id}{lbl_part})\n"
@@ -0,0 +1,83 @@
+from typing import Tuple
+
+# Statement labels keep the first line, cut to this many characters
+SUMMARY_CHARS = 40
+
+
+class SourceText:
+    """
+    One file's bytes behind a single memoryview. Builders record
+    (start_byte, end_byte) spans into it; text is decoded only when a
+    label is read (normally by a renderer).
+    """
+
+    __slots__ = ("data", "view")
+
+    def __init__(self, code: bytes):
+        self.data = code
+        self.view = memoryview(code)
+
+    def decode(self, start: int, end: int) -> str:
+        return str(self.view[start:end], "utf-8")
+
+    def text(self, node) -> str:
+        """Eager text of a tree-sitter node ("" for a missing node)."""
+        if not node:
+            return ""
+        return self.decode(node.start_byte, node.end_byte)
+
+    def label(self, template: str, *nodes) -> "SpanLabel":
+        """`template` with one `{}` per node, filled in on first read."""
+        spans = ()
+        for node in nodes:
+            spans += _span(node)
+        return SpanLabel(self, template, spans)
+
+    def summary(self, node, prefix: str = "") -> "SummaryLabel":
+        """First line of a statement, truncated, decoded on first read."""
+        start, end = _span(node)
+        return SummaryLabel(self, start, end, prefix)
+
+
+def _span(node) -> Tuple[int, int]:
+    return (node.start_byte, node.end_byte) if node else (0, 0)
+
+
+class SpanLabel:
+    __slots__ = ("source", "template", "spans")  # spans: flat (start, end, ...)
+
+    def __init__(self, source: SourceText, template: str, spans):
+        self.source = source
+        self.template = template
+        self.spans = spans
+
+    def resolve(self) -> str:
+        decode, spans = self.source.decode, self.spans
+        return self.template.format(
+            *(decode(spans[i], spans[i + 1]) for i in range(0, len(spans), 2))
+        )
+
+
+class SummaryLabel:
+    __slots__ = ("source", "start", "end", "prefix")
+
+    def __init__(self, source: SourceText, start: int, end: int, prefix: str):
+        self.source = source
+        self.start = start
+        self.end = end
+        self.prefix = prefix
+
+    def resolve(self) -> str:
+        # Only the first line is decoded, however long the statement is
+        stop = self.source.data.find(b"\n", self.start, self.end)
+        summary = self.source.decode(self.start, self.end if stop < 0 else stop).strip()
+        if len(summary) > SUMMARY_CHARS:
+            summary = summary[: SUMMARY_CHARS - 3] + "..."
+        if self.prefix and not summary.startswith(self.prefix):
+            summary = self.prefix + summary
+        return summary
+
+
+def resolve_label(label) -> str:
+    """A plain string, or the text of a lazy span label."""
+    return label if isinstance(label, str) else label.resolve()
@@ -1,5 +1,11 @@
-from typing import Dict, Optional, List, Tuple
-from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, List
+from dataclasses import dataclass, field
+
+from imports import SEPARATORS, absolute_path, module_path
+
+# Re-export hops followed from an import to the definition
+# (`pub use`, names imported into a package's `__init__.py`)
+MAX_REEXPORT_HOPS = 4
 
 
 @dataclass
@@ -8,6 +14,55 @@ class SymbolInfo:
     file_path: str
     node_id: str  # The ID in the ULG
     description: str = ""
+    qualname: str = ""  # Fully qualified, e.g. "mycrate::net::Client::new"
+
+
+@dataclass
+class FileScope:
+    """Module path and import map of one source file."""
+
+    module: str
+    sep: str
+    # Local name -> absolute path, e.g. "Client" -> "mycrate::net::Client"
+    imports: Dict[str, str] = field(default_factory=dict)
+    globs: List[str] = field(default_factory=list)  # `use a::*`, `from a import *`
+
+    def candidates(self, callee: str, caller: str = "") -> Iterator[str]:
+        """
+        Qualified paths `callee` may name when called from function
+        `caller` (a qualname within this module), most specific first.
+        """
+        sep = self.sep
+        if sep == "::" and callee.startswith(("self.", "Self::")):
+            # Method or associated function of the enclosing impl
+            owner = caller.rpartition("::")[0]
+            member = callee[5:] if callee[4] == "." else callee[6:]
+            if owner:
+                yield f"{self.module}::{owner}::{member}"
+            return
+        head, _, rest = callee.partition(sep)
+        if sep == "." and head in ("self", "cls"):
+            owner = caller.rpartition(".")[0]
+            if owner and rest:
+                yield f"{self.module}.{owner}.{rest}"
+            return
+
+        target = self.imports.get(head)
+        if target is not None:
+            path = f"{target}{sep}{rest}" if rest else target
+            yield path
+            if sep == "::":
+                # 2018-edition `use net::Server` is relative to this module
+                yield f"{self.module}::{path}"
+        if sep == "::" and head in ("crate", "self", "super"):
+            yield absolute_path(callee, "rs", self.module, False)
+            return
+        if caller:
+            # A function nested in the caller
+            yield f"{self.module}{sep}{caller}{sep}{callee}"
+        yield f"{self.module}{sep}{callee}"
+        for glob in self.globs:
+            yield f"{glob}{sep}{callee}"
 
 
 class SymbolTable:
@@ -15,21 +70,88 @@ class SymbolTable:
         # Map simple function name to list of potential definitions
         # Key: "function_name", Value: [SymbolInfo, ...]
         self.index: Dict[str, List[SymbolInfo]] = {}
+        # Fully qualified path -> definition; a later duplicate wins, as in
+        # the merged graph
+        self.qualified: Dict[str, SymbolInfo] = {}
+        self.files: Dict[str, FileScope] = {}
+        self.modules: Dict[str, FileScope] = {}
 
-    def register(self, name: str, file_path: str, node_id: str, description: str = ""):
+    def add_file(self, file_path: str, lang: str, imports=()) -> FileScope:
+        """
+        Record the module of `file_path` and its import map; `imports` are
+        (local name, path as written) pairs from `imports.collect_imports`.
+        Call before registering the file's functions.
+        """
+        module, is_package = module_path(file_path, lang)
+        scope = FileScope(module, SEPARATORS[lang])
+        for name, path in imports:
+            path = absolute_path(path, lang, module, is_package)
+            if name == "*":
+                scope.globs.append(path)
+            else:
+                scope.imports[name] = path
+        self.files[file_path] = scope
+        self.modules[module] = scope
+        return scope
+
+    def register(
+        self,
+        name: str,
+        file_path: str,
+        node_id: str,
+        description: str = "",
+        qualname: str = "",
+    ):
         if name not in self.index:
             self.index[name] = []
 
-        self.index[name].append(SymbolInfo(name, file_path, node_id, description))
+        scope = self.files.get(file_path)
+        if scope is not None and qualname:
+            qualname = f"{scope.module}{scope.sep}{qualname}"
+        info = SymbolInfo(name, file_path, node_id, description, qualname)
+        self.index[name].append(info)
+        if scope is not None and qualname:
+            self.qualified[qualname] = info
+
+    def lookup(self, path: str) -> Optional[SymbolInfo]:
+        """Definition at a qualified path, following re-exports."""
+        for _ in range(MAX_REEXPORT_HOPS):
+            info = self.qualified.get(path)
+            if info is not None:
+                return info
+            for sep in ("::", "."):
+                module, found, name = path.rpartition(sep)
+                if found:
+                    break
+            scope = self.modules.get(module) if found else None
+            if scope is None or name not in scope.imports:
+                return None
+            path = scope.imports[name]
+        return None
+
+    def resolve_call(
+        self, callee: str, file_path: str, caller: str = ""
+    ) -> Optional[SymbolInfo]:
+        """
+        Resolve a call site: `callee` as written (see `ir_graph.call_key`)
+        inside function `caller` (qualname) of `file_path`. Qualified
+        candidates come from the file's module, its enclosing impl/class and
+        its imports, each a dictionary lookup; a bare name defined exactly
+        once in the project is the fallback.
+        """
+        scope = self.files.get(file_path)
+        if scope is not None:
+            for path in scope.candidates(callee, caller):
+                info = self.lookup(path)
+                if info is not None:
+                    return info
+        return self.resolve(callee)
 
     def resolve(self, name: str) -> Optional[SymbolInfo]:
         """
-        Resolve a function name to a single definition.
-        Heuristic:
-        1. If only one match, return it.
-        2. If multiple, return None (ambiguous) or first?
-        For V1.3, we return first if unique, else None to avoid false links.
-        Wait, heuristics can be smarter later.
+        Resolve a bare function name to a single definition.
+        Only a name defined exactly once links; `resolve_call` handles the
+        ambiguous ones through scopes and imports.
         """
         candidates = self.index.get(name)
         if not candidates:
@@ -38,10 +160,7 @@ class SymbolTable:
         if len(candidates) == 1:
             return candidates[0]
 
-        # Ambiguity resolution logic could go here (e.g. check import paths)
-        # For now, return None to be strict/unassailable.
-        # Or return the first one if we accept looseness?
-        # Perfect logic requires strictness. Ambiguity = No explicit link.
+        # Ambiguity = No explicit link.
         return None
 
     def get_candidates(self, name: str) -> List[SymbolInfo]:
@@ -0,0 +1,85 @@
+from dataclasses import asdict, dataclass
+from typing import List
+
+# Key under which ULG nodes carry the issues located inside them
+METADATA_KEY = "syntax_errors"
+
+
+@dataclass
+class SyntaxIssue:
+    kind: str  # "error" (ERROR node) or "missing" (parser-inserted token)
+    start_byte: int
+    end_byte: int
+    line: int  # 1-based
+    column: int  # 0-based byte column
+    end_line: int
+    end_column: int
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+def _issue(kind: str, node) -> SyntaxIssue:
+    (row, col), (end_row, end_col) = node.start_point, node.end_point
+    return SyntaxIssue(
+        kind, node.start_byte, node.end_byte, row + 1, col, end_row + 1, end_col
+    )
+
+
+def find_syntax_errors(root) -> List[SyntaxIssue]:
+    """
+    Locate ERROR and MISSING nodes. Uses tree-sitter's own `has_error` flag:
+    a clean tree costs O(1), otherwise a cursor walk (no recursion) only
+    descends into subtrees that contain an error.
+    """
+    if not root.has_error:
+        return []
+
+    issues = []
+    cursor = root.walk()
+    while True:
+        node = cursor.node
+        descend = False
+        if node.is_error:
+            issues.append(_issue("error", node))
+        elif node.is_missing:
+            issues.append(_issue("missing", node))
+        else:
+            descend = node.has_error
+
+        if descend and cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return issues
+
+
+def attach_to_graph(graph, fn_node, issues: List[SyntaxIssue]) -> int:
+    """
+    Record each issue inside `fn_node` on the innermost ULG node whose AST
+    span contains it (falling back to the function entry).
+    Returns the number of issues attached.
+    """
+    inside = [
+        i
+        for i in issues
+        if fn_node.start_byte <= i.start_byte and i.end_byte <= fn_node.end_byte
+    ]
+    if not inside:
+        return 0
+
+    spans = [
+        (n.ast_node.end_byte - n.ast_node.start_byte, n)
+        for n in graph.nodes()
+        if n.ast_node is not None
+    ]
+    for issue in inside:
+        best = graph.get_node(graph.entry_node)
+        best_size = None
+        for size, node in spans:
+            ast = node.ast_node
+            if ast.start_byte <= issue.start_byte and issue.end_byte <= ast.end_byte:
+                if best_size is None or size < best_size:
+                    best, best_size = node, size
+        best.metadata.setdefault(METADATA_KEY, []).append(issue.to_dict())
+    return len(inside)
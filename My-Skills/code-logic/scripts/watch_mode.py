@@ -0,0 +1,114 @@
+import os
+import time
+
+from ast_engine import ASTEngine
+from discovery import function_keys, iter_functions
+from file_pipeline import LANGUAGES, lang_of
+from output_writer import logic_output_dir, resolve_svg_dir, write_logic_outputs
+
+POLL_INTERVAL = 0.05  # seconds between mtime checks
+
+
+def _overlaps(node, ranges) -> bool:
+    return any(
+        start <= node.end_byte and end >= node.start_byte for start, end in ranges
+    )
+
+
+class FileWatcher:
+    """
+    Keeps one incremental tree-sitter session for a file and, on every save,
+    rebuilds and re-renders only the functions whose source range was touched.
+    Each function gets its own `<file>.<fn>.logic.*` artifacts.
+    """
+
+    def __init__(self, file_path, args, config):
+        self.file_path = file_path
+        self.args = args
+        self.config = config
+        self.lang = lang_of(file_path)
+        self.engine = ASTEngine()
+        self.output_dir = logic_output_dir(file_path)
+        self.svg_dir = resolve_svg_dir(file_path, self.output_dir, args.svg_dir)
+        self.filename = os.path.basename(os.path.splitext(file_path)[0])
+        self.spans = {}  # key -> byte length at last render
+
+    def _functions(self, tree, code):
+        """[(key, fn_node)] keyed by qualified name; repeats get a suffix."""
+        infos = [
+            info
+            for info in iter_functions(tree.root_node, self.lang, code)
+            if not self.args.focus or self.args.focus in (info.name, info.qualname)
+        ]
+        return [(key, info.node) for key, info in zip(function_keys(infos), infos)]
+
+    def _is_dirty(self, key, fn_node, changed) -> bool:
+        if changed is None or key not in self.spans:
+            return True
+        if self.spans[key] != fn_node.end_byte - fn_node.start_byte:
+            return True
+        return _overlaps(fn_node, changed)
+
+    def _remove(self, key):
+        stem = f"{self.filename}.{key}.logic"
+        for directory, ext in [
+            (self.output_dir, "lisp"),
+            (self.output_dir, "dot"),
+            (self.svg_dir, "svg"),
+        ]:
+            path = os.path.join(directory, f"{stem}.{ext}")
+            if os.path.exists(path):
+                os.remove(path)
+
+    def refresh(self) -> int:
+        """Reparse incrementally and re-render dirty functions; returns count."""
+        tree, code, changed = self.engine.parse_incremental(self.file_path)
+        if changed == []:
+            return 0
+
+        builder = LANGUAGES[self.lang](code)
+        builder.set_config_loader(self.config)
+
+        current = self._functions(tree, code)
+        rendered = 0
+        for key, fn_node in current:
+            if not self._is_dirty(key, fn_node, changed):
+                continue
+            ulg = builder.build_from_function(fn_node)
+            stem = f"{self.filename}.{key}"
+            write_logic_outputs(
+                ulg, self.args.format, self.output_dir, stem, self.svg_dir
+            )
+            rendered += 1
+
+        live = {key: fn.end_byte - fn.start_byte for key, fn in current}
+        for key in set(self.spans) - set(live):
+            self._remove(key)
+        self.spans = live
+        return rendered
+
+    def run(self):
+        print(f"[*] Watching {self.file_path} (Ctrl-C to stop)...")
+        last_mtime = None
+        try:
+            while True:
+                try:
+                    mtime = os.stat(self.file_path).st_mtime_ns
+                except FileNotFoundError:
+                    mtime = last_mtime  # Editors may replace the file on save
+                if mtime != last_mtime:
+                    last_mtime = mtime
+                    start = time.perf_counter()
+                    count = self.refresh()
+                    elapsed = (time.perf_counter() - start) * 1000
+                    print(f"[~] Re-rendered {count} function(s) in {elapsed:.1f} ms")
+                time.sleep(POLL_INTERVAL)
+        except KeyboardInterrupt:
+            print("[*] Watch stopped.")
+
+
+def watch_file(file_path, args, config):
+    if lang_of(file_path) is None:
+        print(f"[!] Unsupported extension for watch mode: {file_path}")
+        return
+    FileWatcher(file_path, args, config).run()
@@ -0,0 +1,30 @@
+import pytest
+
+from atlas_query import query_main
+from atlas_store import write_store
+from ir_graph import EdgeType, NodeType, new_graph
+
+
+@pytest.fixture
+def store_path(tmp_path):
+    """Two functions, `a` calling `b` through a LINK edge."""
+    graph = new_graph("atlas")
+    a = graph.add_node(NodeType.CALL, "b()")
+    b = graph.add_node(NodeType.EXIT, "return")
+    graph.add_edge(a, b, EdgeType.LINK, "calls")
+    path = str(tmp_path / "project_atlas.db")
+    functions = [("m.a", "a", "m.py", a.id), ("m.b", "b", "m.py", b.id)]
+    write_store(path, graph, functions)
+    return path
+
+
+def test_hit_returns_zero(store_path):
+    assert query_main([store_path, "callers", "m.b"]) == 0
+    assert query_main([store_path, "path", "m.a", "m.b"]) == 0
+
+
+def test_unknown_function_returns_nonzero(store_path, capsys):
+    assert query_main([store_path, "callers", "nosuch"]) == 1
+    assert "No function matches 'nosuch'" in capsys.readouterr().out
+    assert query_main([store_path, "path", "m.a", "nosuch"]) == 1
+    assert query_main([store_path, "path", "m.a"]) == 1
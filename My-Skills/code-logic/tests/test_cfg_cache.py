@@ -0,0 +1,66 @@
+import os
+import pickle
+
+import pytest
+
+from ast_engine import get_engine
+from cfg_cache import CFGCache, analyze_file_cached
+from config_loader import ConfigLoader
+
+SOURCE = """\
+def f(x):
+    if x:
+        return g(x)
+    return 0
+"""
+
+
+@pytest.fixture
+def setup(tmp_path):
+    source = tmp_path / "m.py"
+    source.write_text(SOURCE, encoding="utf-8")
+    config = ConfigLoader("logic_config.yaml")
+    cache = CFGCache(str(tmp_path / "cache"), config)
+    key = cache.key(source.read_bytes())
+    return str(source), config, cache, cache._path(key)
+
+
+def analyze(source, config, cache):
+    return analyze_file_cached(source, config, get_engine(), cache)
+
+
+def test_corrupt_graph_blob_is_rebuilt(setup):
+    source, config, cache, entry_path = setup
+    analysis, hit = analyze(source, config, cache)
+    assert not hit
+
+    # Truncate every stored ULG blob: the entry unpickles, the graphs do not
+    with open(entry_path, "rb") as f:
+        imports, functions = pickle.load(f)
+    functions = [
+        (name, qualname, blob[: len(blob) // 2], calls)
+        for name, qualname, blob, calls in functions
+    ]
+    with open(entry_path, "wb") as f:
+        pickle.dump((imports, functions), f)
+
+    rebuilt, hit = analyze(source, config, cache)
+    assert not hit
+    assert [fn.name for fn in rebuilt.functions] == ["f"]
+    assert rebuilt.functions[0].graph.number_of_nodes() == (
+        analysis.functions[0].graph.number_of_nodes()
+    )
+    # The bad entry was replaced by a readable one
+    assert analyze(source, config, cache)[1]
+
+
+def test_truncated_cache_file_is_rebuilt(setup):
+    source, config, cache, entry_path = setup
+    analyze(source, config, cache)
+    with open(entry_path, "r+b") as f:
+        f.truncate(os.path.getsize(entry_path) // 2)
+
+    analysis, hit = analyze(source, config, cache)
+    assert not hit
+    assert [fn.name for fn in analysis.functions] == ["f"]
+    assert analyze(source, config, cache)[1]
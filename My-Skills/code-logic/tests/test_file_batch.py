@@ -0,0 +1,87 @@
+import multiprocessing
+import os
+from argparse import Namespace
+
+import pytest
+
+import file_batch
+from config_loader import ConfigLoader
+from render_manifest import RenderManifest
+
+SOURCE = """\
+def f(x):
+    if x:
+        return 1
+    return 0
+"""
+
+
+def make_args(**overrides):
+    args = Namespace(
+        jobs=1,
+        render_jobs=1,
+        layout_timeout=60,
+        all_functions=False,
+        split_functions=False,
+        focus=None,
+        format="dsl",
+        svg_dir=None,
+        condense=False,
+        save_ir=False,
+        ir_backend="networkx",
+        config="logic_config.yaml",
+        force=True,
+    )
+    vars(args).update(overrides)
+    return args
+
+
+def make_files(root, names):
+    paths = []
+    for name in names:
+        path = root / name
+        path.write_text(SOURCE, encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+def run(paths, args, root):
+    config = ConfigLoader("logic_config.yaml")
+    return list(
+        file_batch.run_files(paths, args, config, str(root), RenderManifest(None), None)
+    )
+
+
+def test_missing_focus_function_is_skipped(tmp_path):
+    (path,) = make_files(tmp_path, ["m.py"])
+    (report,) = run([path], make_args(focus="nosuch"), tmp_path)
+    assert report.status == "skipped"
+    assert "nosuch" in report.error
+
+
+def _exit_on_bad(file_path):
+    if "bad" in os.path.basename(file_path):
+        os._exit(3)  # the worker dies as on a segfault or the OOM killer
+    return _run_in_worker(file_path)
+
+
+_run_in_worker = file_batch._run_in_worker
+
+
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="workers must inherit the patched worker function",
+)
+def test_dead_worker_fails_only_its_file(tmp_path, monkeypatch):
+    names = [f"m{i:02d}.py" for i in range(12)]
+    names[5] = "m05_bad.py"
+    paths = make_files(tmp_path, names)
+    monkeypatch.setattr(file_batch, "_run_in_worker", _exit_on_bad)
+
+    reports = run(paths, make_args(jobs=3), tmp_path)
+
+    assert [report.path for report in reports] == paths
+    failed = [report for report in reports if report.status != "ok"]
+    assert [report.path for report in failed] == [paths[5]]
+    assert failed[0].status == "failed"
+    assert failed[0].error == "Worker process died"
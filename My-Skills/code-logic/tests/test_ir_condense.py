@@ -0,0 +1,29 @@
+import io
+
+from ir_condense import condense
+from ir_graph import EdgeType, NodeType, new_graph
+from renderer_dot import DotRenderer
+
+
+def chain_graph():
+    graph = new_graph("f")
+    first = graph.add_node(NodeType.BLOCK, "x = 1")
+    second = graph.add_node(NodeType.BLOCK, 'y = "2"')
+    exit_node = graph.add_node(NodeType.EXIT, "return")
+    graph.set_entry(first)
+    graph.add_edge(first, second, EdgeType.SEQ)
+    graph.add_edge(second, exit_node, EdgeType.SEQ)
+    return graph
+
+
+def test_collapsed_chain_label_is_escaped_in_dot():
+    condensed = condense(chain_graph())
+    assert condensed.number_of_nodes() == 2
+
+    sink = io.StringIO()
+    DotRenderer(condensed).write(sink)
+    dot = sink.getvalue()
+
+    assert 'block_1 [label="x = 1\\ny = \\"2\\"", shape=box];' in dot
+    # Every statement stays on one line of the DOT document
+    assert all(line.endswith(("{", "}", ";")) for line in dot.splitlines())
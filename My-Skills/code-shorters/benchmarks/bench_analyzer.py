@@ -0,0 +1,108 @@
+"""
+Per-file analysis throughput of `main_analyzer.analyze_files`: the
+single-pass `file_analyzer.analyze_file` against the previous pipeline
+(`detect_language`, `count_lines` and `calculate_complexity`, each reading
+the file again). Lint runs are stubbed out so only reading and scanning
+are timed; both pipelines must report identical results. Only files with
+a known source extension are copied from PATH (content sniffing costs the
+same in both).
+
+    python benchmarks/bench_analyzer.py [PATH] [--copies 20] [--repeat 3]
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "scripts"))
+
+import complexity_detector  # noqa: E402
+from file_analyzer import analyze_file  # noqa: E402
+from language_detector import detect_by_extension, detect_language  # noqa: E402
+from line_counter import count_lines, scan_directory  # noqa: E402
+
+
+def legacy(file_paths, use_complexity):
+    """The per-file steps `analyze_files` ran before."""
+    rows = []
+    for file_path in file_paths:
+        language = detect_language(file_path)
+        if language == "unknown":
+            continue
+        lines = count_lines(file_path)
+        complexity = nesting = func_count = 0
+        if use_complexity:
+            detail = complexity_detector.calculate_complexity(file_path, language)
+            complexity = detail["cyclomatic"]
+            nesting = detail["nesting_depth"]
+            func_count = detail["function_count"]
+        rows.append((file_path, language, lines, complexity, func_count, nesting))
+    return rows
+
+
+def single_pass(file_paths, use_complexity):
+    rows = []
+    for file_path in file_paths:
+        stats = analyze_file(file_path, complexity=use_complexity)
+        if stats is not None:
+            rows.append(tuple(stats))
+    return rows
+
+
+def best_of(repeat, fn, *args):
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-file analysis benchmark")
+    parser.add_argument("path", nargs="?", default=".", help="Tree to copy and scan")
+    parser.add_argument("--copies", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    # Lint results are per directory and cached; keep them out of the timings
+    complexity_detector._run_lint = lambda command, workdir: False
+
+    sources = [
+        path
+        for path in scan_directory(args.path, recursive=True)
+        if detect_by_extension(path)
+    ]
+    scratch = tempfile.mkdtemp(prefix="bench_analyzer_")
+    try:
+        paths = []
+        for n in range(args.copies):
+            for k, source in enumerate(sources):
+                target = os.path.join(scratch, str(n), f"{k}_{os.path.basename(source)}")
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copyfile(source, target)
+                paths.append(target)
+        size = sum(os.path.getsize(path) for path in paths)
+        print(f"[*] {len(paths)} files ({size >> 10} KiB)")
+
+        for use_complexity in (True, False):
+            old_time, old_rows = best_of(args.repeat, legacy, paths, use_complexity)
+            new_time, new_rows = best_of(args.repeat, single_pass, paths, use_complexity)
+            assert old_rows == new_rows, "single-pass results differ"
+            print(
+                f"    {'complexity' if use_complexity else 'lines only':<10}  "
+                f"legacy {len(paths) / old_time:9.0f} files/s  "
+                f"single-pass {len(paths) / new_time:9.0f} files/s  "
+                f"({old_time / new_time:.2f}x)"
+            )
+    finally:
+        shutil.rmtree(scratch)
+
+
+if __name__ == "__main__":
+    main()
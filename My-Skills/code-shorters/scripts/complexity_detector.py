@@ -4,9 +4,34 @@
 import re
 import shutil
 import subprocess
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, Any
 
+KEYWORDS = {
+    "rust": ["if", "for", "while", "match", "loop"],
+    "python": ["if", "for", "while", "elif", "except"],
+    "cpp": ["if", "for", "while", "switch", "catch"],
+    "js": ["if", "for", "while", "switch", "catch"],
+}
+
+FUNCTION_PATTERNS = {
+    "rust": r"\bfn\s+\w+\s*\(",
+    "python": r"\bdef\s+\w+\s*\(",
+    "cpp": r"\b\w+\s+\w+\s*\(",
+    "js": r"\bfunction\s+\w+\s*\(",
+}
+
+# Languages whose brace nesting is measured
+NESTING_LANGUAGES = {"rust", "cpp", "js"}
+
+LINT_COMMANDS = {
+    "rust": "cargo clippy --message-format=json",
+    "python": "pylint --output-format=json",
+    "cpp": "cpplint --output-format=json5",
+    "js": "eslint --format=json",
+}
+
 
 def calculate_priority_score(
     lines: int, complexity: float, nesting: int = 0, functions: int = 0
@@ -18,25 +43,13 @@ def calculate_priority_score(
 
 
 def _keyword_complexity(content: str, language: str) -> int:
-    keywords = {
-        "rust": ["if", "for", "while", "match", "loop"],
-        "python": ["if", "for", "while", "elif", "except"],
-        "cpp": ["if", "for", "while", "switch", "catch"],
-        "js": ["if", "for", "while", "switch", "catch"],
-    }
     return sum(
-        len(re.findall(rf"\b{key}\b", content)) for key in keywords.get(language, [])
+        len(re.findall(rf"\b{key}\b", content)) for key in KEYWORDS.get(language, [])
     )
 
 
 def _function_count(content: str, language: str) -> int:
-    patterns = {
-        "rust": r"\bfn\s+\w+\s*\(",
-        "python": r"\bdef\s+\w+\s*\(",
-        "cpp": r"\b\w+\s+\w+\s*\(",
-        "js": r"\bfunction\s+\w+\s*\(",
-    }
-    pattern = patterns.get(language)
+    pattern = FUNCTION_PATTERNS.get(language)
     return len(re.findall(pattern, content)) if pattern else 0
 
 
@@ -52,7 +65,9 @@ def _nesting_depth(content: str) -> int:
     return max_depth
 
 
+@lru_cache(maxsize=None)
 def _run_lint(command: str, workdir: str) -> bool:
+    # The linters check the whole directory: one run per (command, directory)
     if shutil.which(command.split()[0]) is None:
         return False
     result = subprocess.run(
@@ -61,20 +76,17 @@ def _run_lint(command: str, workdir: str) -> bool:
     return result.returncode == 0
 
 
+def lint_passes(file_path: str, language: str) -> bool:
+    lint_cmd = LINT_COMMANDS.get(language)
+    return _run_lint(lint_cmd, str(Path(file_path).parent)) if lint_cmd else False
+
+
 def calculate_complexity(file_path: str, language: str) -> Dict[str, Any]:
     content = Path(file_path).read_text(encoding="utf-8", errors="ignore")
     complexity = _keyword_complexity(content, language)
     functions = _function_count(content, language)
-    nesting = _nesting_depth(content) if language in {"rust", "cpp", "js"} else 0
-
-    lint_map = {
-        "rust": "cargo clippy --message-format=json",
-        "python": "pylint --output-format=json",
-        "cpp": "cpplint --output-format=json5",
-        "js": "eslint --format=json",
-    }
-    lint_cmd = lint_map.get(language)
-    lint_ok = _run_lint(lint_cmd, str(Path(file_path).parent)) if lint_cmd else False
+    nesting = _nesting_depth(content) if language in NESTING_LANGUAGES else 0
+    lint_ok = lint_passes(file_path, language)
 
     return {
         "cyclomatic": max(1, complexity) if lint_ok else complexity,
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""Single-read, single-pass per-file analysis (lines, keywords, functions, nesting)."""
+
+import mmap
+import os
+import re
+import sys
+from typing import Dict, NamedTuple, Optional, Tuple
+
+from complexity_detector import FUNCTION_PATTERNS, KEYWORDS, NESTING_LANGUAGES
+from language_detector import detect_by_extension, detect_by_text
+
+# Files this large are scanned in place through mmap instead of being decoded
+MMAP_THRESHOLD = 64 * 1024 * 1024
+# Content sniffing looks at this many leading characters (as detect_by_content)
+SNIFF_CHARS = 5000
+
+# The boundaries of str.splitlines(), as UTF-8 bytes
+LINE_BREAKS_BYTES = rb"\r\n|[\n\r\x0b\x0c\x1c-\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]"
+BREAK_TOKENS_BYTES = {
+    b"\r\n",
+    b"\n",
+    b"\r",
+    b"\x0b",
+    b"\x0c",
+    b"\x1c",
+    b"\x1d",
+    b"\x1e",
+    b"\xc2\x85",
+    b"\xe2\x80\xa8",
+    b"\xe2\x80\xa9",
+}
+
+
+class FileStats(NamedTuple):
+    path: str
+    language: str
+    lines: int
+    keywords: int = 0  # keyword complexity, before the lint adjustment
+    functions: int = 0
+    nesting: int = 0
+
+
+_patterns: Dict[Tuple[str, bool, bool], "re.Pattern"] = {}
+
+
+def _token_pattern(language: str, complexity: bool, binary: bool):
+    """
+    One alternation matching every token the counters need. A function head
+    is a zero-width lookahead tried first, so the keyword it may start with
+    (`if constexpr (` in C++) is still matched at the same position. Line
+    breaks are tokens only for mmap'd bytes; decoded text uses splitlines.
+    """
+    key = (language, complexity, binary)
+    pattern = _patterns.get(key)
+    if pattern is None:
+        parts = []
+        if complexity:
+            if language in FUNCTION_PATTERNS:
+                parts.append(f"(?={FUNCTION_PATTERNS[language]})")
+            if language in KEYWORDS:
+                parts.append(rf"\b(?:{'|'.join(KEYWORDS[language])})\b")
+            if language in NESTING_LANGUAGES:
+                parts.append(r"[{}]")
+        if binary:
+            encoded = [part.encode("ascii") for part in parts]
+            source = b"|".join(encoded + [LINE_BREAKS_BYTES])
+        else:
+            source = "|".join(parts)
+        pattern = _patterns[key] = re.compile(source) if source else None
+    return pattern
+
+
+def _scan(text, language: str, complexity: bool) -> Tuple[int, int, int, int]:
+    """(line breaks, keywords, functions, max brace depth) in one pass."""
+    binary = not isinstance(text, str)
+    pattern = _token_pattern(language, complexity, binary)
+    if pattern is None:
+        return 0, 0, 0, 0
+    open_brace, close_brace = (b"{", b"}") if binary else ("{", "}")
+    line_breaks = keywords = functions = depth = nesting = 0
+    for token in pattern.findall(text):
+        if not token:
+            functions += 1
+        elif token == open_brace:
+            depth += 1
+            if depth > nesting:
+                nesting = depth
+        elif token == close_brace:
+            if depth:
+                depth -= 1
+        elif binary and token in BREAK_TOKENS_BYTES:
+            line_breaks += 1
+        else:
+            keywords += 1
+    return line_breaks, keywords, functions, nesting
+
+
+def _count_lines(data: mmap.mmap, line_breaks: int) -> int:
+    """str.splitlines() length from the break count of undecoded bytes."""
+    if not len(data):
+        return 0
+    tail = bytes(data[-3:])
+    return line_breaks + (not tail.endswith(tuple(BREAK_TOKENS_BYTES)))
+
+
+def _read(file_path: str):
+    """The file's bytes, or a read-only mmap of them for huge files."""
+    with open(file_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return f.read()
+
+
+def analyze_file(file_path: str, complexity: bool = True) -> Optional[FileStats]:
+    """
+    Read `file_path` once and count lines (as str.splitlines) plus keyword
+    complexity, functions and brace nesting in a single tokenizing pass.
+    Returns None for files whose language cannot be detected.
+
+    Huge files are scanned as bytes through mmap: identifiers are then
+    matched with ASCII word rules only.
+    """
+    language = detect_by_extension(file_path)
+    try:
+        data = _read(file_path)
+    except OSError:
+        if language:
+            raise
+        return None
+
+    try:
+        if isinstance(data, mmap.mmap):
+            text = data
+            if not language:
+                sample = data[: SNIFF_CHARS * 4].decode("utf-8", errors="ignore")
+                language = detect_by_text(sample[:SNIFF_CHARS])
+        else:
+            text = data.decode("utf-8", errors="ignore")
+            if not language:
+                language = detect_by_text(text[:SNIFF_CHARS])
+        if not language:
+            return None
+
+        line_breaks, keywords, functions, nesting = _scan(text, language, complexity)
+        if isinstance(text, str):
+            lines = len(text.splitlines())
+        else:
+            lines = _count_lines(text, line_breaks)
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+    return FileStats(file_path, language, lines, keywords, functions, nesting)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python file_analyzer.py <file_path>")
+        sys.exit(1)
+
+    print(analyze_file(sys.argv[1]))
@@ -62,7 +62,10 @@ def detect_by_content(file_path: str, sample_bytes: int = 5000) -> Optional[str]
         ]
     except Exception:
         return None
+    return detect_by_text(content)
 
+
+def detect_by_text(content: str) -> Optional[str]:
     scores: Dict[str, int] = {}
     for lang, patterns in LANGUAGE_PATTERNS.items():
         score = sum(
@@ -8,9 +8,9 @@ from pathlib import Path
 from typing import Dict, Any, List
 
 from git_checker import check_git_environment
-from language_detector import detect_language
-from line_counter import count_lines, scan_directory
-from complexity_detector import calculate_complexity, calculate_priority_score
+from line_counter import scan_directory
+from complexity_detector import calculate_priority_score, lint_passes
+from file_analyzer import analyze_file
 
 
 def analyze_files(file_paths: List[str], use_complexity: bool) -> Dict[str, Any]:
@@ -19,23 +19,21 @@ def analyze_files(file_paths: List[str], use_complexity: bool) -> Dict[str, Any]
     critical = []
 
     for file_path in file_paths:
-        language = detect_language(file_path)
-        if language == "unknown":
+        # One read and one tokenizing pass per file
+        stats = analyze_file(file_path, complexity=use_complexity)
+        if stats is None:
             continue
-        lines = count_lines(file_path)
-        complexity = 0
-        nesting = 0
-        func_count = 0
-        if use_complexity and language != "unknown":
-            detail = calculate_complexity(file_path, language)
-            complexity = detail.get("cyclomatic", 0)
-            nesting = detail.get("nesting_depth", 0)
-            func_count = detail.get("function_count", 0)
+        lines = stats.lines
+        complexity = stats.keywords
+        if use_complexity and lint_passes(file_path, stats.language):
+            complexity = max(1, complexity)
 
-        score = calculate_priority_score(lines, complexity, nesting, func_count)
+        score = calculate_priority_score(
+            lines, complexity, stats.nesting, stats.functions
+        )
         info = {
             "path": file_path,
-            "language": language,
+            "language": stats.language,
             "lines": lines,
             "priority_score": score,
         }